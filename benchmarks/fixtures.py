@@ -0,0 +1,397 @@
+#!/usr/bin/python3
+
+########################################################################
+#                                                                      #
+# fixtures.py                                                          #
+#                                                                      #
+# Copyright (C) 2020 PJ Singh <psingh.cubic@gmail.com>                 #
+#                                                                      #
+########################################################################
+
+########################################################################
+#                                                                      #
+# This file is part of Cubic - Custom Ubuntu ISO Creator.              #
+#                                                                      #
+# Cubic is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by #
+# the Free Software Foundation, either version 3 of the License, or    #
+# (at your option) any later version.                                  #
+#                                                                      #
+# Cubic is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of       #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the         #
+# GNU General Public License for more details.                         #
+#                                                                      #
+# You should have received a copy of the GNU General Public License    #
+# along with Cubic. If not, see <http://www.gnu.org/licenses/>.        #
+#                                                                      #
+########################################################################
+
+# Synthetic fixtures for the benchmarks. The fixtures are generated
+# locally from a seed, so the same seed and scale always produce the
+# same files, and no Ubuntu ISO needs to be downloaded.
+
+########################################################################
+# References
+########################################################################
+
+# https://manpages.ubuntu.com/manpages/noble/man5/deb-control.5.html
+# https://manpages.ubuntu.com/manpages/noble/man1/xorriso.1.html
+# https://www.gnu.org/software/xorriso/man_1_xorrisofs.html
+
+########################################################################
+# Imports
+########################################################################
+
+import collections
+import os
+import random
+import shutil
+import subprocess
+
+########################################################################
+# Global Variables & Constants
+########################################################################
+
+# The fixture directories and files, relative to the work directory.
+# These mirror the directories of a Cubic project.
+CUSTOM_ROOT_DIRECTORY = 'custom-root'
+CUSTOM_DISK_DIRECTORY = 'custom-disk'
+PROJECT_DIRECTORY = 'project'
+ISO_FILE_NAME = 'original.iso'
+SQUASHFS_DIRECTORY = 'casper'
+STANDARD_REMOVE_FILE_NAME = 'filesystem.manifest-remove'
+MINIMAL_REMOVE_FILE_NAME = 'filesystem.manifest-minimal-remove'
+
+# The number of files and packages for each scale. An Ubuntu desktop
+# root file system has roughly 200,000 files and 2,000 packages.
+# • files - The number of regular files in the root file system.
+# • packages - The number of packages in the dpkg status database.
+Scale = collections.namedtuple('Scale', 'files packages')
+SCALES = {
+    'small': Scale(2000, 200),
+    'medium': Scale(20000, 1000),
+    'large': Scale(200000, 2000),
+}
+
+# The parameters of the log-normal file size distribution. A median of
+# e^7.5 ≈ 1.8 KiB with a long tail is typical of the files in a root
+# file system: many small configuration, locale, and documentation
+# files, and a few large shared libraries and firmware blobs.
+FILE_SIZE_MU = 7.5
+FILE_SIZE_SIGMA = 2.0
+MAXIMUM_FILE_SIZE = 8 * 2**20
+
+# The fraction of the files that are links, and the fraction of the
+# file contents that are incompressible, such as compiled code and
+# already compressed data.
+LINK_RATIO = 0.05
+RANDOM_DATA_RATIO = 0.4
+
+# The directories of the root file system, and the relative weight of
+# the number of files placed in each one.
+ROOT_DIRECTORIES = [
+    ('etc', 4),
+    ('usr/bin', 3),
+    ('usr/sbin', 1),
+    ('usr/lib/x86_64-linux-gnu', 12),
+    ('usr/lib/python3/dist-packages', 10),
+    ('usr/lib/modules/6.8.0-31-generic/kernel/drivers', 8),
+    ('usr/lib/firmware', 2),
+    ('usr/share/doc', 10),
+    ('usr/share/icons/hicolor', 8),
+    ('usr/share/locale', 8),
+    ('usr/share/man/man1', 4),
+    ('usr/share/fonts/truetype', 1),
+    ('var/cache/apt/archives', 1),
+    ('var/lib/apt/lists', 1),
+    ('var/log', 1),
+]
+
+# The file name extensions for each top level directory, to give the
+# mime type guesses in the files tree a realistic mix.
+FILE_EXTENSIONS = {
+    'etc': ['', '.conf', '.cfg', '.list'],
+    'usr': ['', '.so', '.py', '.mo', '.png', '.svg', '.gz', '.ko.zst', '.txt', '.ttf'],
+    'var': ['.deb', '.log', '_Packages', ''],
+}
+
+# The sections and priorities of the packages in the dpkg status
+# database.
+PACKAGE_SECTIONS = ['admin', 'devel', 'doc', 'fonts', 'gnome', 'kernel', 'libs', 'net', 'python', 'utils']
+PACKAGE_PRIORITIES = ['required', 'important', 'standard', 'optional', 'extra']
+
+# The fraction of the packages listed in the standard and minimal
+# removable packages lists, similar to an Ubuntu desktop ISO.
+STANDARD_REMOVE_RATIO = 0.05
+MINIMAL_REMOVE_RATIO = 0.3
+
+# A word list used to create compressible text.
+WORDS = ('the of and to in is for on that with as are by this be from at or it an not file '
+         'package system user service configuration default option value path directory').split()
+
+########################################################################
+# Fixture Functions
+########################################################################
+
+
+def create_root_directory(work_directory, scale, seed):
+    """
+    Create a synthetic root file system with a realistic file size
+    distribution, a mix of compressible and incompressible contents, and
+    a small percentage of links.
+
+    Arguments:
+    work_directory : str
+        The directory where the fixtures are created.
+    scale : Scale
+        The number of files and packages.
+    seed : int
+        The seed for the random number generator.
+
+    Returns:
+    : dict
+        A summary of the root file system, including the number of files
+        and links and the total size in bytes.
+    """
+
+    root_directory = os.path.join(work_directory, CUSTOM_ROOT_DIRECTORY)
+    shutil.rmtree(root_directory, ignore_errors=True)
+
+    randomizer = random.Random(seed)
+    directories = [directory for directory, weight in ROOT_DIRECTORIES for _ in range(weight)]
+
+    # Cubic excludes these directories when compressing the root file
+    # system, but they exist in every chroot.
+    for directory in ('proc', 'run', 'tmp', 'var/crash', 'root'):
+        os.makedirs(os.path.join(root_directory, directory), exist_ok=True)
+
+    file_paths = []
+    total_size = 0
+    link_count = 0
+    for index in range(scale.files):
+
+        # Group files into nested package directories, as in /usr/share.
+        directory = randomizer.choice(directories)
+        top_directory = directory.split('/')[0]
+        sub_directory = f'package-{randomizer.randrange(max(1, scale.packages))}'
+        if randomizer.random() < 0.5:
+            sub_directory = os.path.join(sub_directory, f'group-{randomizer.randrange(8)}')
+        directory_path = os.path.join(root_directory, directory, sub_directory)
+        os.makedirs(directory_path, exist_ok=True)
+
+        extension = randomizer.choice(FILE_EXTENSIONS[top_directory])
+        file_path = os.path.join(directory_path, f'file-{index}{extension}')
+
+        if file_paths and randomizer.random() < LINK_RATIO:
+            target_file_path = randomizer.choice(file_paths)
+            os.symlink(os.path.relpath(target_file_path, directory_path), file_path)
+            link_count += 1
+            continue
+
+        size = min(int(randomizer.lognormvariate(FILE_SIZE_MU, FILE_SIZE_SIGMA)), MAXIMUM_FILE_SIZE)
+        with open(file_path, 'wb') as file:
+            file.write(_create_data(randomizer, size))
+        file_paths.append(file_path)
+        total_size += size
+
+    return {
+        'files': len(file_paths),
+        'links': link_count,
+        'bytes': total_size,
+    }
+
+
+def create_dpkg_status(work_directory, scale, seed):
+    """
+    Create a fake dpkg status database in the root file system, and
+    create the removable packages lists for a standard and a minimal
+    install in the disk directory. Library packages are marked
+    "Multi-Arch: same" so dpkg-query lists them with the architecture
+    suffix, as on a real system.
+
+    Arguments:
+    work_directory : str
+        The directory where the fixtures are created.
+    scale : Scale
+        The number of files and packages.
+    seed : int
+        The seed for the random number generator.
+
+    Returns:
+    : dict
+        A summary of the dpkg status database, including the number of
+        packages and the number of packages in each removable list.
+    """
+
+    randomizer = random.Random(seed)
+
+    admin_directory = os.path.join(work_directory, CUSTOM_ROOT_DIRECTORY, 'var/lib/dpkg')
+    for directory in ('info', 'updates', 'triggers'):
+        os.makedirs(os.path.join(admin_directory, directory), exist_ok=True)
+    for file_name in ('available', 'diversions', 'statoverride'):
+        open(os.path.join(admin_directory, file_name), 'w').close()
+
+    entries = []
+    package_names = []
+    for index in range(scale.packages):
+        section = randomizer.choice(PACKAGE_SECTIONS)
+        is_library = section == 'libs'
+        name = f'lib{section}{index}-{randomizer.randrange(10)}' if is_library else f'{section}-package-{index}'
+        version = f'{randomizer.randrange(1, 10)}.{randomizer.randrange(20)}.{randomizer.randrange(100)}-{randomizer.randrange(1, 5)}ubuntu{randomizer.randrange(1, 3)}'
+        lines = [
+            f'Package: {name}',
+            'Status: install ok installed',
+            f'Priority: {randomizer.choice(PACKAGE_PRIORITIES)}',
+            f'Section: {section}',
+            f'Installed-Size: {randomizer.randrange(8, 65536)}',
+            'Maintainer: Ubuntu Developers <ubuntu-devel-discuss@lists.ubuntu.com>',
+            f'Architecture: {"amd64" if is_library or randomizer.random() < 0.7 else "all"}',
+        ]
+        if is_library:
+            lines.append('Multi-Arch: same')
+        lines += [
+            f'Version: {version}',
+            f'Description: Synthetic {section} package {index}',
+            f' {" ".join(randomizer.choices(WORDS, k=12))}',
+        ]
+        entries.append(os.linesep.join(lines))
+        package_names.append(f'{name}:amd64' if is_library else name)
+
+    with open(os.path.join(admin_directory, 'status'), 'w') as file:
+        file.write((os.linesep * 2).join(entries) + os.linesep)
+
+    # The standard removable packages list (filesystem.manifest-remove)
+    # includes the architecture suffix, but the minimal removable
+    # packages list (filesystem.manifest-minimal-remove) does not.
+    squashfs_directory = os.path.join(work_directory, CUSTOM_DISK_DIRECTORY, SQUASHFS_DIRECTORY)
+    os.makedirs(squashfs_directory, exist_ok=True)
+
+    standard_remove_list = sorted(randomizer.sample(package_names, int(len(package_names) * STANDARD_REMOVE_RATIO)))
+    with open(os.path.join(squashfs_directory, STANDARD_REMOVE_FILE_NAME), 'w') as file:
+        file.writelines(f'{name}{os.linesep}' for name in standard_remove_list)
+
+    minimal_remove_list = sorted(name.partition(':')[0] for name in randomizer.sample(package_names, int(len(package_names) * MINIMAL_REMOVE_RATIO)))
+    with open(os.path.join(squashfs_directory, MINIMAL_REMOVE_FILE_NAME), 'w') as file:
+        file.writelines(f'{name}{os.linesep}' for name in minimal_remove_list)
+
+    return {
+        'packages': len(package_names),
+        'standard_remove': len(standard_remove_list),
+        'minimal_remove': len(minimal_remove_list),
+    }
+
+
+def create_iso(work_directory, seed):
+    """
+    Create a small hybrid ISO with the same boot layout as recent Ubuntu
+    releases: a GRUB2 MBR, a BIOS El Torito boot image, and an EFI
+    system partition appended as a GPT partition. The boot images are
+    synthetic, so the ISO does not actually boot, but xorriso reports
+    the same boot options as for an Ubuntu ISO.
+
+    Arguments:
+    work_directory : str
+        The directory where the fixtures are created.
+    seed : int
+        The seed for the random number generator.
+
+    Returns:
+    : dict
+        A summary of the ISO, including its path and size in bytes.
+
+    Raises:
+    : FileNotFoundError
+        If xorriso is not installed.
+    : subprocess.CalledProcessError
+        If xorriso is unable to create the ISO.
+    """
+
+    if not shutil.which('xorriso'):
+        raise FileNotFoundError('xorriso is not installed')
+
+    randomizer = random.Random(seed)
+
+    disk_directory = os.path.join(work_directory, CUSTOM_DISK_DIRECTORY)
+    boot_directory = os.path.join(work_directory, 'boot-images')
+    iso_file_path = os.path.join(work_directory, ISO_FILE_NAME)
+    os.makedirs(os.path.join(disk_directory, '.disk'), exist_ok=True)
+    os.makedirs(os.path.join(disk_directory, 'boot/grub/i386-pc'), exist_ok=True)
+    os.makedirs(os.path.join(disk_directory, SQUASHFS_DIRECTORY), exist_ok=True)
+    os.makedirs(boot_directory, exist_ok=True)
+
+    with open(os.path.join(disk_directory, '.disk/info'), 'w') as file:
+        file.write('Ubuntu 24.04 LTS "Noble Numbat" - Release amd64 (20240424)')
+    with open(os.path.join(disk_directory, 'boot/grub/grub.cfg'), 'w') as file:
+        file.write(f'menuentry "Try or Install Ubuntu" {{{os.linesep}    linux /casper/vmlinuz{os.linesep}}}{os.linesep}')
+    with open(os.path.join(disk_directory, SQUASHFS_DIRECTORY, 'filesystem.squashfs'), 'wb') as file:
+        file.write(randomizer.randbytes(2**20))
+
+    # The El Torito boot image must be in the ISO, and the boot info
+    # table is patched into it at offset 8.
+    with open(os.path.join(disk_directory, 'boot/grub/i386-pc/eltorito.img'), 'wb') as file:
+        file.write(randomizer.randbytes(2048))
+
+    # The MBR template and EFI system partition are outside the ISO.
+    mbr_file_path = os.path.join(boot_directory, 'boot_hybrid.img')
+    with open(mbr_file_path, 'wb') as file:
+        file.write(bytes(512))
+    efi_file_path = os.path.join(boot_directory, 'efi.img')
+    with open(efi_file_path, 'wb') as file:
+        file.write(bytes(2**20))
+
+    command = [
+        'xorriso', '-as', 'mkisofs', '-r',
+        '-V', 'Ubuntu 24.04 LTS amd64',
+        '-o', iso_file_path,
+        '--grub2-mbr', mbr_file_path,
+        '--protective-msdos-label',
+        '-partition_cyl_align', 'off',
+        '-partition_offset', '16',
+        '--mbr-force-bootable',
+        '-append_partition', '2', '28732ac11ff8d211ba4b00a0c93ec93b', efi_file_path,
+        '-appended_part_as_gpt',
+        '-iso_mbr_part_type', 'a2a0d0ebe5b9334487c068b6b72699c7',
+        '-c', '/boot.catalog',
+        '-b', '/boot/grub/i386-pc/eltorito.img',
+        '-no-emul-boot', '-boot-load-size', '4', '-boot-info-table', '--grub2-boot-info',
+        '-eltorito-alt-boot',
+        '-e', '--interval:appended_partition_2:all::',
+        '-no-emul-boot',
+        disk_directory,
+    ]
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    return {
+        'file_path': iso_file_path,
+        'bytes': os.path.getsize(iso_file_path),
+    }
+
+
+########################################################################
+# Support Functions
+########################################################################
+
+
+def _create_data(randomizer, size):
+    """
+    Create file contents that are partly random bytes, which do not
+    compress, and partly text, which compresses well.
+
+    Arguments:
+    randomizer : random.Random
+        The random number generator.
+    size : int
+        The number of bytes.
+
+    Returns:
+    : bytes
+        The file contents.
+    """
+
+    random_size = int(size * RANDOM_DATA_RATIO) if randomizer.random() < 0.5 else 0
+    text = ' '.join(randomizer.choices(WORDS, k=64)).encode()
+    text_size = size - random_size
+    data = randomizer.randbytes(random_size) + (text * (text_size // len(text) + 1))[:text_size]
+
+    return data
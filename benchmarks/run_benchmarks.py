@@ -0,0 +1,610 @@
+#!/usr/bin/python3
+
+########################################################################
+#                                                                      #
+# run_benchmarks.py                                                    #
+#                                                                      #
+# Copyright (C) 2020 PJ Singh <psingh.cubic@gmail.com>                 #
+#                                                                      #
+########################################################################
+
+########################################################################
+#                                                                      #
+# This file is part of Cubic - Custom Ubuntu ISO Creator.              #
+#                                                                      #
+# Cubic is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by #
+# the Free Software Foundation, either version 3 of the License, or    #
+# (at your option) any later version.                                  #
+#                                                                      #
+# Cubic is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of       #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the         #
+# GNU General Public License for more details.                         #
+#                                                                      #
+# You should have received a copy of the GNU General Public License    #
+# along with Cubic. If not, see <http://www.gnu.org/licenses/>.        #
+#                                                                      #
+########################################################################
+
+# Time the hot paths of Cubic against synthetic fixtures, and write the
+# results as JSON so they can be compared between revisions.
+#
+# Usage:
+#     benchmarks/run_benchmarks.py --scale small --output results.json
+#
+# Benchmarks whose dependencies are not available (such as Gtk, a
+# display, xorriso, or mksquashfs) are reported as skipped, with the
+# reason, instead of failing the run.
+
+########################################################################
+# Imports
+########################################################################
+
+import argparse
+import collections
+import datetime
+import json
+import mimetypes
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+import fixtures
+
+########################################################################
+# Global Variables & Constants
+########################################################################
+
+RESULTS_FORMAT_VERSION = 1
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+APPLICATION_DIRECTORY = os.path.join(REPOSITORY_DIRECTORY, 'cubic', 'usr', 'share', 'cubic')
+
+# The Cubic modules are imported from the source tree, not from the
+# installed package.
+sys.path.insert(0, APPLICATION_DIRECTORY)
+
+# A benchmark job, created after the fixtures are ready.
+# • run - The function to time. It returns the number of items
+#   processed, such as files or packages.
+# • reset - An optional function called before each run, which is not
+#   timed.
+# • details - A dictionary of additional results, which may be updated
+#   by the run function.
+Job = collections.namedtuple('Job', 'run reset details')
+
+########################################################################
+# Exceptions
+########################################################################
+
+
+class SkipException(Exception):
+    """
+    Raised when a benchmark can not run in this environment.
+    """
+
+    pass
+
+
+########################################################################
+# Benchmarks
+########################################################################
+
+
+def prepare_get_relative_file_paths(context):
+
+    from cubic.utilities import file_utilities
+
+    root_directory = context['root_directory']
+
+    def run():
+        return len(file_utilities.get_relative_file_paths(root_directory, []))
+
+    return Job(run, None, {})
+
+
+def prepare_calculate_md5_hash(context):
+
+    from cubic.utilities import file_utilities
+
+    root_directory = context['root_directory']
+    file_paths = file_utilities.get_relative_file_paths(root_directory, [])
+
+    def run():
+        for file_path in file_paths:
+            file_utilities.calculate_md5_hash(file_path, root_directory)
+        return len(file_paths)
+
+    return Job(run, None, {'bytes': context['fixtures']['root']['bytes']})
+
+
+def prepare_create_package_details_list(context):
+
+    _require_commands('dpkg-query')
+    prepare_page = _import_prepare_page()
+
+    root_directory = context['root_directory']
+
+    def run():
+        return len(prepare_page.create_package_details_list(root_directory))
+
+    return Job(run, None, {})
+
+
+def prepare_populate_standard_install(context):
+
+    _require_commands('dpkg-query')
+    prepare_page = _import_prepare_page()
+    from cubic.utilities import file_utilities
+
+    package_details_list = prepare_page.create_package_details_list(context['root_directory'])
+    removable_packages_list = file_utilities.read_lines(context['standard_remove_file_path'])
+    details = {'packages': len(package_details_list), 'removable_packages': len(removable_packages_list)}
+
+    def run():
+        details['matched'] = prepare_page.populate_package_details_list_for_standard_install(package_details_list, removable_packages_list)
+        return len(package_details_list)
+
+    return Job(run, None, details)
+
+
+def prepare_populate_minimal_install(context):
+
+    _require_commands('dpkg-query')
+    prepare_page = _import_prepare_page()
+    from cubic.utilities import file_utilities
+
+    # The minimal install depends on the standard install selections,
+    # so populate the standard install first, as the prepare page does.
+    package_details_list = prepare_page.create_package_details_list(context['root_directory'])
+    standard_packages_list = file_utilities.read_lines(context['standard_remove_file_path'])
+    prepare_page.populate_package_details_list_for_standard_install(package_details_list, standard_packages_list)
+    removable_packages_list = file_utilities.read_lines(context['minimal_remove_file_path'])
+    details = {'packages': len(package_details_list), 'removable_packages': len(removable_packages_list)}
+
+    def run():
+        details['matched'] = prepare_page.populate_package_details_list_for_minimal_install(package_details_list, removable_packages_list)
+        return len(package_details_list)
+
+    return Job(run, None, details)
+
+
+def prepare_get_iso_report(context):
+
+    _require_iso(context)
+    from cubic.utilities import iso_utilities
+
+    def run():
+        iso_report = iso_utilities.get_iso_report()
+        return len(iso_report.split())
+
+    return Job(run, None, {})
+
+
+def prepare_generate_iso_template(context):
+
+    _require_iso(context)
+    from cubic.utilities import iso_utilities
+    from cubic.utilities import model
+
+    iso_report = iso_utilities.get_iso_report()
+    if not iso_report:
+        raise RuntimeError('Unable to get the ISO report')
+    details = {'report_lines': len(iso_report.splitlines())}
+
+    def reset():
+        # Remove the partition images extracted by the previous run.
+        shutil.rmtree(model.project.directory, ignore_errors=True)
+        os.makedirs(model.project.directory)
+
+    def run():
+        template = iso_utilities.generate_iso_template(iso_report)
+        if template is None:
+            raise RuntimeError('Unable to generate the ISO template')
+        details['images'] = len(iso_utilities.extract_image_jobs)
+        return len(template.splitlines())
+
+    return Job(run, reset, details)
+
+
+def prepare_build_tree(context):
+
+    try:
+        import gi
+        gi.require_version('Gtk', '3.0')
+        from gi.repository import Gtk
+    except (ImportError, ValueError) as exception:
+        raise SkipException(f'Gtk is not available: {exception}')
+    if not Gtk.init_check(sys.argv)[0]:
+        raise SkipException('A display is not available')
+    try:
+        from cubic.utilities import files_tree
+    except ImportError as exception:
+        raise SkipException(f'Unable to import files_tree: {exception}')
+    from cubic.utilities import model
+
+    # Set up the tree view and tree store the same way as the files
+    # tree constructor, without adding inotify watches or starting the
+    # asyncio event loop, so only the tree building is timed.
+    tree = files_tree.FilesTree.__new__(files_tree.FilesTree)
+    builder = Gtk.Builder.new_from_file(files_tree.TREE_VIEW_UI_FILE_PATH)
+    tree.tree_view = builder.get_object('tree_view')
+    tree.tree_model = tree.tree_view.get_model()
+    tree.is_show_all_files = True
+    tree.file_map = dict()
+    tree.tree_model.set_visible_func(tree.tree_iter_visible, None)
+    tree_store = tree.tree_model.get_model()
+    tree_store.set_default_sort_func(tree.tree_iter_compare, None)
+    tree_store.set_sort_column_id(Gtk.TREE_SORTABLE_DEFAULT_SORT_COLUMN_ID, Gtk.SortType.ASCENDING)
+
+    # The tree is built relative to the custom disk directory.
+    root_file_path = os.path.relpath(context['root_directory'], model.project.custom_disk_directory)
+
+    def reset():
+        tree.file_map = dict()
+        tree_store.clear()
+
+    def run():
+        tree._build_tree(root_file_path, None, None, None)
+        return len(tree.file_map)
+
+    return Job(run, reset, {})
+
+
+def prepare_squashfs_round_trip(context):
+
+    _require_commands('mksquashfs', 'unsquashfs')
+
+    root_directory = context['root_directory']
+    squashfs_file_path = os.path.join(context['work_directory'], 'filesystem.squashfs')
+    extract_directory = os.path.join(context['work_directory'], 'squashfs-root')
+    compress_command = [os.path.join(APPLICATION_DIRECTORY, 'commands', 'compress-root'), root_directory, squashfs_file_path, context['compression']]
+    extract_command = [os.path.join(APPLICATION_DIRECTORY, 'commands', 'extract-root'), extract_directory, squashfs_file_path]
+    details = {'compression': context['compression'], 'uncompressed_bytes': context['fixtures']['root']['bytes']}
+
+    def reset():
+        shutil.rmtree(extract_directory, ignore_errors=True)
+        if os.path.exists(squashfs_file_path):
+            os.remove(squashfs_file_path)
+
+    def run():
+        # Time the compression and extraction separately, as well as
+        # the round trip.
+        start_time = time.perf_counter()
+        subprocess.run(compress_command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        details.setdefault('compress_seconds', []).append(time.perf_counter() - start_time)
+        details['compressed_bytes'] = os.path.getsize(squashfs_file_path)
+        start_time = time.perf_counter()
+        subprocess.run(extract_command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        details.setdefault('extract_seconds', []).append(time.perf_counter() - start_time)
+        return context['fixtures']['root']['files']
+
+    return Job(run, reset, details)
+
+
+# The benchmarks, in the order they are run.
+BENCHMARKS = [
+    ('file_utilities.get_relative_file_paths', prepare_get_relative_file_paths),
+    ('file_utilities.calculate_md5_hash', prepare_calculate_md5_hash),
+    ('prepare_page.create_package_details_list', prepare_create_package_details_list),
+    ('prepare_page.populate_package_details_list_for_standard_install', prepare_populate_standard_install),
+    ('prepare_page.populate_package_details_list_for_minimal_install', prepare_populate_minimal_install),
+    ('iso_utilities.get_iso_report', prepare_get_iso_report),
+    ('iso_utilities.generate_iso_template', prepare_generate_iso_template),
+    ('files_tree._build_tree', prepare_build_tree),
+    ('squashfs.round_trip', prepare_squashfs_round_trip),
+]
+
+########################################################################
+# Runner Functions
+########################################################################
+
+
+def remove_fixtures(work_directory, is_work_directory_created, existing_names):
+    """
+    Remove the fixtures created in the work directory.
+
+    Arguments:
+    work_directory : str
+        The directory containing the fixtures.
+    is_work_directory_created : bool
+        True if the work directory was created by this script, in which
+        case it is removed entirely.
+    existing_names : set(str)
+        The names of the files in the work directory before the fixtures
+        were created. These files are not removed.
+    """
+
+    if is_work_directory_created:
+        shutil.rmtree(work_directory, ignore_errors=True)
+        return
+
+    for name in set(os.listdir(work_directory)) - existing_names:
+        path = os.path.join(work_directory, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+
+def create_fixtures(work_directory, scale, seed):
+    """
+    Create the fixtures and configure the model to use them, as if they
+    were a Cubic project.
+
+    Arguments:
+    work_directory : str
+        The directory where the fixtures are created.
+    scale : fixtures.Scale
+        The number of files and packages.
+    seed : int
+        The seed for the random number generator.
+
+    Returns:
+    : dict
+        The context passed to each benchmark.
+    """
+
+    from cubic.utilities import model
+
+    summary = {}
+    start_time = time.perf_counter()
+    summary['root'] = fixtures.create_root_directory(work_directory, scale, seed)
+    summary['dpkg'] = fixtures.create_dpkg_status(work_directory, scale, seed)
+    try:
+        summary['iso'] = fixtures.create_iso(work_directory, seed)
+    except (FileNotFoundError, subprocess.CalledProcessError) as exception:
+        summary['iso'] = {'error': _describe(exception)}
+    summary['seconds'] = round(time.perf_counter() - start_time, 3)
+
+    model.project.directory = os.path.join(work_directory, fixtures.PROJECT_DIRECTORY)
+    model.project.custom_root_directory = os.path.join(work_directory, fixtures.CUSTOM_ROOT_DIRECTORY)
+    model.project.custom_disk_directory = os.path.join(work_directory, fixtures.CUSTOM_DISK_DIRECTORY)
+    model.original.iso_directory = work_directory
+    model.original.iso_file_name = fixtures.ISO_FILE_NAME
+    os.makedirs(model.project.directory, exist_ok=True)
+
+    squashfs_directory = os.path.join(model.project.custom_disk_directory, fixtures.SQUASHFS_DIRECTORY)
+
+    return {
+        'work_directory': work_directory,
+        'root_directory': model.project.custom_root_directory,
+        'standard_remove_file_path': os.path.join(squashfs_directory, fixtures.STANDARD_REMOVE_FILE_NAME),
+        'minimal_remove_file_path': os.path.join(squashfs_directory, fixtures.MINIMAL_REMOVE_FILE_NAME),
+        'fixtures': summary,
+    }
+
+
+def run_benchmark(name, prepare, context, repeat):
+    """
+    Prepare and time a benchmark.
+
+    Arguments:
+    name : str
+        The name of the benchmark.
+    prepare : function
+        The function that creates the benchmark job.
+    context : dict
+        The fixtures and options.
+    repeat : int
+        The number of timed runs.
+
+    Returns:
+    : dict
+        The result of the benchmark.
+    """
+
+    print(f'Running {name}...', file=sys.stderr)
+
+    result = {'name': name}
+    try:
+        job = prepare(context)
+    except (SkipException, ImportError) as exception:
+        result['status'] = 'skipped'
+        result['reason'] = str(exception)
+        return result
+    except Exception as exception:
+        result['status'] = 'error'
+        result['reason'] = _describe(exception)
+        result['traceback'] = traceback.format_exc()
+        return result
+
+    seconds = []
+    items = 0
+    try:
+        for _ in range(repeat):
+            if job.reset:
+                job.reset()
+            start_time = time.perf_counter()
+            items = job.run()
+            seconds.append(time.perf_counter() - start_time)
+    except Exception as exception:
+        result['status'] = 'error'
+        result['reason'] = _describe(exception)
+        result['traceback'] = traceback.format_exc()
+        return result
+
+    best_seconds = min(seconds)
+    result['status'] = 'ok'
+    result['items'] = items
+    result['seconds'] = {
+        'min': best_seconds,
+        'median': statistics.median(seconds),
+        'mean': statistics.mean(seconds),
+        'stdev': statistics.stdev(seconds) if len(seconds) > 1 else 0.0,
+        'runs': seconds,
+    }
+    result['items_per_second'] = items / best_seconds if best_seconds else None
+    result['details'] = job.details
+
+    return result
+
+
+def get_environment():
+    """
+    Get details of the environment that affect the timings.
+
+    Returns:
+    : dict
+        The environment details.
+    """
+
+    environment = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processors': os.cpu_count(),
+        'tools': {},
+    }
+    for tool, option in (('xorriso', '-version'), ('mksquashfs', '-version'), ('dpkg-query', '--version')):
+        if shutil.which(tool):
+            process = subprocess.run([tool, option], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            lines = process.stdout.strip().splitlines()
+            environment['tools'][tool] = lines[0] if lines else None
+        else:
+            environment['tools'][tool] = None
+
+    return environment
+
+
+def get_revision():
+    """
+    Get the git revision of the source tree being benchmarked.
+
+    Returns:
+    : dict
+        The commit hash and whether there are uncommitted changes, or
+        None if the source tree is not a git repository.
+    """
+
+    try:
+        commit = subprocess.run(['git', '-C', REPOSITORY_DIRECTORY, 'rev-parse', 'HEAD'], check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+        status = subprocess.run(['git', '-C', REPOSITORY_DIRECTORY, 'status', '--porcelain', '--untracked-files=no'], check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+
+    return {'commit': commit, 'is_modified': bool(status.strip())}
+
+
+########################################################################
+# Support Functions
+########################################################################
+
+
+def _import_prepare_page():
+
+    try:
+        from cubic.pages import prepare_page
+    except (ImportError, ValueError) as exception:
+        raise SkipException(f'Unable to import prepare_page: {exception}')
+
+    return prepare_page
+
+
+def _require_commands(*commands):
+
+    for command in commands:
+        if not shutil.which(command):
+            raise SkipException(f'{command} is not installed')
+
+
+def _require_iso(context):
+
+    _require_commands('xorriso')
+    iso_summary = context['fixtures'].get('iso', {})
+    if 'error' in iso_summary:
+        raise SkipException(f'The ISO fixture was not created: {iso_summary["error"]}')
+
+
+def _describe(exception):
+
+    if isinstance(exception, subprocess.CalledProcessError) and exception.stderr:
+        stderr = exception.stderr.decode(errors='replace') if isinstance(exception.stderr, bytes) else exception.stderr
+        return f'{exception}: {stderr.strip()}'
+
+    return f'{type(exception).__name__}: {exception}'
+
+
+########################################################################
+# Main
+########################################################################
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Time the hot paths of Cubic against synthetic fixtures.')
+    parser.add_argument('--scale', choices=fixtures.SCALES, default='small', help='the size of the synthetic root file system (default: small)')
+    parser.add_argument('--seed', type=int, default=0, help='the seed used to generate the fixtures (default: 0)')
+    parser.add_argument('--repeat', type=int, default=5, help='the number of timed runs for each benchmark (default: 5)')
+    parser.add_argument('--compression', default='gzip', help='the squashfs compression for the round trip (default: gzip)')
+    parser.add_argument('--benchmark', action='append', metavar='NAME', help='only run benchmarks whose name contains NAME; may be repeated')
+    parser.add_argument('--work-directory', help='create the fixtures in this directory instead of a temporary directory')
+    parser.add_argument('--keep', action='store_true', help='keep the fixtures after the run')
+    parser.add_argument('--output', help='write the JSON results to this file instead of standard output')
+    arguments = parser.parse_args()
+
+    from cubic.utilities import model
+
+    # Initialize the model and mime types the same way as the wizard.
+    model.application.directory = APPLICATION_DIRECTORY
+    mimetypes.init()
+    mimetypes.types_map.update(mimetypes.read_mime_types(os.path.join(APPLICATION_DIRECTORY, 'assets', 'mime.types')) or {})
+
+    # Only remove what this script creates. A supplied work directory
+    # may already contain other files.
+    work_directory = arguments.work_directory or tempfile.mkdtemp(prefix='cubic-benchmarks-')
+    is_work_directory_created = not arguments.work_directory or not os.path.exists(work_directory)
+    os.makedirs(work_directory, exist_ok=True)
+    work_directory = os.path.realpath(work_directory)
+    existing_names = set(os.listdir(work_directory))
+
+    try:
+        print(f'Creating {arguments.scale} fixtures in {work_directory}...', file=sys.stderr)
+        context = create_fixtures(work_directory, fixtures.SCALES[arguments.scale], arguments.seed)
+        context['compression'] = arguments.compression
+
+        results = []
+        for name, prepare in BENCHMARKS:
+            if arguments.benchmark and not any(pattern in name for pattern in arguments.benchmark):
+                continue
+            results.append(run_benchmark(name, prepare, context, arguments.repeat))
+    finally:
+        if not arguments.keep:
+            remove_fixtures(work_directory, is_work_directory_created, existing_names)
+
+    report = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'revision': get_revision(),
+        'environment': get_environment(),
+        'parameters': {
+            'scale': arguments.scale,
+            'files': fixtures.SCALES[arguments.scale].files,
+            'packages': fixtures.SCALES[arguments.scale].packages,
+            'seed': arguments.seed,
+            'repeat': arguments.repeat,
+            'compression': arguments.compression,
+        },
+        'fixtures': context['fixtures'],
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            file.write(text + os.linesep)
+    else:
+        print(text)
+
+    return 1 if any(result['status'] == 'error' for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
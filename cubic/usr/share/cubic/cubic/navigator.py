@@ -268,14 +268,17 @@ import os
 import re
 import sys
 import threading
+import time
 # import traceback
 
 from cubic.constants import STAR, CUBIC_WEBSITE, CUBIC_WIKI, CUBIC_PAGE_HELP, CUBIC_DONATE, CUBIC_SITES, CUBIC_URLS
 from cubic.utilities.displayer import SLIDE_NONE, SLIDE_LEFT, SLIDE_RIGHT, SLIDE_DOWN, SLIDE_UP, CROSS_FADE
 from cubic.utilities import constructor
 from cubic.utilities import displayer
+from cubic.utilities import helper
 from cubic.utilities import logger
 from cubic.utilities import model
+from cubic.utilities import profiler
 from cubic.utilities.processor import terminate_process
 
 ########################################################################
@@ -285,6 +288,26 @@ from cubic.utilities.processor import terminate_process
 navigation_thread = None
 urls = constructor.decode_object(CUBIC_URLS)
 
+# The pages that have been loaded, by page name. Pages are loaded on
+# demand, the first time they are navigated to, instead of when the
+# application starts.
+registered_pages = {}
+
+# Pages that use widgets from the user interface of other pages. The
+# other pages are loaded first.
+PAGE_DEPENDENCIES = {'extract_page': ['terminal_page'], 'packages_page': ['options_page']}
+
+# Widgets from the user interface of each page that are added to the
+# header bar when the page is loaded.
+HEADER_BAR_WIDGETS = {
+    'project_page': ['project_page__test_header_bar_button',
+                     'project_page__delete_header_bar_button',
+                     'project_page__header_bar_box'],
+    'packages_page': ['packages_page__header_bar_box_1',
+                      'packages_page__header_bar_box_2'],
+    'terminal_page': ['terminal_page__copy_header_bar_button'],
+    'finish_page': ['finish_page__test_header_bar_button']}
+
 ########################################################################
 # Exception Classes
 ########################################################################
@@ -569,7 +592,7 @@ def navigate(action, page, new_page, effect):
 
     result = None
     try:
-        result = page.leave(action, new_page) if page else None
+        result = profiler.profile_stage(get_page_name(page), 'leave', page.leave, action, new_page) if page else None
     except InterruptException as exception:
         page_label = get_page_label(page)
         logger.log_value(f'Error leaving {page_label}', exception)
@@ -589,7 +612,7 @@ def navigate(action, page, new_page, effect):
 
     result = None
     try:
-        result = new_page.setup(action, page) if new_page else None
+        result = profiler.profile_stage(get_page_name(new_page), 'setup', new_page.setup, action, page) if new_page else None
     except InterruptException as exception:
         page_label = get_page_label(new_page)
         logger.log_value(f'Error setting up {page_label}', exception)
@@ -610,7 +633,7 @@ def navigate(action, page, new_page, effect):
 
     result = None
     try:
-        result = new_page.enter(action, page) if new_page else None
+        result = profiler.profile_stage(get_page_name(new_page), 'enter', new_page.enter, action, page) if new_page else None
     except InterruptException as exception:
         page_label = get_page_label(new_page)
         logger.log_value(f'Error entering {page_label}', exception)
@@ -632,7 +655,8 @@ def navigate(action, page, new_page, effect):
 
 def get_page(page_name):
     """
-    Get the page corresponding to the page name.
+    Get the page corresponding to the page name. The page, and any pages
+    it depends on, are loaded the first time the page is requested.
 
     Arguments:
     page_name : str
@@ -647,11 +671,76 @@ def get_page(page_name):
     page = None
 
     if page_name:
-        try:
-            page = importlib.import_module(f'cubic.pages.{page_name}')
-        except ModuleNotFoundError as exception:
-            logger.log_value('Error', exception)
-            raise exception
+        page = registered_pages.get(page_name)
+        if not page:
+            for dependency_name in PAGE_DEPENDENCIES.get(page_name, []):
+                get_page(dependency_name)
+            # The user interface must be loaded on the main thread.
+            page = displayer.call_and_wait(register_page, page_name)
+
+    return page
+
+
+def register_page(page_name):
+    """
+    Load the user interface for the page, load the page module, connect
+    the signals to handlers in the page module, and add the page to the
+    stack. This function must be invoked on the main thread.
+
+    The user interface is loaded before the page module, because some
+    page modules use their widgets when they are imported.
+
+    Arguments:
+    page_name : str
+        The name of the page.
+
+    Returns:
+    module
+        The page corresponding to the page name.
+
+    Raises:
+    : ModuleNotFoundError
+        If a module matching page name is not found.
+    """
+
+    # The page may have been loaded while this call was waiting to run.
+    page = registered_pages.get(page_name)
+    if page:
+        return page
+
+    start_time = time.perf_counter()
+
+    # Load the user interface.
+    file_path = os.path.join(model.application.directory, 'cubic', 'pages', f'{page_name}.ui')
+    model.builder.add_from_file(file_path)
+
+    # Load the module.
+    try:
+        page = importlib.import_module(f'cubic.pages.{page_name}')
+    except ModuleNotFoundError as exception:
+        logger.log_value('Error', exception)
+        raise exception
+
+    # Connect the signals to handlers in the associated module.
+    model.builder.connect_signals(page)
+
+    # Add the page to the stack.
+    pages = model.builder.get_object('pages')
+    pages.add_named(model.builder.get_object(page.name), page.name)
+
+    # Add the page's widgets to the header bar.
+    header_bar = model.builder.get_object('header_bar')
+    for widget_name in HEADER_BAR_WIDGETS.get(page_name, []):
+        header_bar.add(model.builder.get_object(widget_name))
+    if page_name == 'options_page':
+        options_page__stack_switcher = model.builder.get_object('options_page__stack_switcher')
+        options_page__stack = model.builder.get_object('options_page__stack')
+        options_page__stack_switcher.set_stack(options_page__stack)
+
+    registered_pages[page_name] = page
+
+    duration = time.perf_counter() - start_time
+    logger.log_value(f'Loaded {get_page_label(page)} in', f'{duration:.3f} seconds')
 
     return page
 
@@ -960,6 +1049,12 @@ def get_new_page(action, page):
         if action == 'back':
             new_page_name = 'options_page'
             effect = SLIDE_RIGHT
+        elif action == 'benchmark':
+            new_page_name = 'compression_page'
+            effect = SLIDE_NONE
+        elif action == 'error':
+            new_page_name = 'compression_page'
+            effect = SLIDE_NONE
         elif action == 'generate':
             new_page_name = 'generate_page'
             effect = SLIDE_LEFT
@@ -1032,6 +1127,9 @@ def quit():
     # • model.application.iso_directory - the current ISO directory
     model.application.configuration.save()
 
+    # Stop the privileged helper used to execute privileged commands.
+    helper.stop()
+
     # Note the project configuration is persisted in the quit() function
     # of most pages. This ensures that the project configuration is
     # written to disk only once. Exceptions: The project configuration
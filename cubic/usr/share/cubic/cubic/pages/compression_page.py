@@ -39,13 +39,24 @@
 # Imports
 ########################################################################
 
+import html
+import locale
+import os
+
 from cubic.constants import BOLD_RED, NORMAL
 from cubic.constants import LZ4, LZO, GZIP, ZSTD, XZ
+from cubic.constants import MIB
+from cubic.navigator import handle_navigation
 from cubic.pages import options_page
+from cubic.utilities import benchmarker
 from cubic.utilities import displayer
+from cubic.utilities import file_utilities
 from cubic.utilities import iso_utilities
 from cubic.utilities import logger
 from cubic.utilities import model
+from cubic.utilities import mount_table
+from cubic.utilities import slimmer
+from cubic.utilities.processor import execute_synchronous
 
 ########################################################################
 # Global Variables & Constants
@@ -63,6 +74,35 @@ radio_buttons = {
 
 compression = None
 
+# The selected slimming category keys.
+slimming_categories = []
+
+SLIMMING_CHECK_BUTTON_PREFIX = 'compression_page__slimming_check_button__'
+
+# The rows displayed in the benchmark table.
+benchmark_rows = []
+
+# Typical ratios of the compressed size to the uncompressed size of an
+# Ubuntu file system, used to predict the compressed size when there is
+# no benchmark result or previous build for the compression.
+DEFAULT_COMPRESSION_RATIOS = {LZ4: 0.55, LZO: 0.50, GZIP: 0.45, ZSTD: 0.42, XZ: 0.38}
+
+# The ISO image is slightly larger than the custom disk directory.
+ISO_OVERHEAD_RATIO = 1.02
+
+# Warn if less than this amount of space would remain after generating.
+SPACE_MARGIN = 512 * MIB
+
+# File system types that are not suggested as alternate locations.
+UNSUITABLE_FILE_SYSTEM_TYPES = {
+    'autofs', 'binfmt_misc', 'bpf', 'cgroup', 'cgroup2', 'configfs', 'debugfs', 'devpts', 'devtmpfs', 'efivarfs', 'fusectl', 'hugetlbfs', 'iso9660', 'mqueue',
+    'nsfs', 'overlay', 'proc', 'pstore', 'ramfs', 'rpc_pipefs', 'securityfs', 'squashfs', 'sysfs', 'tmpfs', 'tracefs', 'udf', 'vfat'
+}
+
+# The warning displayed by the previous space check. Clicking Generate
+# again with the same warning continues anyway.
+space_warning = None
+
 ########################################################################
 # Navigation Functions
 ########################################################################
@@ -127,6 +167,64 @@ def setup(action, old_page=None):
         compression = model.options.compression
         displayer.activate_radio_button(radio_buttons[compression], True)
 
+        # Clear the previous benchmark and space check.
+        global space_warning
+        space_warning = None
+        displayer.update_label('compression_page__space_message', '', False)
+        model.benchmark_results = None
+        benchmark_rows.clear()
+        displayer.update_list_store('compression_page__benchmark_list_store', [])
+        displayer.update_label('compression_page__benchmark_message', 'Click Benchmark to estimate the size and time for each compression.', False)
+        displayer.set_sensitive('compression_page__benchmark_button', True)
+
+        # Display the slimming categories. The sizes are estimated in
+        # enter(), after this page is shown.
+        global slimming_categories
+        slimming_categories = list(model.options.slimming_categories or [])
+        for category in slimmer.CATEGORIES:
+            check_button_name = f'{SLIMMING_CHECK_BUTTON_PREFIX}{category.key}'
+            is_active = category.key in slimming_categories
+            if model.builder.get_object(check_button_name):
+                displayer.update_check_button_label(check_button_name, category.label)
+                displayer.activate_check_button(check_button_name, is_active)
+            else:
+                displayer.insert_check_button(
+                    'compression_page__slimming_flow_box',
+                    check_button_name,
+                    category.label,
+                    category.description,
+                    is_active,
+                    on_toggled__compression_page__slimming_check_button)
+        model.slimming_sizes = None
+        displayer.update_label('compression_page__slimming_message', 'Estimating the size of reclaimable files...', False)
+
+        return
+
+    elif action == 'error':
+
+        # Stay on this page, and display the result of the space check.
+        displayer.reset_buttons(
+            back_button_label='❬Back',
+            back_action='back',
+            back_button_style=None,
+            is_back_sensitive=True,
+            is_back_visible=True,
+            next_button_label='Generate❭',
+            next_action='generate',
+            next_button_style='suggested-action',
+            is_next_sensitive=True,
+            is_next_visible=True)
+
+        return
+
+    elif action == 'benchmark':
+
+        # Stay on this page. The Back and Generate buttons remain
+        # sensitive, and interrupt the benchmark.
+        displayer.set_sensitive('compression_page__benchmark_button', False)
+        benchmark_rows.clear()
+        displayer.update_list_store('compression_page__benchmark_list_store', [])
+
         return
 
     else:
@@ -162,6 +260,28 @@ def enter(action, old_page=None):
 
     elif action == 'next':
 
+        displayer.reset_buttons(is_back_sensitive=False, is_next_sensitive=False)
+
+        # Estimate the size of each slimming category in a single scan of
+        # the customized file system.
+        model.slimming_sizes = slimmer.estimate_sizes(model.project.custom_root_directory)
+        for category in slimmer.CATEGORIES:
+            label = f'{category.label} ({slimmer.format_size(model.slimming_sizes[category.key])})'
+            displayer.update_check_button_label(f'{SLIMMING_CHECK_BUTTON_PREFIX}{category.key}', label)
+        update_slimming_message()
+
+        displayer.reset_buttons(is_back_sensitive=True, is_next_sensitive=True)
+
+        return
+
+    elif action == 'benchmark':
+
+        run_benchmark()
+
+        return
+
+    elif action == 'error':
+
         return
 
     else:
@@ -198,16 +318,27 @@ def leave(action, new_page=None):
 
         return
 
+    elif action in ('benchmark', 'error'):
+
+        return
+
     elif action == 'generate':
 
         displayer.reset_buttons(is_back_sensitive=False, is_next_sensitive=False)
 
         # Update the model to acknowledge changes.
         model.options.compression = compression
+        model.options.slimming_categories = [category.key for category in slimmer.CATEGORIES if category.key in slimming_categories]
+        logger.log_value('The selected slimming categories are', model.options.slimming_categories)
 
         # Save the model values.
         model.project.configuration.save()
 
+        # Stay on this page if there is not enough space to generate the
+        # customized disk.
+        if not check_space():
+            return 'error'
+
         return
 
     elif action == 'quit':
@@ -254,8 +385,302 @@ def on_toggled__compression_page__radio_button(toggle_button):
         logger.log_value('The selected compression is', compression)
 
 
+def on_clicked__compression_page__benchmark_button(button):
+
+    logger.log_title('Clicked compression page benchmark button')
+
+    handle_navigation('benchmark')
+
+
+def on_toggled__compression_page__slimming_check_button(check_button):
+
+    key = check_button.get_name()[len(SLIMMING_CHECK_BUTTON_PREFIX):]
+    if check_button.get_active():
+        if key not in slimming_categories:
+            slimming_categories.append(key)
+    elif key in slimming_categories:
+        slimming_categories.remove(key)
+    logger.log_value('The selected slimming categories are', slimming_categories)
+
+    update_slimming_message()
+
+
 ########################################################################
 # Support Functions
 ########################################################################
 
-# N/A
+
+def run_benchmark():
+    """
+    Benchmark each compression on a sample of the customized file
+    system, and display the estimated size and compression time of the
+    whole file system as each result becomes available.
+    """
+
+    processors = os.cpu_count() or 1
+    message = f'Compressing a sample of the Linux file system using {processors} processors...'
+    displayer.update_label('compression_page__benchmark_message', message, False)
+
+    def result_callback(result):
+        benchmark_rows.append([result.name, slimmer.format_size(result.estimated_size), _format_seconds(result.estimated_seconds)])
+        displayer.update_list_store('compression_page__benchmark_list_store', list(benchmark_rows))
+
+    results = benchmarker.run_benchmark(model.project.custom_root_directory, model.project.directory, slimming_categories, result_callback)
+    model.benchmark_results = results
+
+    if results:
+        sample_size = results[0].sample_size
+        total_size = round(sample_size * results[0].estimated_size / results[0].compressed_size)
+        message = f'Estimated from a {slimmer.format_size(sample_size)} sample of the {slimmer.format_size(total_size)} Linux file system. The customized disk uses the default level for each compression.'
+        displayer.update_label('compression_page__benchmark_message', message, False)
+    else:
+        message = 'Error. Unable to benchmark the compressions.'
+        displayer.update_label('compression_page__benchmark_message', message, True)
+    displayer.set_sensitive('compression_page__benchmark_button', True)
+
+
+def check_space():
+    """
+    Predict the size of the compressed Linux file system, the custom
+    disk directory, and the ISO image, and check that there is enough
+    free space for them before generating the customized disk. If there
+    is not enough space, display the shortfall and suggest alternate
+    locations with enough space. If the remaining space would be low,
+    display a warning; clicking Generate again continues anyway.
+
+    Returns:
+    : bool
+        True to continue generating, or False to stay on this page.
+    """
+
+    logger.log_label('Check the space required to generate the disk')
+
+    global space_warning
+
+    # Predict the size of the compressed Linux file system.
+    uncompressed_size = _get_uncompressed_size()
+    ratio, source = _get_compression_ratio(model.options.compression)
+    squashfs_size = round(uncompressed_size * ratio)
+    logger.log_value('The uncompressed size is', f'{uncompressed_size:n} bytes')
+    logger.log_value('The compression ratio is', f'{ratio:.3f} ({source})')
+    logger.log_value('The predicted compressed size is', f'{squashfs_size:n} bytes')
+
+    # The existing compressed Linux file system is replaced.
+    if model.layout.minimal_squashfs_file_name:
+        file_name = model.layout.minimal_squashfs_file_name
+    else:
+        file_name = model.layout.squashfs_file_name
+    squashfs_file_path = os.path.join(model.project.custom_disk_directory, model.layout.squashfs_directory, file_name)
+    existing_squashfs_size = _get_file_size(squashfs_file_path)
+
+    # Predict the size of the custom disk directory and the ISO image.
+    custom_disk_size = file_utilities.get_disk_usage(model.project.custom_disk_directory) or 0
+    custom_disk_size = custom_disk_size - existing_squashfs_size + squashfs_size
+    iso_size = round(custom_disk_size * ISO_OVERHEAD_RATIO)
+    logger.log_value('The predicted custom disk size is', f'{custom_disk_size:n} bytes')
+    logger.log_value('The predicted ISO size is', f'{iso_size:n} bytes')
+
+    # The existing ISO image is replaced.
+    iso_directory = model.custom.iso_directory or model.project.directory
+    iso_file_path = os.path.join(iso_directory, model.custom.iso_file_name or '')
+    existing_iso_size = _get_file_size(iso_file_path) if model.custom.iso_file_name else 0
+
+    # Add up the additional space required on each file system.
+    requirements = {}
+    for directory, size in ((model.project.custom_disk_directory, squashfs_size - existing_squashfs_size), (iso_directory, iso_size - existing_iso_size)):
+        mount_entry = mount_table.find_mount(directory)
+        key = mount_entry.mount_point if mount_entry else directory
+        required_size, _ = requirements.get(key, (0, directory))
+        requirements[key] = (required_size + max(size, 0), directory)
+
+    errors = []
+    warnings = []
+    for mount_point, (required_size, directory) in requirements.items():
+        free_size = _get_free_space(directory)
+        logger.log_value(f'Space on {mount_point}', f'{required_size:n} bytes required, {free_size} bytes free')
+        if free_size is None:
+            continue
+        location = html.escape(mount_point)
+        if required_size > free_size:
+            errors.append(f'{slimmer.format_size(required_size)} is required on {location}, but only {slimmer.format_size(free_size)} is free.')
+        elif required_size + SPACE_MARGIN > free_size:
+            warnings.append(f'Only {slimmer.format_size(free_size - required_size)} will remain free on {location}.')
+
+    estimate = f'The estimated ISO size is {slimmer.format_size(iso_size)}, using the {source} compression ratio.'
+
+    if errors:
+        suggestions = _suggest_locations(max(required_size for required_size, _ in requirements.values()))
+        message = ' '.join(['Error. Not enough space to generate the disk.'] + errors + [estimate])
+        if suggestions:
+            message += f' Consider moving the project or the ISO to {", ".join(suggestions)}.'
+        displayer.update_label('compression_page__space_message', message, True)
+        space_warning = None
+        return False
+
+    if warnings:
+        message = ' '.join(['Warning. The disk may run out of space.'] + warnings + [estimate, 'Click Generate again to continue.'])
+        if message != space_warning:
+            displayer.update_label('compression_page__space_message', message, True)
+            space_warning = message
+            return False
+
+    displayer.update_label('compression_page__space_message', estimate, False)
+    space_warning = None
+    return True
+
+
+def _get_uncompressed_size():
+    """
+    Get the size of the customized file system that will be compressed,
+    excluding the selected slimming categories.
+
+    Returns:
+    : int
+        The size in bytes.
+    """
+
+    if not model.slimming_sizes:
+        model.slimming_sizes = slimmer.estimate_sizes(model.project.custom_root_directory)
+    excluded_size = sum(model.slimming_sizes.get(key, 0) for key in model.options.slimming_categories or [])
+
+    return model.slimming_sizes[None] - excluded_size
+
+
+def _get_compression_ratio(compression):
+    """
+    Get the ratio of the compressed size to the uncompressed size for the
+    compression. Use the benchmark result if available, then the ratio
+    of the previous build, then a typical ratio.
+
+    Arguments:
+    compression : str
+        The compression, such as gzip.
+
+    Returns:
+    : tuple (float, str)
+        The ratio, and a description of its source.
+    """
+
+    for result in model.benchmark_results or []:
+        if result.compression == compression and result.name == compression:
+            return result.compressed_size / result.sample_size, 'benchmark'
+
+    for compression_ratio in model.status.compression_ratios or []:
+        name, _, ratio = compression_ratio.partition(':')
+        if name == compression:
+            try:
+                return float(ratio), 'previous build'
+            except ValueError:
+                pass
+
+    return DEFAULT_COMPRESSION_RATIOS.get(compression, 0.5), 'typical'
+
+
+def _get_file_size(file_path):
+
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def _get_free_space(directory):
+    """
+    Get the space available to unprivileged users on the file system
+    containing the directory.
+
+    Arguments:
+    directory : str
+        The directory, which may not exist yet.
+
+    Returns:
+    : int
+        The free space in bytes, or None if it could not be determined.
+    """
+
+    # Use the nearest existing parent directory.
+    while directory and not os.path.exists(directory):
+        parent_directory = os.path.dirname(directory)
+        if parent_directory == directory:
+            break
+        directory = parent_directory
+
+    try:
+        status = os.statvfs(directory)
+        return status.f_bavail * status.f_frsize
+    except OSError as exception:
+        logger.log_value('Unable to get the free space', exception)
+
+    # Pkexec is required.
+    program = os.path.join(model.application.directory, 'commands', 'directory-usage')
+    command = ['pkexec', program, directory]
+    result, exit_status, signal_status = execute_synchronous(command)
+    try:
+        # The output has a header line and a line with the used space,
+        # available space, and percent used.
+        return int(result.splitlines()[-1].split()[1])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _suggest_locations(required_size):
+    """
+    Find writable local file systems with enough free space.
+
+    Arguments:
+    required_size : int
+        The required space in bytes.
+
+    Returns:
+    : list (str)
+        Up to three locations, with the free space on each, largest
+        first.
+    """
+
+    user_home = model.application.user_home or os.path.expanduser('~')
+    home_mount_entry = mount_table.find_mount(user_home)
+
+    locations = {}
+    for mount_entry in mount_table.get_mounts():
+        if mount_entry.file_system_type in UNSUITABLE_FILE_SYSTEM_TYPES or 'ro' in mount_entry.options.split(','):
+            continue
+        if mount_entry.mount_point.startswith(('/boot', '/proc', '/sys', '/dev', '/run/', '/snap')):
+            continue
+        # Suggest the home directory instead of the root of its file
+        # system.
+        if home_mount_entry and mount_entry.mount_point == home_mount_entry.mount_point:
+            directory = user_home
+        else:
+            directory = mount_entry.mount_point
+        if not os.access(directory, os.W_OK):
+            continue
+        free_size = _get_free_space(directory)
+        if free_size and free_size >= required_size + SPACE_MARGIN:
+            locations[mount_entry.device] = (free_size, directory)
+
+    return [f'{html.escape(directory)} ({slimmer.format_size(free_size)} free)' for free_size, directory in sorted(locations.values(), reverse=True)[:3]]
+
+
+def _format_seconds(seconds):
+
+    minutes, seconds = divmod(round(seconds), 60)
+
+    return f'{minutes}:{seconds:02d}'
+
+
+def update_slimming_message():
+    """
+    Display the total estimated size of the selected slimming categories.
+    """
+
+    if not model.slimming_sizes:
+        return
+
+    total_size = model.slimming_sizes[None]
+    selected_size = sum(model.slimming_sizes[key] for key in slimming_categories if key in model.slimming_sizes)
+    if selected_size:
+        percent = 100 * selected_size / total_size if total_size else 0
+        message = f'The selected files total {slimmer.format_size(selected_size)}, {locale.format_string("%.1f", percent, True)}% of the {slimmer.format_size(total_size)} Linux file system.'
+    else:
+        message = f'The Linux file system is {slimmer.format_size(total_size)}.'
+    displayer.update_label('compression_page__slimming_message', message, False)
@@ -477,7 +477,7 @@ def delete_project_files():
     time.sleep(SLEEP_1000_MS)
 
     if os.path.exists(model.project.custom_root_directory):
-        result, exit_status, signal_status = file_utilities.delete_path_as_root(model.project.custom_root_directory)
+        result, exit_status, signal_status = file_utilities.delete_path_in_background(model.project.custom_root_directory)
         if not signal_status:
             displayer.update_status('delete_page__custom_root_directory', OK)
             displayer.update_label('delete_page__custom_root_directory_message', '', False)
@@ -507,7 +507,7 @@ def delete_project_files():
         is_error_1 = False
         if os.path.exists(model.project.custom_disk_directory):
             # Delete the custom disk directory
-            result, exit_status, signal_status = file_utilities.delete_directory(model.project.custom_disk_directory)
+            result, exit_status, signal_status = file_utilities.delete_path_in_background(model.project.custom_disk_directory)
             logger.log_value('The result is', result)
             logger.log_value('The exit status, signal status is', f'{exit_status}, {signal_status}')
             if signal_status:
@@ -658,8 +658,12 @@ def initialize_model():
     model.status.iso_template = None
     model.status.iso_checksum = None
     model.status.iso_checksum_file_name = None
+    model.status.compression_ratios = None
+    model.status.generate_checkpoints = None
 
     model.options.update_os_release = None
     model.options.has_minimal_install = None
     model.options.boot_configurations = None
     model.options.compression = None
+    model.options.fast_boot_test = None
+    model.options.slimming_categories = None
@@ -44,7 +44,7 @@
 
 from packaging import version
 
-import glob
+import fnmatch
 import locale
 import os
 import time
@@ -236,6 +236,15 @@ def enter(action, old_page=None):
 
             time.sleep(SLEEP_1000_MS)
 
+            # Reuse the analysis of the original ISO from a previous
+            # project, if the same ISO was analyzed before.
+            # • Set model.status.iso_template
+            # • Set model.status.is_success_analyze
+            # • Set model.layout.*
+            is_cached = False
+            if not model.status.iso_template and not model.status.is_success_analyze:
+                is_cached = iso_utilities.load_iso_analysis()
+
             if not model.status.iso_template:
 
                 # Delete the old image files. Ignore errors.
@@ -272,6 +281,10 @@ def enter(action, old_page=None):
 
                 if is_error: return  # Stay on this page.
 
+            # Save the analysis, so it can be reused by new projects.
+            if not is_cached:
+                iso_utilities.save_iso_analysis()
+
             # Pause to allow the user to see the result.
             message = 'Success.'
             displayer.update_label('extract_page__analyze_original_iso_message', message, False)
@@ -312,8 +325,11 @@ def enter(action, old_page=None):
             terminal = model.builder.get_object('terminal_page__terminal')
             terminal.reset(True, True)
 
-            # Delete the custom root directory if it exists.
-            file_utilities.delete_path_as_root(model.project.custom_root_directory)
+            # Delete the custom root directory if it exists. The
+            # directory is moved to the trash, and the disk space is
+            # reclaimed in the background while extracting.
+            if os.path.lexists(model.project.custom_root_directory):
+                file_utilities.delete_path_in_background(model.project.custom_root_directory)
 
             # Identify squashfs files to extract.
             directory_path = os.path.join(model.project.iso_mount_point, model.layout.squashfs_directory)
@@ -463,79 +479,144 @@ def analyze_iso_template():
         return False
 
 
-def identify_directories_and_files(source_directory_path, directory_attribute, file_attribute):
+def index_iso_layout(source_directory_path):
     """
-    Identify a directory by searching for files within the directory.
+    Scan the source directory once, and create an index of the
+    directories that may contain layout files, and the files in each of
+    these directories. Only directories up to the depth of the deepest
+    directory pattern in the layout are scanned.
+
+    Arguments:
+    source_directory_path : str
+        The source directory path.
+
+    Returns:
+    layout_index : dict
+        A dictionary of relative directory paths to sorted lists of file
+        names in each directory. Only files that exist are included, so
+        broken links are excluded. The source directory itself is
+        included as ".".
     """
 
-    directory_patterns = model.layout.values(directory_attribute)
-    for directory_pattern in directory_patterns:
-        directory_path_pattern = os.path.join(source_directory_path, directory_pattern)
-        directory_paths = glob.glob(directory_path_pattern)
+    directory_attributes = ['casper_directory', 'squashfs_directory']
+    depth = max(directory_pattern.count('/') + 1 \
+                for directory_attribute in directory_attributes \
+                for directory_pattern in model.layout.values(directory_attribute))
+
+    layout_index = {}
+    directory_paths = [os.curdir]
+    for level in range(depth + 1):
+        subdirectory_paths = []
         for directory_path in directory_paths:
-            if os.path.exists(directory_path):
-                file_name_patterns = model.layout.values(file_attribute)
-                for file_name_pattern in file_name_patterns:
-                    file_path_pattern = os.path.join(directory_path, file_name_pattern)
-                    file_paths = glob.glob(file_path_pattern)
-                    for file_path in file_paths:
-                        if os.path.exists(file_path):
-                            # Set the directory.
-                            directory = os.path.relpath(directory_path, source_directory_path)
-                            model.layout.set(directory_attribute, directory, True)
-                            # Set the file name.
-                            file_name = os.path.relpath(file_path, directory_path)
-                            model.layout.set(file_attribute, file_name, True)
-
-
-def identify_directories(source_directory_path, directory_attribute, file_attribute):
+            file_names = []
+            try:
+                with os.scandir(os.path.join(source_directory_path, directory_path)) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            file_names.append(entry.name)
+                            if level < depth:
+                                subdirectory_paths.append(os.path.normpath(os.path.join(directory_path, entry.name)))
+                        elif not entry.is_symlink() or os.path.exists(entry.path):
+                            file_names.append(entry.name)
+            except OSError as exception:
+                logger.log_value('Unable to scan', directory_path)
+                logger.log_value('The exception is', exception)
+                continue
+            layout_index[directory_path] = sorted(file_names)
+        directory_paths = subdirectory_paths
+
+    return layout_index
+
+
+def _match_pattern(name, pattern):
+    """
+    Check if the name matches the pattern, using the same rules as
+    glob.glob(), where names starting with "." are only matched by
+    patterns starting with ".".
+
+    Arguments:
+    name : str
+        The directory path or file name.
+    pattern : str
+        The directory path pattern or file name pattern.
+
+    Returns:
+    : bool
+        True if the name matches the pattern, False otherwise.
+    """
+
+    names = name.split('/')
+    patterns = pattern.split('/')
+    if len(names) != len(patterns):
+        return False
+    for name, pattern in zip(names, patterns):
+        if name.startswith('.') and not pattern.startswith('.'):
+            return False
+        if not fnmatch.fnmatchcase(name, pattern):
+            return False
+    return True
+
+
+def _find_layout_matches(layout_index, directory_attribute, file_attribute):
+    """
+    Find directories matching the directory attribute patterns that
+    contain files matching the file attribute patterns.
+
+    Arguments:
+    layout_index : dict
+        The index created by index_iso_layout().
+    directory_attribute : str
+        The name of the directory attribute.
+    file_attribute : str
+        The name of the file attribute.
+
+    Returns:
+    : list (tuple (str, str))
+        The matching relative directory paths and file names.
+    """
+
+    matches = []
+    for directory_pattern in model.layout.values(directory_attribute):
+        directory_paths = [directory_path for directory_path in layout_index if _match_pattern(directory_path, directory_pattern)]
+        for directory_path in sorted(directory_paths):
+            for file_name_pattern in model.layout.values(file_attribute):
+                for file_name in layout_index[directory_path]:
+                    if _match_pattern(file_name, file_name_pattern):
+                        matches.append((directory_path, file_name))
+
+    return matches
+
+
+def identify_directories_and_files(layout_index, directory_attribute, file_attribute):
     """
     Identify a directory by searching for files within the directory.
     """
 
-    directory_patterns = model.layout.values(directory_attribute)
-    for directory_pattern in directory_patterns:
-        directory_path_pattern = os.path.join(source_directory_path, directory_pattern)
-        directory_paths = glob.glob(directory_path_pattern)
-        for directory_path in directory_paths:
-            if os.path.exists(directory_path):
-                file_name_patterns = model.layout.values(file_attribute)
-                for file_name_pattern in file_name_patterns:
-                    file_path_pattern = os.path.join(directory_path, file_name_pattern)
-                    file_paths = glob.glob(file_path_pattern)
-                    for file_path in file_paths:
-                        if os.path.exists(file_path):
-                            # Set the directory.
-                            directory = os.path.relpath(directory_path, source_directory_path)
-                            model.layout.set(directory_attribute, directory, True)
-                            # Set the file name.
-                            # file_name = os.path.relpath(file_path, directory_path)
-                            # model.layout.set(file_attribute, file_name, True)
-
-
-def identify_files(source_directory_path, directory_attribute, file_attribute):
+    for directory, file_name in _find_layout_matches(layout_index, directory_attribute, file_attribute):
+        # Set the directory.
+        model.layout.set(directory_attribute, directory, True)
+        # Set the file name.
+        model.layout.set(file_attribute, file_name, True)
+
+
+def identify_directories(layout_index, directory_attribute, file_attribute):
+    """
+    Identify a directory by searching for files within the directory.
+    """
+
+    for directory, file_name in _find_layout_matches(layout_index, directory_attribute, file_attribute):
+        # Set the directory.
+        model.layout.set(directory_attribute, directory, True)
+
+
+def identify_files(layout_index, directory_attribute, file_attribute):
     """
     Identify files within the directory.
     """
 
-    directory_patterns = model.layout.values(directory_attribute)
-    for directory_pattern in directory_patterns:
-        directory_path_pattern = os.path.join(source_directory_path, directory_pattern)
-        directory_paths = glob.glob(directory_path_pattern)
-        for directory_path in directory_paths:
-            if os.path.exists(directory_path):
-                file_name_patterns = model.layout.values(file_attribute)
-                for file_name_pattern in file_name_patterns:
-                    file_path_pattern = os.path.join(directory_path, file_name_pattern)
-                    file_paths = glob.glob(file_path_pattern)
-                    for file_path in file_paths:
-                        if os.path.exists(file_path):
-                            # Set the directory.
-                            # directory = os.path.relpath(directory_path, source_directory_path)
-                            # model.layout.set(directory_attribute, directory, True)
-                            # Set the file name.
-                            file_name = os.path.relpath(file_path, directory_path)
-                            model.layout.set(file_attribute, file_name, True)
+    for directory, file_name in _find_layout_matches(layout_index, directory_attribute, file_attribute):
+        # Set the file name.
+        model.layout.set(file_attribute, file_name, True)
 
 
 def analyze_iso_layout(source_directory_path):
@@ -590,51 +671,55 @@ def analyze_iso_layout(source_directory_path):
     # reset, so the values from the previous ISO are not preserved.
     model.layout.reset()
 
+    # Scan the source directory once, instead of searching for each
+    # pattern in the file system.
+    layout_index = index_iso_layout(source_directory_path)
+
     # Casper Section (Directories)
     # Identify the casper_directory using:
     # • initrd_file_name
     # • vmlinuz_file_name
-    identify_directories(source_directory_path, 'casper_directory', 'initrd_file_name')
-    identify_directories(source_directory_path, 'casper_directory', 'vmlinuz_file_name')
+    identify_directories(layout_index, 'casper_directory', 'initrd_file_name')
+    identify_directories(layout_index, 'casper_directory', 'vmlinuz_file_name')
 
     # Casper Section (Files)
-    identify_files(source_directory_path, 'casper_directory', 'initrd_file_name')
-    identify_files(source_directory_path, 'casper_directory', 'vmlinuz_file_name')
+    identify_files(layout_index, 'casper_directory', 'initrd_file_name')
+    identify_files(layout_index, 'casper_directory', 'vmlinuz_file_name')
 
     # General Section (Directories)
     # Identify the squashfs_directory using:
     # • squashfs_file_name
     # • minimal_squashfs_file_name
     # • standard_squashfs_file_name
-    identify_directories(source_directory_path, 'squashfs_directory', 'squashfs_file_name')
-    identify_directories(source_directory_path, 'squashfs_directory', 'minimal_squashfs_file_name')
-    identify_directories(source_directory_path, 'squashfs_directory', 'standard_squashfs_file_name')
+    identify_directories(layout_index, 'squashfs_directory', 'squashfs_file_name')
+    identify_directories(layout_index, 'squashfs_directory', 'minimal_squashfs_file_name')
+    identify_directories(layout_index, 'squashfs_directory', 'standard_squashfs_file_name')
 
     # General Section (Files)
-    identify_files(source_directory_path, 'squashfs_directory', 'squashfs_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'manifest_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'minimal_remove_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'standard_remove_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'size_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'squashfs_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'manifest_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'minimal_remove_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'standard_remove_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'size_file_name')
 
     # Minimal Section
-    identify_files(source_directory_path, 'squashfs_directory', 'minimal_squashfs_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'minimal_manifest_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'minimal_size_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'minimal_squashfs_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'minimal_manifest_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'minimal_size_file_name')
 
     # Standard Section
-    identify_files(source_directory_path, 'squashfs_directory', 'standard_squashfs_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'standard_manifest_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'standard_size_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'standard_squashfs_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'standard_manifest_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'standard_size_file_name')
 
     # Installer / Live Section
-    identify_files(source_directory_path, 'squashfs_directory', 'installer_sources_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'installer_squashfs_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'installer_manifest_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'installer_size_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'installer_generic_squashfs_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'installer_generic_manifest_file_name')
-    identify_files(source_directory_path, 'squashfs_directory', 'installer_generic_size_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'installer_sources_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'installer_squashfs_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'installer_manifest_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'installer_size_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'installer_generic_squashfs_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'installer_generic_manifest_file_name')
+    identify_files(layout_index, 'squashfs_directory', 'installer_generic_size_file_name')
 
     # print('-' * 80)
     # model.layout.print()
@@ -1120,6 +1205,16 @@ def extract_squashfs(file_name, file_number, total_files):
     program = os.path.join(model.application.directory, 'commands', 'extract-root')
     command = ['pkexec', program, target_file_path, source_file_path]
 
+    # Extract the squashfs file system directly from the original ISO
+    # file, if it is stored in a single extent, to avoid reading it
+    # through the ISO mount point.
+    iso_file_path = os.path.join(model.original.iso_directory, model.original.iso_file_name)
+    iso_squashfs_file_path = os.path.join(model.layout.squashfs_directory, file_name)
+    offset = iso_utilities.get_iso_file_offset(iso_file_path, iso_squashfs_file_path)
+    if offset is not None:
+        logger.log_value('Extract directly from the ISO file', iso_file_path)
+        command = ['pkexec', program, target_file_path, iso_file_path, str(offset)]
+
     # The progress callback function.
     def progress_callback(percent):
         total_percent = (FINAL_PERCENT * file_number + percent) / total_files
@@ -120,6 +120,7 @@ def setup(action, old_page=None):
 
         displayer.update_status('finish_page__delete_project_files', BLANK)
         displayer.activate_check_button('finish_page__delete_project_files_check_button', False)
+        displayer.activate_check_button('finish_page__fast_boot_test_check_button', bool(model.options.fast_boot_test))
 
         displayer.reset_buttons(
             back_button_label='❬Back',
@@ -153,6 +154,7 @@ def setup(action, old_page=None):
 
         displayer.update_status('finish_page__delete_project_files', BLANK)
         displayer.activate_check_button('finish_page__delete_project_files_check_button', False)
+        displayer.activate_check_button('finish_page__fast_boot_test_check_button', bool(model.options.fast_boot_test))
 
         displayer.reset_buttons(
             back_button_label='❬Back',
@@ -241,6 +243,8 @@ def leave(action, new_page=None):
 
         displayer.set_visible('finish_page__test_header_bar_button', False)
 
+        store_fast_boot_test()
+
         return
 
     elif action == 'test':
@@ -249,6 +253,8 @@ def leave(action, new_page=None):
 
         displayer.set_visible('finish_page__test_header_bar_button', False)
 
+        store_fast_boot_test()
+
         return
 
     if action == 'close':
@@ -259,11 +265,14 @@ def leave(action, new_page=None):
 
         displayer.set_sensitive('finish_page__delete_project_files_check_button', False)
 
+        displayer.set_sensitive('finish_page__fast_boot_test_check_button', False)
+
         options_page.preseed_tab.remove_tree()
         options_page.boot_tab.remove_tree()
 
         # Save the model values.
         # model.project.configuration.save()
+        store_fast_boot_test()
 
         iso_utilities.unmount_iso_and_delete_mount_point(model.project.iso_mount_point)
 
@@ -293,6 +302,7 @@ def leave(action, new_page=None):
 
         # Save the model values.
         # model.project.configuration.save()
+        store_fast_boot_test()
 
         iso_utilities.unmount_iso_and_delete_mount_point(model.project.iso_mount_point)
 
@@ -382,6 +392,19 @@ def store_generated_iso_values():
     # model.generated.iso_checksum_file_name = model.status.iso_checksum_file_name
 
 
+def store_fast_boot_test():
+    """
+    Save the fast boot test option in the project configuration, so it
+    is used for later tests from the Project page and the Finish page.
+    """
+
+    check_button = model.builder.get_object('finish_page__fast_boot_test_check_button')
+    model.options.fast_boot_test = check_button.get_active()
+    logger.log_value('Use fast boot test mode?', model.options.fast_boot_test)
+
+    model.project.configuration.save()
+
+
 def unmount_original_iso():
 
     is_error = False
@@ -438,7 +461,7 @@ def delete_project_files():
     logger.log_value('Delete the custom root directory', model.project.custom_root_directory)
     # time.sleep(SLEEP_1000_MS)
     if os.path.exists(model.project.custom_root_directory):
-        result, exit_status, signal_status = file_utilities.delete_path_as_root(model.project.custom_root_directory)
+        result, exit_status, signal_status = file_utilities.delete_path_in_background(model.project.custom_root_directory)
         if not signal_status:
             # OK
             pass
@@ -454,7 +477,7 @@ def delete_project_files():
     logger.log_value('Delete the custom disk directory', model.project.custom_disk_directory)
     # time.sleep(SLEEP_1000_MS)
     if os.path.exists(model.project.custom_disk_directory):
-        result, exit_status, signal_status = file_utilities.delete_directory(model.project.custom_disk_directory)
+        result, exit_status, signal_status = file_utilities.delete_path_in_background(model.project.custom_disk_directory)
         if not signal_status:
             # OK
             pass
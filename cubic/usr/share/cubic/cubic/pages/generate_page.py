@@ -39,6 +39,8 @@
 ########################################################################
 
 import getpass
+import glob
+import hashlib
 import locale
 import os
 import re
@@ -48,6 +50,7 @@ import time
 from cubic.constants import BOLD_RED, NORMAL
 from cubic.constants import FINAL_PERCENT
 from cubic.constants import GAP
+from cubic.constants import IMAGE_FILE_NAME
 from cubic.constants import MIB, GIB, MAXIMUM_DISK_SIZE_BYTES, MAXIMUM_DISK_SIZE_GIB
 from cubic.constants import OK, ERROR, OPTIONAL, BULLET, PROCESSING, BLANK
 from cubic.constants import SLEEP_0500_MS
@@ -60,6 +63,8 @@ from cubic.utilities import file_utilities
 from cubic.utilities import iso_utilities
 from cubic.utilities import logger
 from cubic.utilities import model
+from cubic.utilities import slimmer
+from cubic.utilities.emulator import ACCESS_ORDER_FILE_NAME
 from cubic.utilities.processor import execute_synchronous
 from cubic.utilities.progressor import track_progress
 
@@ -69,6 +74,32 @@ from cubic.utilities.progressor import track_progress
 
 name = 'generate_page'
 
+# The mksquashfs sort file, in the project directory, created from the
+# boot access order. See create_squashfs_sort_file().
+SQUASHFS_SORT_FILE_NAME = 'squashfs-sort.txt'
+
+# The mksquashfs exclude file, in the project directory, created from the
+# slimming categories selected on the Compression page.
+SQUASHFS_EXCLUDE_FILE_NAME = 'squashfs-exclude.txt'
+
+# The highest mksquashfs sort priority. Files with higher priorities are
+# placed first in the squashfs file.
+MAXIMUM_SORT_PRIORITY = 32767
+
+# The stages that are skipped if their inputs and outputs have not
+# changed since they last completed, so generating the disk image again
+# (for example, after the disk image could not be created) resumes at
+# the stage that failed. The stages are saved as checkpoints in the
+# project configuration, in the format "stage:fingerprint:value".
+KERNEL_FILES_STAGE = 'copy_kernel_files'
+SQUASHFS_STAGE = 'create_squashfs'
+FILE_SYSTEM_SIZE_STAGE = 'file_system_size'
+ISO_IMAGE_STAGE = 'create_iso_image'
+
+# The directory and disk usage of the customized file system, calculated
+# with its fingerprint. See _get_root_fingerprint().
+root_disk_usage = None
+
 ########################################################################
 # Navigation Functions
 ########################################################################
@@ -175,8 +206,18 @@ def enter(action, old_page=None):
 
         displayer.update_status('generate_page__copy_boot_files', PROCESSING)
         time.sleep(SLEEP_0500_MS)
-        is_error = copy_kernel_files()
-        if is_error: return  # Stay on this page.
+        fingerprint = _get_kernel_files_fingerprint()
+        if _is_stage_complete(KERNEL_FILES_STAGE, fingerprint, _get_kernel_files_validator()):
+            logger.log_value('Skip stage', KERNEL_FILES_STAGE)
+            message = 'Skipped. The boot files have not changed.'
+            displayer.update_progress_bar_percent('generate_page__copy_boot_files_progress_bar', FINAL_PERCENT)
+            displayer.update_label('generate_page__copy_boot_files_message', message, False)
+            displayer.update_status('generate_page__copy_boot_files', OK)
+        else:
+            _set_checkpoint(KERNEL_FILES_STAGE)
+            is_error = copy_kernel_files()
+            if is_error: return  # Stay on this page.
+            _set_checkpoint(KERNEL_FILES_STAGE, fingerprint, _get_kernel_files_validator())
         time.sleep(SLEEP_0500_MS)
 
         # --------------------------------------------------------------
@@ -185,9 +226,21 @@ def enter(action, old_page=None):
 
         displayer.update_status('generate_page__create_squashfs', PROCESSING)
         time.sleep(SLEEP_0500_MS)
-        is_error = create_squashfs()
-        sys.stdout.flush()  # Flush the output before proceeding.
-        if is_error: return  # Stay on this page.
+        displayer.update_label('generate_page__create_squashfs_message', 'Checking for changes to the Linux file system...', False)
+        fingerprint = _get_squashfs_fingerprint()
+        if _is_stage_complete(SQUASHFS_STAGE, fingerprint, _get_squashfs_checkpoint_validator()):
+            logger.log_value('Skip stage', SQUASHFS_STAGE)
+            message = f'Skipped. The Linux file system has not changed since it was compressed using {model.options.compression} compression.'
+            displayer.update_progress_bar_text('generate_page__create_squashfs_progress_bar', f'{locale.format_string("%.1f", FINAL_PERCENT, True)}{GAP}%')
+            displayer.update_progress_bar_percent('generate_page__create_squashfs_progress_bar', FINAL_PERCENT)
+            displayer.update_label('generate_page__create_squashfs_message', message, False)
+            displayer.update_status('generate_page__create_squashfs', OK)
+        else:
+            _set_checkpoint(SQUASHFS_STAGE)
+            is_error = create_squashfs()
+            sys.stdout.flush()  # Flush the output before proceeding.
+            if is_error: return  # Stay on this page.
+            _set_checkpoint(SQUASHFS_STAGE, fingerprint, _get_squashfs_checkpoint_validator())
         time.sleep(SLEEP_0500_MS)
 
         # --------------------------------------------------------------
@@ -244,9 +297,19 @@ def enter(action, old_page=None):
 
         displayer.update_status('generate_page__create_iso_image', PROCESSING)
         time.sleep(SLEEP_0500_MS)
-        is_error = create_iso_image()
-        sys.stdout.flush()  # Flush the output before proceeding.
-        if is_error: return  # Stay on this page.
+        fingerprint = _get_iso_image_fingerprint()
+        if _is_stage_complete(ISO_IMAGE_STAGE, fingerprint, _get_iso_image_validator()):
+            logger.log_value('Skip stage', ISO_IMAGE_STAGE)
+            displayer.update_progress_bar_text('generate_page__create_iso_image_progress_bar', f'{locale.format_string("%.1f", FINAL_PERCENT, True)}{GAP}%')
+            displayer.update_progress_bar_percent('generate_page__create_iso_image_progress_bar', FINAL_PERCENT)
+            is_error = update_iso_image_size()
+            if is_error: return  # Stay on this page.
+        else:
+            _set_checkpoint(ISO_IMAGE_STAGE)
+            is_error = create_iso_image()
+            sys.stdout.flush()  # Flush the output before proceeding.
+            if is_error: return  # Stay on this page.
+            _set_checkpoint(ISO_IMAGE_STAGE, fingerprint, _get_iso_image_validator())
         time.sleep(SLEEP_0500_MS)
 
         # --------------------------------------------------------------
@@ -373,16 +436,10 @@ def copy_kernel_files():
     # 6: note
     # 7: is_selected
 
-    list_store = model.builder.get_object('kernel_tab__list_store')
-    for selected_index, kernel_details in enumerate(list_store):
-        if kernel_details[7]:
-            break
-    else:
-        selected_index = 0
-    logger.log_value('The selected kernel is index number', selected_index)
+    kernel_details = _get_selected_kernel_details()
 
     # Get the selected directory.
-    source_directory = list_store[selected_index][5]
+    source_directory = kernel_details[5]
 
     # Get the target directory.
     target_directory = os.path.join(model.project.custom_disk_directory, model.layout.casper_directory)
@@ -395,9 +452,9 @@ def copy_kernel_files():
 
     logger.log_label('Update the vmlinuz boot file')
 
-    source_file_name = list_store[selected_index][1]
+    source_file_name = kernel_details[1]
     source_file_path = os.path.join(source_directory, source_file_name)
-    target_file_name = list_store[selected_index][2]
+    target_file_name = kernel_details[2]
     target_file_path = os.path.join(target_directory, target_file_name)
     user = getpass.getuser()
 
@@ -447,9 +504,9 @@ def copy_kernel_files():
 
     logger.log_label('Update the initrd boot file')
 
-    source_file_name = list_store[selected_index][3]
+    source_file_name = kernel_details[3]
     source_file_path = os.path.join(source_directory, source_file_name)
-    target_file_name = list_store[selected_index][4]
+    target_file_name = kernel_details[4]
     target_file_path = os.path.join(target_directory, target_file_name)
     user = getpass.getuser()
 
@@ -509,6 +566,66 @@ def copy_kernel_files():
     return False  # (No error)
 
 
+def _get_selected_kernel_details():
+    """
+    Get the details of the kernel selected on the Kernel tab. If no
+    kernel is selected, the first kernel is used.
+
+    Returns:
+    : list
+        The kernel details. See copy_kernel_files().
+    """
+
+    list_store = model.builder.get_object('kernel_tab__list_store')
+    for selected_index, kernel_details in enumerate(list_store):
+        if kernel_details[7]:
+            break
+    else:
+        selected_index = 0
+    logger.log_value('The selected kernel is index number', selected_index)
+
+    return list(list_store[selected_index])
+
+
+def _get_kernel_files_fingerprint():
+    """
+    Identify the inputs of copy_kernel_files(): the selected kernel files
+    and the names they are copied to.
+
+    Returns:
+    : str
+        The fingerprint.
+    """
+
+    kernel_details = _get_selected_kernel_details()
+    source_directory = kernel_details[5]
+    values = [kernel_details[2], kernel_details[4]]
+    for file_name in (kernel_details[1], kernel_details[3]):
+        file_path = os.path.join(source_directory, file_name)
+        values.append((file_path, _get_file_status(file_path)))
+
+    return _create_fingerprint(values)
+
+
+def _get_kernel_files_validator():
+    """
+    Identify the outputs of copy_kernel_files(): the vmlinuz and initrd
+    files on the custom disk.
+
+    Returns:
+    : str
+        The fingerprint, or None if either file does not exist.
+    """
+
+    kernel_details = _get_selected_kernel_details()
+    target_directory = os.path.join(model.project.custom_disk_directory, model.layout.casper_directory)
+    values = [_get_file_status(os.path.join(target_directory, kernel_details[index])) for index in (2, 4)]
+    if None in values:
+        return None
+
+    return _create_fingerprint(values)
+
+
 def _copy_kernel_file(source_file_path, target_file_path, user, file_number, total_files):
     """
     Raises exception.
@@ -569,6 +686,19 @@ def create_squashfs():
     program = os.path.join(model.application.directory, 'commands', 'compress-root')
     command = ['pkexec', program, source_file_path, target_file_path, model.options.compression]
 
+    # Place the files read during boot first, if the boot access order
+    # has been captured by a boot test.
+    sort_file_path = create_squashfs_sort_file(source_file_path)
+
+    # Exclude the slimming categories selected on the Compression page.
+    exclude_file_path = os.path.join(model.project.directory, SQUASHFS_EXCLUDE_FILE_NAME)
+    exclude_file_path = slimmer.create_exclude_file(model.options.slimming_categories, source_file_path, exclude_file_path)
+
+    if sort_file_path or exclude_file_path:
+        command.append(sort_file_path or '')
+    if exclude_file_path:
+        command.append(exclude_file_path)
+
     # Show % in progress by setting text to None.
     # displayer.update_progress_bar_text('generate_page__create_squashfs_progress_bar', None)
     displayer.update_progress_bar_text('generate_page__create_squashfs_progress_bar', f'0.0{GAP}%')
@@ -580,6 +710,7 @@ def create_squashfs():
         if percent % 10 == 0:
             logger.log_value('Completed', f'{percent:n}%')
 
+    start_time = time.perf_counter()
     try:
         track_progress(command, progress_callback)
     except InterruptException as exception:
@@ -605,6 +736,10 @@ def create_squashfs():
         logger.log_value('Do not propagate exception', exception)
         return True  # (Error)
 
+    if exclude_file_path:
+        _report_slimming_savings(time.perf_counter() - start_time, target_file_path)
+    _save_compression_ratio(target_file_path)
+
     # ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~
     # TODO:
     # Remove this *comment* in the future. [2024-08-10]
@@ -666,6 +801,219 @@ def create_squashfs():
     return False  # (No error)
 
 
+def _save_compression_ratio(target_file_path):
+    """
+    Save the ratio of the compressed size to the uncompressed size for
+    the selected compression, so the size of the next build can be
+    predicted on the Compression page. The ratio is saved in the project
+    configuration with the other model values on the Finish page.
+
+    Arguments:
+    target_file_path : str
+        The compressed Linux file system.
+    """
+
+    sizes = model.slimming_sizes
+    if not sizes:
+        return
+
+    uncompressed_size = sizes[None] - sum(sizes.get(key, 0) for key in model.options.slimming_categories or [])
+    try:
+        compressed_size = os.path.getsize(target_file_path)
+    except OSError:
+        return
+    if uncompressed_size <= 0:
+        return
+
+    ratio = compressed_size / uncompressed_size
+    logger.log_value('The compression ratio is', f'{ratio:.4f}')
+    compression_ratios = [compression_ratio for compression_ratio in model.status.compression_ratios or [] if not compression_ratio.startswith(f'{model.options.compression}:')]
+    compression_ratios.append(f'{model.options.compression}:{ratio:.4f}')
+    model.status.compression_ratios = compression_ratios
+
+
+def _report_slimming_savings(seconds, target_file_path):
+    """
+    Report the data excluded by the selected slimming categories, and
+    estimate the compressed bytes and the seconds saved. The estimates
+    assume the excluded files would have been compressed at the same
+    rate and ratio as the rest of the customized file system.
+
+    Arguments:
+    seconds : float
+        The time taken to compress the customized file system.
+    target_file_path : str
+        The compressed Linux file system.
+    """
+
+    sizes = model.slimming_sizes
+    if not sizes:
+        return
+
+    excluded_size = sum(sizes.get(key, 0) for key in model.options.slimming_categories)
+    included_size = sizes[None] - excluded_size
+    if not excluded_size or included_size <= 0:
+        return
+
+    try:
+        compressed_size = os.path.getsize(target_file_path)
+    except OSError:
+        return
+
+    saved_size = excluded_size * compressed_size / included_size
+    saved_seconds = seconds * excluded_size / included_size
+    logger.log_value('Slimming excluded', f'{excluded_size:n} bytes')
+    logger.log_value('Estimated compressed bytes saved', f'{saved_size:n} bytes')
+    logger.log_value('Estimated seconds saved', f'{saved_seconds:.1f} seconds')
+
+    message = f'Using {model.options.compression} compression. Excluded {slimmer.format_size(excluded_size)}, saving about {slimmer.format_size(saved_size)} and {saved_seconds:.0f} seconds.'
+    displayer.update_label('generate_page__create_squashfs_message', message, False)
+
+
+def create_squashfs_sort_file(source_directory):
+    """
+    Create a mksquashfs sort file from the boot access order saved by the
+    boot test, so the files read during boot are stored contiguously, in
+    the order they are read, at the front of the squashfs file. This
+    reduces seeking on optical and USB media when the live system boots.
+    Files that no longer exist in the customized file system, and file
+    paths that mksquashfs can not parse, are skipped.
+
+    Arguments:
+    source_directory : str
+        The customized root directory being compressed.
+
+    Returns:
+    : str
+        The path of the sort file, or None if the boot access order is
+        not available.
+    """
+
+    access_order_file_path = os.path.join(model.project.directory, ACCESS_ORDER_FILE_NAME)
+    if not os.path.isfile(access_order_file_path):
+        return None
+
+    with open(access_order_file_path) as file:
+        file_paths = file.read().splitlines()
+
+    sort_file_path = os.path.join(model.project.directory, SQUASHFS_SORT_FILE_NAME)
+    count = 0
+    with open(sort_file_path, 'w') as file:
+        for file_path in file_paths:
+            if not file_path or file_path.startswith('/') or re.search(r'[\s\\]', file_path):
+                continue
+            if not os.path.lexists(os.path.join(source_directory, file_path)):
+                continue
+            file.write(f'{file_path} {max(MAXIMUM_SORT_PRIORITY - count, 1)}\n')
+            count += 1
+
+    logger.log_value('Files ordered for boot', f'{count:n} of {len(file_paths):n}')
+    logger.log_value('The squashfs sort file is', sort_file_path)
+
+    return sort_file_path if count else None
+
+
+def _get_squashfs_fingerprint():
+    """
+    Identify the inputs of create_squashfs(): the contents of the
+    customized file system, the compression, the exclude patterns for
+    the selected slimming categories (which depend on the selected
+    kernel), the boot access order, and the compressed file name.
+
+    Returns:
+    : str
+        The fingerprint, or None if the fingerprint of the customized
+        file system could not be calculated.
+    """
+
+    source_file_path = model.project.custom_root_directory
+    root_fingerprint = _get_root_fingerprint(source_file_path)
+    if not root_fingerprint:
+        return None
+
+    patterns = [pattern for key in sorted(model.options.slimming_categories or []) for pattern in slimmer.get_patterns(key, source_file_path)]
+
+    access_order = _get_file_checksum(os.path.join(model.project.directory, ACCESS_ORDER_FILE_NAME))
+
+    if model.layout.minimal_squashfs_file_name:
+        file_name = model.layout.minimal_squashfs_file_name
+    else:
+        file_name = model.layout.squashfs_file_name
+    target_file_path = os.path.join(model.project.custom_disk_directory, model.layout.squashfs_directory, file_name)
+
+    values = [root_fingerprint, model.options.compression, patterns, access_order, target_file_path]
+
+    return _create_fingerprint(values)
+
+
+def _get_squashfs_checkpoint_validator():
+    """
+    Identify the outputs of create_squashfs(): the compressed Linux file
+    system and, for minimal installs, the link to it from the standard
+    Linux file system.
+
+    Returns:
+    : str
+        The fingerprint, or None if the compressed Linux file system or
+        the link does not exist.
+    """
+
+    validator = _get_squashfs_validator()
+    if not validator:
+        return None
+
+    values = [validator]
+    if model.layout.minimal_squashfs_file_name:
+        link_path = os.path.join(model.project.custom_disk_directory, model.layout.squashfs_directory, model.layout.standard_squashfs_file_name)
+        try:
+            values.append(os.readlink(link_path))
+        except OSError:
+            return None
+
+    return _create_fingerprint(values)
+
+
+def _get_root_fingerprint(directory_path):
+    """
+    Calculate a fingerprint of the contents of a root file system. The
+    fingerprint changes if any file is added, removed, or modified. The
+    disk usage of the root file system is calculated in the same pass,
+    and saved for _get_file_system_size().
+
+    Arguments:
+    directory_path : str
+        The full path of the root directory.
+
+    Returns:
+    : str
+        The fingerprint, or None if it could not be calculated.
+    """
+
+    global root_disk_usage
+    root_disk_usage = None
+
+    logger.log_label('Calculate the fingerprint of the customized file system')
+
+    # Pkexec is required because some directories are only readable by
+    # root.
+    program = os.path.join(model.application.directory, 'commands', 'fingerprint-root')
+    command = ['pkexec', program, directory_path]
+    result, exit_status, signal_status = execute_synchronous(command)
+    fingerprint_information = re.search(r'^([0-9a-f]{32})\s+([0-9]+)\r?$', result or '', re.MULTILINE)
+    if exit_status or signal_status or not fingerprint_information:
+        logger.log_value('Unable to calculate the fingerprint for', directory_path)
+        logger.log_value('The exit status, signal status is', f'{exit_status}, {signal_status}')
+        return None
+
+    fingerprint = fingerprint_information.group(1)
+    logger.log_value('The fingerprint is', fingerprint)
+
+    root_disk_usage = (directory_path, int(fingerprint_information.group(2)))
+    logger.log_value('The disk usage is', f'{root_disk_usage[1]:n} bytes')
+
+    return fingerprint
+
+
 def create_squashfs_TESTING_1():
     """
     This function does nothing.
@@ -770,12 +1118,7 @@ def update_file_system_size():
 
     # Calculate the customized file system size.
     try:
-        # Pkexec is required.
-        program = os.path.join(model.application.directory, 'commands', 'file-size')
-        command = ['pkexec', program, model.project.custom_root_directory]
-        result, exit_status, signal_status = execute_synchronous(command)
-        size_1_information = re.search(r'^([0-9]+)\s', result)
-        size_1_in_bytes = int(size_1_information.group(1))
+        size_1_in_bytes = _get_file_system_size()
         size_1_in_mib = size_1_in_bytes / MIB
         size_1_in_gib = size_1_in_bytes / GIB
         logger.log_value('The customized Linux file system size is', f'{locale.format_string("%.2f", size_1_in_gib, True)} GiB ({size_1_in_bytes:n} bytes)')
@@ -904,6 +1247,121 @@ def update_file_system_size():
     return False  # (No error)
 
 
+def _get_file_system_size():
+    """
+    Get the size of the customized file system. The size only changes
+    when the file system is compressed again, so the size is saved with
+    the checkpoint of the compressed Linux file system, and reused until
+    it is compressed again. Otherwise, use the size calculated with the
+    fingerprint of the customized file system, before it was compressed.
+
+    Returns:
+    : int
+        The size in bytes.
+
+    Raises:
+    : Exception
+        If the size could not be determined.
+    """
+
+    squashfs_checkpoint = _get_checkpoint(SQUASHFS_STAGE)
+    fingerprint = _create_fingerprint([squashfs_checkpoint]) if squashfs_checkpoint else None
+
+    checkpoint = _get_checkpoint(FILE_SYSTEM_SIZE_STAGE)
+    if fingerprint and checkpoint:
+        checkpoint_fingerprint, _, size_in_bytes = checkpoint.partition(':')
+        if checkpoint_fingerprint == fingerprint and size_in_bytes.isdigit():
+            logger.log_value('Skip stage', FILE_SYSTEM_SIZE_STAGE)
+            return int(size_in_bytes)
+
+    if root_disk_usage and root_disk_usage[0] == model.project.custom_root_directory:
+        size_in_bytes = root_disk_usage[1]
+    else:
+        # The customized file system is owned by root, so it can not be
+        # read in this process.
+        size_in_bytes = _get_privileged_directory_size(model.project.custom_root_directory)
+    _set_checkpoint(FILE_SYSTEM_SIZE_STAGE, fingerprint, str(size_in_bytes))
+
+    return size_in_bytes
+
+
+def _get_directory_size(directory_path):
+    """
+    Get the disk usage of a directory. The size is calculated in this
+    process when possible, and using the file-size command otherwise
+    (for example, when some directories are only readable by root).
+
+    Arguments:
+    directory_path : str
+        The full path of the directory.
+
+    Returns:
+    : int
+        The size in bytes.
+
+    Raises:
+    : Exception
+        If the size could not be determined.
+    """
+
+    size_in_bytes = file_utilities.get_disk_usage(directory_path)
+    if size_in_bytes is None:
+        size_in_bytes = _get_privileged_directory_size(directory_path)
+
+    return size_in_bytes
+
+
+def _get_privileged_directory_size(directory_path):
+    """
+    Get the disk usage of a directory using the file-size command.
+
+    Arguments:
+    directory_path : str
+        The full path of the directory.
+
+    Returns:
+    : int
+        The size in bytes.
+
+    Raises:
+    : Exception
+        If the size could not be determined.
+    """
+
+    # Pkexec is required.
+    program = os.path.join(model.application.directory, 'commands', 'file-size')
+    command = ['pkexec', program, directory_path]
+    result, exit_status, signal_status = execute_synchronous(command)
+    size_information = re.search(r'^([0-9]+)\s', result)
+    size_in_bytes = int(size_information.group(1))
+
+    return size_in_bytes
+
+
+def _get_squashfs_validator():
+    """
+    Identify the compressed Linux file system that was created from the
+    customized file system.
+
+    Returns:
+    : tuple
+        The path, modification time, and size of the compressed Linux
+        file system, or None if it does not exist.
+    """
+
+    if model.layout.minimal_squashfs_file_name:
+        file_name = model.layout.minimal_squashfs_file_name
+    else:
+        file_name = model.layout.squashfs_file_name
+    file_path = os.path.join(model.project.custom_disk_directory, model.layout.squashfs_directory, file_name)
+    try:
+        status = os.stat(file_path)
+    except OSError:
+        return None
+
+    return file_path, status.st_mtime_ns, status.st_size
+
+
 # ----------------------------------------------------------------------
 # Update Disk and Installer Information Functions
 # ----------------------------------------------------------------------
@@ -1058,7 +1516,7 @@ def _update_installer_sources_file():
         logger.log_value('File path', file_path)
 
         yaml_list = file_utilities.read_yaml_file(file_path)
-        logger.log_value('Current configuration', yaml_list)
+        logger.log_value('Current configuration paths', [yaml_dict.get('path') for yaml_dict in yaml_list])
 
         # Make the minimal squashfs file default. Do not use the
         # standard squashfs file because it does not work for the
@@ -1168,47 +1626,7 @@ def update_checksums():
     # Identify file paths to exclude from the checksums.
     #
 
-    exclude_paths = []
-
-    # Exclude the checksums file.
-    exclude_paths.append(checksums_file_path)
-
-    # Exclude the eltorito boot image and the boot catalog.
-
-    template = constructor.decode(model.status.iso_template)
-
-    # Exclude the eltorito boot image file path (if it exists).
-    result = re.search(r"-b '(.*?)'", template)
-    if result:
-        file_path = result.group(1).strip(os.path.sep)
-        file_path = os.path.join(model.project.custom_disk_directory, file_path)
-        exclude_paths.append(file_path)
-
-    # Exclude the boot catalog file path (if it exists).
-    result = re.search(r"-c '(.*?)'", template)
-    if result:
-        file_path = result.group(1).strip(os.path.sep)
-        file_path = os.path.join(model.project.custom_disk_directory, file_path)
-        exclude_paths.append(file_path)
-
-    # Exclude the minimal remove file if the minimal install option was
-    # not selected.
-    # Exclude file paths must be full file paths.
-    if model.layout.minimal_remove_file_name and not model.options.has_minimal_install:
-        # Exclude the filesystem.manifest-minimal-remove.
-        file_path = os.path.join(                \
-            model.project.custom_disk_directory, \
-            model.layout.squashfs_directory,     \
-            model.layout.minimal_remove_file_name)
-        exclude_paths.append(file_path)
-
-    # Exclude the installer sources backup file if present.
-    if model.layout.installer_sources_file_name:
-        file_path = os.path.join(                                 \
-            model.project.custom_disk_directory,                  \
-            model.layout.squashfs_directory,                      \
-            f'{model.layout.installer_sources_file_name}.original')
-        exclude_paths.append(file_path)
+    exclude_paths = _get_checksum_exclude_paths(checksums_file_path)
 
     logger.log_value('Exclude files from the checksum', exclude_paths)
 
@@ -1305,6 +1723,65 @@ def update_checksums():
     return False  # (No error)
 
 
+def _get_checksum_exclude_paths(checksums_file_path):
+    """
+    Identify the files in the custom disk directory that are not
+    included in the checksums file.
+
+    Arguments:
+    checksums_file_path : str
+        The full path of the checksums file.
+
+    Returns:
+    : list (str)
+        The full paths of the files to exclude.
+    """
+
+    exclude_paths = []
+
+    # Exclude the checksums file.
+    exclude_paths.append(checksums_file_path)
+
+    # Exclude the eltorito boot image and the boot catalog.
+
+    template = constructor.decode(model.status.iso_template)
+
+    # Exclude the eltorito boot image file path (if it exists).
+    result = re.search(r"-b '(.*?)'", template)
+    if result:
+        file_path = result.group(1).strip(os.path.sep)
+        file_path = os.path.join(model.project.custom_disk_directory, file_path)
+        exclude_paths.append(file_path)
+
+    # Exclude the boot catalog file path (if it exists).
+    result = re.search(r"-c '(.*?)'", template)
+    if result:
+        file_path = result.group(1).strip(os.path.sep)
+        file_path = os.path.join(model.project.custom_disk_directory, file_path)
+        exclude_paths.append(file_path)
+
+    # Exclude the minimal remove file if the minimal install option was
+    # not selected.
+    # Exclude file paths must be full file paths.
+    if model.layout.minimal_remove_file_name and not model.options.has_minimal_install:
+        # Exclude the filesystem.manifest-minimal-remove.
+        file_path = os.path.join(                \
+            model.project.custom_disk_directory, \
+            model.layout.squashfs_directory,     \
+            model.layout.minimal_remove_file_name)
+        exclude_paths.append(file_path)
+
+    # Exclude the installer sources backup file if present.
+    if model.layout.installer_sources_file_name:
+        file_path = os.path.join(                                 \
+            model.project.custom_disk_directory,                  \
+            model.layout.squashfs_directory,                      \
+            f'{model.layout.installer_sources_file_name}.original')
+        exclude_paths.append(file_path)
+
+    return exclude_paths
+
+
 # ----------------------------------------------------------------------
 # Check Disk Size Functions
 # ----------------------------------------------------------------------
@@ -1315,12 +1792,7 @@ def check_custom_disk_directory_size():
     logger.log_label('Get the custom disk size')
 
     try:
-        # Pkexec is not required.
-        program = os.path.join(model.application.directory, 'commands', 'file-size')
-        command = ['pkexec', program, model.project.custom_disk_directory]
-        result, exit_status, signal_status = execute_synchronous(command)
-        size_information = re.search(r'^([0-9]+)\s', result)
-        size_in_bytes = int(size_information.group(1))
+        size_in_bytes = _get_directory_size(model.project.custom_disk_directory)
         size_in_mib = size_in_bytes / MIB
         size_in_gib = size_in_bytes / GIB
     except InterruptException as exception:
@@ -1420,6 +1892,11 @@ def create_iso_image():
         logger.log_value('Do not propagate exception', exception)
         return True  # (Error)
 
+    return update_iso_image_size()
+
+
+def update_iso_image_size():
+
     #
     # Get the size.
     #
@@ -1467,6 +1944,52 @@ def create_iso_image():
     return False  # (No error)
 
 
+def _get_iso_image_fingerprint():
+    """
+    Identify the inputs of create_iso_image(): the xorriso command, the
+    partition images, and the contents of the custom disk directory.
+    The checksums file lists the checksum of every file in the custom
+    disk directory, and is updated immediately before the disk image is
+    created, so the contents are identified by the checksums file and
+    the files that are excluded from it.
+
+    Returns:
+    : str
+        The fingerprint, or None if the checksums file could not be read.
+    """
+
+    checksums_file_path = os.path.join(model.project.custom_disk_directory, 'md5sum.txt')
+    values = [_get_xorriso_command(), _get_file_checksum(checksums_file_path)]
+    if not values[1]:
+        return None
+    for file_path in _get_checksum_exclude_paths(checksums_file_path)[1:]:
+        values.append((file_path, _get_file_checksum(file_path)))
+
+    # Include the partition images extracted from the original disk
+    # image, which are appended to the disk image.
+    for file_path in sorted(glob.glob(os.path.join(model.project.directory, IMAGE_FILE_NAME % '[1-9]'))):
+        values.append((file_path, _get_file_status(file_path)))
+
+    return _create_fingerprint(values)
+
+
+def _get_iso_image_validator():
+    """
+    Identify the output of create_iso_image(): the disk image.
+
+    Returns:
+    : str
+        The fingerprint, or None if the disk image does not exist.
+    """
+
+    iso_file_path = os.path.join(model.custom.iso_directory, model.custom.iso_file_name)
+    file_status = _get_file_status(iso_file_path)
+    if not file_status:
+        return None
+
+    return _create_fingerprint([iso_file_path, file_status])
+
+
 # ----------------------------------------------------------------------
 # Get Xorriso Command Functions
 # ----------------------------------------------------------------------
@@ -1632,3 +2155,105 @@ def calculate_checksum_for_iso():
     displayer.update_label('generate_page__calculate_iso_image_checksum_message', message, False)
     displayer.update_status('generate_page__calculate_iso_image_checksum', OK)
     return False  # (No error)
+
+
+# ----------------------------------------------------------------------
+# Checkpoint Functions
+# ----------------------------------------------------------------------
+
+
+def _is_stage_complete(stage, fingerprint, value):
+    """
+    Check if a stage completed with the same inputs, and its outputs
+    have not changed since.
+
+    Arguments:
+    stage : str
+        The stage, such as KERNEL_FILES_STAGE.
+    fingerprint : str
+        The fingerprint of the current inputs of the stage.
+    value : str
+        The fingerprint of the current outputs of the stage.
+
+    Returns:
+    : bool
+        True if the stage can be skipped, False otherwise.
+    """
+
+    if not fingerprint or not value:
+        return False
+
+    return _get_checkpoint(stage) == f'{fingerprint}:{value}'
+
+
+def _get_checkpoint(stage):
+    """
+    Get the saved checkpoint of a stage.
+
+    Arguments:
+    stage : str
+        The stage, such as KERNEL_FILES_STAGE.
+
+    Returns:
+    : str
+        The checkpoint, in the format "fingerprint:value", or None if
+        the stage has not completed.
+    """
+
+    for checkpoint in model.status.generate_checkpoints or []:
+        checkpoint_stage, _, checkpoint = checkpoint.partition(':')
+        if checkpoint_stage == stage:
+            return checkpoint
+
+    return None
+
+
+def _set_checkpoint(stage, fingerprint=None, value=None):
+    """
+    Save the checkpoint of a stage in the project configuration, so
+    the stage can be skipped the next time the disk image is generated,
+    even if Cubic is closed first. If the fingerprint or value is not
+    supplied, the checkpoint is removed.
+
+    Arguments:
+    stage : str
+        The stage, such as KERNEL_FILES_STAGE.
+    fingerprint : str
+        Optional fingerprint of the inputs of the stage.
+    value : str
+        Optional fingerprint of the outputs of the stage, or the result
+        of the stage.
+    """
+
+    checkpoints = [checkpoint for checkpoint in model.status.generate_checkpoints or [] if checkpoint.partition(':')[0] != stage]
+    if fingerprint and value:
+        checkpoints.append(f'{stage}:{fingerprint}:{value}')
+        logger.log_value('Save checkpoint', checkpoints[-1])
+    model.status.generate_checkpoints = checkpoints
+
+    # Save the model values.
+    model.project.configuration.save()
+
+
+def _create_fingerprint(values):
+
+    return hashlib.md5(repr(values).encode()).hexdigest()
+
+
+def _get_file_checksum(file_path):
+
+    try:
+        with open(file_path, 'rb') as file:
+            return hashlib.md5(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _get_file_status(file_path):
+
+    try:
+        status = os.stat(file_path)
+    except OSError:
+        return None
+
+    return status.st_size, status.st_mtime_ns
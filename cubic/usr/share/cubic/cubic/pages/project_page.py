@@ -468,12 +468,16 @@ def leave(action, new_page=None):
         model.status.iso_template = status.iso_template
         model.status.iso_checksum = status.iso_checksum
         model.status.iso_checksum_file_name = status.iso_checksum_file_name
+        model.status.compression_ratios = status.compression_ratios
+        model.status.generate_checkpoints = status.generate_checkpoints
 
         # Options
         model.options.update_os_release = custom.update_os_release.value
         model.options.has_minimal_install = options.has_minimal_install
         model.options.boot_configurations = options.boot_configurations
         model.options.compression = options.compression
+        model.options.fast_boot_test = options.fast_boot_test
+        model.options.slimming_categories = options.slimming_categories
 
         # Save the model values.
         model.project.configuration.save()
@@ -527,12 +531,16 @@ def leave(action, new_page=None):
         model.status.iso_template = status.iso_template
         model.status.iso_checksum = status.iso_checksum
         model.status.iso_checksum_file_name = status.iso_checksum_file_name
+        model.status.compression_ratios = status.compression_ratios
+        model.status.generate_checkpoints = status.generate_checkpoints
 
         # Options
         model.options.update_os_release = custom.update_os_release.value
         model.options.has_minimal_install = options.has_minimal_install
         model.options.boot_configurations = options.boot_configurations
         model.options.compression = options.compression
+        model.options.fast_boot_test = options.fast_boot_test
+        model.options.slimming_categories = options.slimming_categories
 
         # Save the model values.
         model.project.configuration.save()
@@ -799,6 +807,8 @@ def initialize_status():
     fields.iso_template = None
     fields.iso_checksum = None
     fields.iso_checksum_file_name = None
+    fields.compression_ratios = []
+    fields.generate_checkpoints = []
 
     return fields
 
@@ -817,6 +827,8 @@ def initialize_options():
     fields.has_minimal_install = None
     fields.boot_configurations = []
     fields.compression = GZIP
+    fields.fast_boot_test = False
+    fields.slimming_categories = []
 
     return fields
 
@@ -1077,6 +1089,8 @@ def initialize_status_from_model():
       - iso_template
       - iso_checksum = None
       - iso_checksum_file_name = None
+      - compression_ratios
+      - generate_checkpoints
     """
 
     logger.log_label('Initialize the status fields from the model')
@@ -1092,6 +1106,8 @@ def initialize_status_from_model():
     fields.iso_checksum = model.status.iso_checksum
     # The ISO checksum file_name is always constructed.
     fields.iso_checksum_file_name = model.status.iso_checksum_file_name
+    fields.compression_ratios = model.status.compression_ratios
+    fields.generate_checkpoints = model.status.generate_checkpoints
 
     return fields
 
@@ -1103,6 +1119,8 @@ def initialize_options_from_model():
       - has_minimal_install
       - boot_configurations
       - compression
+      - fast_boot_test
+      - slimming_categories
     """
 
     logger.log_label('Initialize the options fields from the model')
@@ -1117,6 +1135,8 @@ def initialize_options_from_model():
     fields.has_minimal_install = model.options.has_minimal_install
     fields.boot_configurations = model.options.boot_configurations
     fields.compression = model.options.compression
+    fields.fast_boot_test = model.options.fast_boot_test
+    fields.slimming_categories = model.options.slimming_categories
 
     return fields
 
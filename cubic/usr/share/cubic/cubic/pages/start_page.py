@@ -51,6 +51,7 @@ from cubic.utilities import displayer
 from cubic.utilities import file_utilities
 from cubic.utilities import logger
 from cubic.utilities import model
+from cubic.utilities import profiler
 
 ########################################################################
 # Global Variables & Constants
@@ -108,6 +109,11 @@ def setup(action, old_page=None):
         #   - The previous ISO directory
         model.application.configuration.load()
 
+        # Resume reclaiming the disk space used by files deleted in a
+        # previous session, including files in projects that were
+        # deleted before the disk space was reclaimed.
+        file_utilities.reclaim_trash(model.application.projects)
+
         # Initialize the list of previous projects.
         displayer.remove_all_combo_box_text('start_page__project_directory_combo_box_text')
         for directory in model.application.projects:
@@ -266,6 +272,10 @@ def leave(action, new_page=None):
         # Truncate the list to five items.
         model.application.projects = list(dict.fromkeys([model.project.directory] + model.application.projects))[0:5]
 
+        # Resume reclaiming the disk space used by files deleted in a
+        # previous session, if any.
+        file_utilities.reclaim_trash(model.project.directory)
+
         return
 
     elif action == 'alert':
@@ -295,6 +305,10 @@ def leave(action, new_page=None):
         # the list to five items.
         model.application.projects = list(dict.fromkeys([model.project.directory] + model.application.projects))[0:5]
 
+        # Resume reclaiming the disk space used by files deleted in a
+        # previous session, if any.
+        file_utilities.reclaim_trash(model.project.directory)
+
         return
 
     elif action == 'quit':
@@ -485,6 +499,10 @@ def validate_page():
         logger.verbose = verbose
         logger.log_value('The log file is', logger.log_file)
 
+    # Log the profile directory.
+    if profiler.is_enabled:
+        logger.log_value('The profile directory is', profiler.get_profile_directory())
+
     # Log the application information again because the log file does
     # not exist until a valid project directory is selected.
     logger.log_value('The application directory is', model.application.directory)
@@ -495,6 +513,8 @@ def validate_page():
     logger.log_value('The application visited sites are', model.application.visited_sites)
     logger.log_value('The application projects are', model.application.projects)
     logger.log_value('The application iso file path is', model.application.iso_file_path)
+    logger.log_value('The application apt cache directory is', model.application.apt_cache_directory)
+    logger.log_value('The application apt mirror directory is', model.application.apt_mirror_directory)
 
     # There is no need to log the following values because they are set
     # as indicated.
@@ -698,8 +718,12 @@ def initialize_model():
     model.status.iso_template = None
     model.status.iso_checksum = None
     model.status.iso_checksum_file_name = None
+    model.status.compression_ratios = None
+    model.status.generate_checkpoints = None
 
     model.options.update_os_release = None
     model.options.has_minimal_install = None
     model.options.boot_configurations = None
     model.options.compression = None
+    model.options.fast_boot_test = None
+    model.options.slimming_categories = None
@@ -38,6 +38,8 @@
 ########################################################################
 
 import os
+import re
+import tempfile
 import time
 import urllib
 
@@ -49,6 +51,7 @@ from cubic.navigator import InterruptException
 from cubic.utilities import console
 from cubic.utilities import constructor
 from cubic.utilities import displayer
+from cubic.utilities import file_utilities
 from cubic.utilities import iso_utilities
 from cubic.utilities import logger
 from cubic.utilities import model
@@ -60,6 +63,10 @@ from cubic.utilities.progressor import track_progress
 
 name = 'terminal_copy_page'
 
+# Pattern to match the name of each item copied by the copy-paths
+# command, relative to the target directory.
+COPIED_ITEM_PATTERN = re.compile(r'#cubic-copy# ([^\r\n]*)\r?\n')
+
 total_files = 0
 file_number = 0
 
@@ -295,18 +302,16 @@ def copy_files(current_directory, uris):
 
     displayer.update_status('terminal_copy_page__progress', PROCESSING)
 
-    global file_number
+    file_paths = [urllib.parse.unquote(urllib.parse.urlparse(uri).path) for uri in uris]
     try:
-        for file_number, uri in enumerate(uris):
-            file_path = urllib.parse.unquote(urllib.parse.urlparse(uri).path)
-            if total_files == 1:
-                message = f'Copying one file to {current_directory}...'
-            else:
-                message = f'Copying file {(file_number+1):n} of {total_files:n} to {current_directory}...'
-            displayer.update_label('terminal_copy_page__progress_message', message, False)
-            displayer.scroll_to_tree_view_row('terminal_copy_page__tree_view', file_number)
-            displayer.select_tree_view_row('terminal_copy_page__tree_view', file_number)
-            copy_file(file_path, file_number, target_directory, total_files)
+        if total_files == 1:
+            message = f'Copying one file to {current_directory}...'
+        else:
+            message = f'Copying {total_files:n} files to {current_directory}...'
+        displayer.update_label('terminal_copy_page__progress_message', message, False)
+        displayer.scroll_to_tree_view_row('terminal_copy_page__tree_view', 0)
+        displayer.select_tree_view_row('terminal_copy_page__tree_view', 0)
+        copy_file_batch(file_paths, target_directory)
     except InterruptException as exception:
         displayer.update_status('terminal_copy_page__progress', ERROR)
         if 'No space left on device' in str(exception):
@@ -338,24 +343,96 @@ def copy_files(current_directory, uris):
     return False  # (No error)
 
 
-def copy_file(file_path, file_number, directory, total_files):
+def copy_file_batch(file_paths, directory):
+    """
+    Copy files and directories to the target directory using a single
+    privileged rsync process. The overall progress is tracked using the
+    percent reported by rsync, and the progress of each file is updated
+    as rsync reports the items it has copied.
+
+    Arguments:
+    file_paths : list (str)
+        The full paths of the files and directories to copy.
+    directory : str
+        The full path of the target directory.
+    """
 
-    logger.log_label(f'Copy file number {file_number+1} of {total_files}')
+    logger.log_label(f'Copy {len(file_paths)} file(s) in one batch')
 
-    logger.log_value('The file is', file_path)
+    logger.log_value('The files are', file_paths)
     logger.log_value('The target directory is', directory)
 
-    program = os.path.join(model.application.directory, 'commands', 'copy-path')
-    command = ['pkexec', program, file_path, directory, 'root']
+    # Items are copied using their base names, so the first component of
+    # each copied item identifies the rows in the file details list.
+    # Files with the same base name in different directories share the
+    # same rows; the first row that has not been fully copied is updated.
+    row_numbers = {}
+    item_counts = []
+    for row_number, file_path in enumerate(file_paths):
+        row_numbers.setdefault(os.path.basename(file_path.rstrip(os.path.sep)), []).append(row_number)
+        item_counts.append(_count_items(file_path))
+    copied_counts = [0] * len(file_paths)
+
+    global file_number
+    file_number = 0
+
+    # The list of files to copy, separated by null characters.
+    list_file_descriptor, list_file_path = tempfile.mkstemp(prefix='cubic-copy-', suffix='.list')
+    with os.fdopen(list_file_descriptor, 'wb') as list_file:
+        list_file.write(b''.join(os.fsencode(file_path) + b'\0' for file_path in file_paths))
+
+    program = os.path.join(model.application.directory, 'commands', 'copy-paths')
+    command = ['pkexec', program, list_file_path, directory, 'root']
 
     # The progress callback function.
     def progress_callback(percent):
-        global total_files
+        displayer.update_progress_bar_percent('terminal_copy_page__copy_files_progress_bar', percent)
+        if percent % 10 == 0:
+            logger.log_value('Completed', f'{percent:n}%')
+
+    # The output callback function, invoked for each copied item.
+    def output_callback(match):
         global file_number
-        total_percent = (FINAL_PERCENT * file_number + percent) / total_files
-        displayer.update_progress_bar_percent('terminal_copy_page__copy_files_progress_bar', total_percent)
-        displayer.update_list_store_progress_bar_percent('terminal_copy_page__file_details__list_store', file_number, percent)
-        if total_percent % 10 == 0:
-            logger.log_value('Completed', f'{total_percent:n}%')
+        rows = row_numbers.get(match.group(1).split(os.path.sep)[0])
+        if not rows: return
+        row_number = next((row for row in rows if copied_counts[row] < item_counts[row]), rows[-1])
+        if row_number != file_number:
+            file_number = row_number
+            displayer.scroll_to_tree_view_row('terminal_copy_page__tree_view', file_number)
+            displayer.select_tree_view_row('terminal_copy_page__tree_view', file_number)
+        copied_counts[row_number] += 1
+        percent = min(FINAL_PERCENT, FINAL_PERCENT * copied_counts[row_number] / item_counts[row_number])
+        displayer.update_list_store_progress_bar_percent('terminal_copy_page__file_details__list_store', row_number, percent)
+
+    try:
+        track_progress(command, progress_callback, output_pattern=COPIED_ITEM_PATTERN, output_callback=output_callback)
+    finally:
+        os.remove(list_file_path)
+
+    # Items that are already up to date are not reported by rsync.
+    for row_number in range(len(file_paths)):
+        displayer.update_list_store_progress_bar_percent('terminal_copy_page__file_details__list_store', row_number, FINAL_PERCENT)
+
+
+def _count_items(file_path):
+    """
+    Count the files and directories that will be copied for a path,
+    including the path itself.
+
+    Arguments:
+    file_path : str
+        The full path of the file or directory.
+
+    Returns:
+    : int
+        The number of items.
+    """
+
+    if os.path.islink(file_path) or not os.path.isdir(file_path):
+        return 1
+
+    count = 1
+    for _, directory_entries, file_entries in file_utilities.walk_tree(file_path):
+        count += len(directory_entries) + len(file_entries)
 
-    track_progress(command, progress_callback, quantity=total_files)
+    return count
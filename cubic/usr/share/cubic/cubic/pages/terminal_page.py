@@ -66,7 +66,6 @@ from cubic.utilities import file_utilities
 from cubic.utilities import iso_utilities
 from cubic.utilities import logger
 from cubic.utilities import model
-from cubic.utilities.processor import execute_synchronous
 
 ########################################################################
 # Global Variables & Constants
@@ -739,26 +738,27 @@ def update_release_descriptions():
 
     description = f'{model.custom.iso_volume_id} (Cubic {model.project.modify_date})'
 
+    # Collect the edits, so they are applied using a single privileged
+    # command. Files that are already up to date are not rewritten.
+    edits = []
+
     file_path = os.path.join(model.project.custom_root_directory, 'etc', 'lsb-release')
     if os.path.isfile(file_path) and not os.path.islink(file_path):
         search_text = 'DISTRIB_DESCRIPTION.*'
         replacement_text = f'DISTRIB_DESCRIPTION="{description}"'
-        program = os.path.join(model.application.directory, 'commands', 'replace-text')
-        command = ['pkexec', program, search_text, replacement_text, file_path]
-        result, exit_status, signal_status = execute_synchronous(command)
+        edits.append((file_path, search_text, replacement_text))
 
     file_path = os.path.join(model.project.custom_root_directory, 'etc', 'os-release')
     if os.path.isfile(file_path) and not os.path.islink(file_path):
         search_text = 'PRETTY_NAME.*'
         replacement_text = f'PRETTY_NAME="{description}"'
-        program = os.path.join(model.application.directory, 'commands', 'replace-text')
-        command = ['pkexec', program, search_text, replacement_text, file_path]
-        result, exit_status, signal_status = execute_synchronous(command)
+        edits.append((file_path, search_text, replacement_text))
 
     file_path = os.path.join(model.project.custom_root_directory, 'usr', 'lib', 'os-release')
     if os.path.isfile(file_path) and not os.path.islink(file_path):
         search_text = 'PRETTY_NAME.*'
         replacement_text = f'PRETTY_NAME="{description}"'
-        program = os.path.join(model.application.directory, 'commands', 'replace-text')
-        command = ['pkexec', program, search_text, replacement_text, file_path]
-        result, exit_status, signal_status = execute_synchronous(command)
+        edits.append((file_path, search_text, replacement_text))
+
+    if edits:
+        result, exit_status, signal_status = file_utilities.replace_text_as_root(edits)
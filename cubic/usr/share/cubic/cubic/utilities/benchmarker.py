@@ -0,0 +1,296 @@
+#!/usr/bin/python3
+
+########################################################################
+#                                                                      #
+# benchmarker.py                                                       #
+#                                                                      #
+# Copyright (C) 2020 PJ Singh <psingh.cubic@gmail.com>                 #
+#                                                                      #
+########################################################################
+
+########################################################################
+#                                                                      #
+# This file is part of Cubic - Custom Ubuntu ISO Creator.              #
+#                                                                      #
+# Cubic is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by #
+# the Free Software Foundation, either version 3 of the License, or    #
+# (at your option) any later version.                                  #
+#                                                                      #
+# Cubic is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of       #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the         #
+# GNU General Public License for more details.                         #
+#                                                                      #
+# You should have received a copy of the GNU General Public License    #
+# along with Cubic. If not, see <http://www.gnu.org/licenses/>.        #
+#                                                                      #
+########################################################################
+
+
+########################################################################
+# References
+########################################################################
+
+# https://manpages.ubuntu.com/manpages/noble/man1/mksquashfs.1.html
+# https://en.wikipedia.org/wiki/Stratified_sampling
+
+########################################################################
+# Imports
+########################################################################
+
+import collections
+import os
+import random
+import shutil
+import stat
+import time
+
+from cubic.constants import KIB, MIB
+from cubic.constants import LZ4, LZO, GZIP, ZSTD, XZ
+from cubic.utilities import file_utilities
+from cubic.utilities import logger
+from cubic.utilities import slimmer
+from cubic.utilities.processor import execute_synchronous
+
+########################################################################
+# Global Variables & Constants
+########################################################################
+
+# The compression algorithms and levels to benchmark, as tuples of the
+# compression, the displayed name, and the additional mksquashfs
+# compressor options. The customized disk is always generated using the
+# default level for the selected compression.
+BENCHMARK_VARIANTS = (
+    (LZ4, 'lz4', []),
+    (LZ4, 'lz4 (high compression)', ['-Xhc']),
+    (LZO, 'lzo', []),
+    (GZIP, 'gzip (level 6)', ['-Xcompression-level', '6']),
+    (GZIP, 'gzip', []),
+    (ZSTD, 'zstd (level 3)', ['-Xcompression-level', '3']),
+    (ZSTD, 'zstd', []),
+    (ZSTD, 'zstd (level 19)', ['-Xcompression-level', '19']),
+    (XZ, 'xz', []),
+)
+
+# The approximate amount of data to compress for each variant.
+SAMPLE_SIZE = 64 * MIB
+
+# The upper bounds of the file size strata. Small files compress
+# differently from large files, because mksquashfs compresses data in
+# 128 KiB blocks and packs small files into fragments.
+SIZE_STRATA = (4 * KIB, 128 * KIB, 1 * MIB)
+
+# File name extensions of data that is already compressed.
+COMPRESSED_EXTENSIONS = {
+    '.7z', '.br', '.bz2', '.deb', '.gif', '.gz', '.jar', '.jpeg', '.jpg', '.lz4', '.lzma', '.mo', '.mp3', '.ogg', '.png', '.snap', '.squashfs', '.webp', '.xz', '.zip', '.zst'
+}
+
+# The result of benchmarking one variant.
+# • compression - The compression, such as gzip.
+# • name - The displayed name of the variant.
+# • sample_size - The number of bytes compressed.
+# • compressed_size - The size of the compressed sample.
+# • seconds - The time taken to compress the sample.
+# • estimated_size - The extrapolated compressed size of the customized
+#   file system.
+# • estimated_seconds - The extrapolated time to compress the customized
+#   file system.
+BenchmarkResult = collections.namedtuple('BenchmarkResult', 'compression name sample_size compressed_size seconds estimated_size estimated_seconds')
+
+########################################################################
+# Benchmark Functions
+########################################################################
+
+
+def run_benchmark(root_directory, work_directory, exclude_keys=None, result_callback=None):
+    """
+    Estimate the compressed size of the customized file system, and the
+    time to compress it, for each variant in BENCHMARK_VARIANTS. A
+    stratified sample of the files, by size and type, is compressed
+    using mksquashfs with all processors, and the results are
+    extrapolated to the whole file system.
+
+    Arguments:
+    root_directory : str
+        The customized root directory.
+    work_directory : str
+        The directory in which to create the temporary sample directory.
+    exclude_keys : list (str)
+        Optional slimming categories to exclude from the file system.
+    result_callback : function
+        Optional function called with each BenchmarkResult as soon as it
+        is available.
+
+    Returns:
+    : list (BenchmarkResult)
+        The results, in the order of BENCHMARK_VARIANTS.
+    """
+
+    logger.log_label('Benchmark compression')
+
+    sample, total_size = draw_sample(root_directory, SAMPLE_SIZE, exclude_keys)
+
+    sample_directory = os.path.join(work_directory, 'cubic-benchmark')
+    sample_file_path = os.path.join(work_directory, 'cubic-benchmark.squashfs')
+    results = []
+    try:
+        sample_size = create_sample_directory(root_directory, sample, sample_directory)
+        logger.log_value('The sample size is', f'{sample_size:n} of {total_size:n} bytes')
+        if not sample_size:
+            return results
+        scale = total_size / sample_size
+
+        for compression, name, options in BENCHMARK_VARIANTS:
+            command = ['mksquashfs', sample_directory, sample_file_path, '-noappend', '-no-progress', '-comp', compression]
+            command += options
+            command += ['-processors', str(os.cpu_count() or 1)]
+            start_time = time.perf_counter()
+            result, exit_status, signal_status = execute_synchronous(command)
+            seconds = time.perf_counter() - start_time
+            if exit_status or signal_status or not os.path.isfile(sample_file_path):
+                logger.log_value(f'Unable to benchmark {name}', result)
+                continue
+            compressed_size = os.path.getsize(sample_file_path)
+            os.remove(sample_file_path)
+            benchmark_result = BenchmarkResult(compression, name, sample_size, compressed_size, seconds, round(compressed_size * scale), seconds * scale)
+            logger.log_value(f'Benchmark {name}', f'{compressed_size:n} bytes in {seconds:.2f} seconds')
+            results.append(benchmark_result)
+            if result_callback:
+                result_callback(benchmark_result)
+    finally:
+        shutil.rmtree(sample_directory, ignore_errors=True)
+        if os.path.exists(sample_file_path):
+            os.remove(sample_file_path)
+
+    return results
+
+
+def draw_sample(root_directory, sample_size, exclude_keys=None):
+    """
+    Draw a stratified random sample of the files in the directory. Files
+    are grouped into strata by size and by type (already compressed,
+    executable, or other), and each stratum contributes to the sample in
+    proportion to its share of the total size. The last file sampled
+    from each stratum is truncated to the remaining quota, so a single
+    large file does not dominate the sample, and the compressed sample
+    can be extrapolated using a single scale factor. The sample is
+    repeatable for the same directory contents.
+
+    Arguments:
+    root_directory : str
+        The customized root directory.
+    sample_size : int
+        The approximate number of bytes to sample.
+    exclude_keys : list (str)
+        Optional slimming categories to exclude from the file system.
+
+    Returns:
+    : tuple (list (tuple (str, int)), int)
+        The relative path and number of bytes to sample of each sampled
+        file, and the total size of all files.
+    """
+
+    matcher = slimmer.get_matcher(exclude_keys, root_directory)
+
+    strata = collections.defaultdict(list)
+    prefix_length = len(root_directory.rstrip(os.path.sep)) + 1
+    for directory_path, directory_entries, file_entries in file_utilities.walk_tree(root_directory, is_stat=True):
+        relative_directory_path = directory_path[prefix_length:]
+        for entry in file_entries:
+            try:
+                status = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if not stat.S_ISREG(status.st_mode) or not status.st_size:
+                continue
+            relative_path = f'{relative_directory_path}/{entry.name}' if relative_directory_path else entry.name
+            if matcher and matcher.match(relative_path):
+                continue
+            strata[_get_stratum(entry.name, status)].append((relative_path, status.st_size))
+
+    total_size = sum(size for files in strata.values() for _, size in files)
+    fraction = min(sample_size / total_size, 1.0) if total_size else 0
+
+    sample = []
+    randomizer = random.Random(0)
+    for key in sorted(strata):
+        files = sorted(strata[key])
+        randomizer.shuffle(files)
+        quota = round(fraction * sum(size for _, size in files))
+        sampled_size = 0
+        for relative_path, size in files:
+            if sampled_size >= quota:
+                break
+            size = min(size, quota - sampled_size)
+            sample.append((relative_path, size))
+            sampled_size += size
+
+    logger.log_value('The number of strata is', len(strata))
+    logger.log_value('The number of sampled files is', len(sample))
+
+    return sample, total_size
+
+
+def create_sample_directory(root_directory, sample, sample_directory):
+    """
+    Copy the sampled bytes of each sampled file into the sample
+    directory. Files that can not be read are skipped.
+
+    Arguments:
+    root_directory : str
+        The customized root directory.
+    sample : list (tuple (str, int))
+        The relative path and number of bytes to sample of each sampled
+        file.
+    sample_directory : str
+        The directory to copy the files to.
+
+    Returns:
+    : int
+        The number of bytes copied.
+    """
+
+    shutil.rmtree(sample_directory, ignore_errors=True)
+    copied_size = 0
+    for relative_path, size in sample:
+        target_file_path = os.path.join(sample_directory, relative_path)
+        try:
+            os.makedirs(os.path.dirname(target_file_path), exist_ok=True)
+            with open(os.path.join(root_directory, relative_path), 'rb') as source_file, open(target_file_path, 'wb') as target_file:
+                copied_size += _copy_bytes(source_file, target_file, size)
+        except OSError:
+            pass
+
+    return copied_size
+
+
+########################################################################
+# Support Functions
+########################################################################
+
+
+def _copy_bytes(source_file, target_file, size):
+
+    copied_size = 0
+    while copied_size < size:
+        data = source_file.read(min(MIB, size - copied_size))
+        if not data:
+            break
+        target_file.write(data)
+        copied_size += len(data)
+
+    return copied_size
+
+
+def _get_stratum(file_name, status):
+
+    size_stratum = sum(1 for bound in SIZE_STRATA if status.st_size > bound)
+    if os.path.splitext(file_name)[1].lower() in COMPRESSED_EXTENSIONS:
+        type_stratum = 'compressed'
+    elif status.st_mode & stat.S_IXUSR or '.so' in file_name:
+        type_stratum = 'executable'
+    else:
+        type_stratum = 'other'
+
+    return size_stratum, type_stratum
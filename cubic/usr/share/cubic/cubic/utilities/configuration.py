@@ -65,6 +65,12 @@ Cubic versions:
   Thru: Release 2024.__-__ on __/__/20__
   • Added the Layout section to the the Project configuration
   • Removed the "Installer" section from the Project configuration
+  • Added the "fast_boot_test" option to the Project configuration
+  • Added the "apt_cache_directory" and "apt_mirror_directory" options
+    to the Application configuration
+  • Added the "slimming_categories" option to the Project configuration
+  • Added the "compression_ratios" status to the Project configuration
+  • Added the "generate_checkpoints" status to the Project configuration
 """
 
 ########################################################################
@@ -411,6 +417,9 @@ class Application(Configuration):
       Updated in start_page.leave()
     • model.application.iso_directory
       Updated in project_page.selected_original_iso_file_path()
+    • model.application.apt_cache_directory
+    • model.application.apt_mirror_directory
+      Not updated by Cubic; edited in the configuration file
     """
 
     # ------------------------------------------------------------------
@@ -492,6 +501,11 @@ class Application(Configuration):
         # ISO directory
         model.application.iso_file_path = self.get_value('Application', 'iso_file_path')
 
+        # Shared apt archive cache and local apt mirror directories used
+        # by the virtual environment. Empty values disable these.
+        model.application.apt_cache_directory = self.get_value('Application', 'apt_cache_directory', '')
+        model.application.apt_mirror_directory = self.get_value('Application', 'apt_mirror_directory', '')
+
         # Configuration
         # model.application.configuration = self
 
@@ -536,6 +550,8 @@ class Application(Configuration):
         self.set('Application', 'visited_sites', model.application.visited_sites)
         self.set('Application', 'projects', model.application.projects)
         self.set('Application', 'iso_file_path', model.application.iso_file_path)
+        self.set('Application', 'apt_cache_directory', model.application.apt_cache_directory)
+        self.set('Application', 'apt_mirror_directory', model.application.apt_mirror_directory)
 
 
 ########################################################################
@@ -694,6 +710,8 @@ class Project(Configuration):
         # model.status.casper_directory = self.get_value('Status', 'casper_directory', default=None)
         model.status.iso_checksum = self.get_value('Status', 'iso_checksum', default=None)
         model.status.iso_checksum_file_name = self.get_value('Status', 'iso_checksum_file_name', default=None)
+        model.status.compression_ratios = self.get_list('Status', 'compression_ratios', default=[])
+        model.status.generate_checkpoints = self.get_list('Status', 'generate_checkpoints', default=[])
 
         # Options
         model.options.update_os_release = self.get_boolean('Options', 'update_os_release', default=True)
@@ -701,6 +719,8 @@ class Project(Configuration):
         model.options.has_minimal_install = self.get_boolean('Installer', 'has_minimal_install', default=False)
         model.options.boot_configurations = self.get_list('Options', 'boot_configurations', default=None)
         model.options.compression = self.get_value('Options', 'compression', default=None)
+        model.options.fast_boot_test = self.get_boolean('Options', 'fast_boot_test', default=False)
+        model.options.slimming_categories = self.get_list('Options', 'slimming_categories', default=[])
 
     def _load_model_2024_layout(self):
         """
@@ -780,12 +800,16 @@ class Project(Configuration):
         model.status.iso_template = self.get_value('Status', 'iso_template', default=None)
         model.status.iso_checksum = self.get_value('Status', 'iso_checksum', default=None)
         model.status.iso_checksum_file_name = self.get_value('Status', 'iso_checksum_file_name', default=None)
+        model.status.compression_ratios = self.get_list('Status', 'compression_ratios', default=[])
+        model.status.generate_checkpoints = self.get_list('Status', 'generate_checkpoints', default=[])
 
         # Options
         model.options.update_os_release = self.get_boolean('Options', 'update_os_release', default=True)
         model.options.has_minimal_install = self.get_boolean('Options', 'has_minimal_install', default=False)
         model.options.boot_configurations = self.get_list('Options', 'boot_configurations', default=None)
         model.options.compression = self.get_value('Options', 'compression', default=None)
+        model.options.fast_boot_test = self.get_boolean('Options', 'fast_boot_test', default=False)
+        model.options.slimming_categories = self.get_list('Options', 'slimming_categories', default=[])
 
     # ------------------------------------------------------------------
     # Save Methods
@@ -884,9 +908,120 @@ class Project(Configuration):
         self.set('Status', 'iso_template', model.status.iso_template)
         self.set('Status', 'iso_checksum', model.status.iso_checksum)
         self.set('Status', 'iso_checksum_file_name', model.status.iso_checksum_file_name)
+        self.set('Status', 'compression_ratios', model.status.compression_ratios)
+        self.set('Status', 'generate_checkpoints', model.status.generate_checkpoints)
 
         # Options
         self.set('Options', 'update_os_release', model.options.update_os_release)
         self.set('Options', 'has_minimal_install', model.options.has_minimal_install)
         self.set('Options', 'boot_configurations', model.options.boot_configurations)
         self.set('Options', 'compression', model.options.compression)
+        self.set('Options', 'fast_boot_test', model.options.fast_boot_test)
+        self.set('Options', 'slimming_categories', model.options.slimming_categories)
+
+
+########################################################################
+# ISO Analysis Class
+########################################################################
+
+
+class IsoAnalysis(Configuration):
+    """
+    Stores the results of analyzing an original ISO, so they can be
+    reused by new projects created from the same ISO. The partition
+    images extracted from the ISO are stored in the same directory as
+    the configuration file. (See iso_utilities.load_iso_analysis() and
+    iso_utilities.save_iso_analysis()).
+    • Load values from the configuration into the model.
+    • Save values from the model into the configuration.
+
+    Sections:
+    • Analysis
+    • Layout
+    • Options
+    """
+
+    # ------------------------------------------------------------------
+    # Initialize Methods
+    # ------------------------------------------------------------------
+
+    def __init__(self, file_path):
+        """
+        Create an ISO Analysis configuration with the specified file
+        path and the following sections:
+        • Analysis
+        • Layout
+        • Options
+
+        Arguments:
+        self : Configuration
+            A derived class of Configuration.
+        file_path : str
+            The file path of the configuration file.
+        """
+
+        super().__init__(file_path, 'Analysis', 'Layout', 'Options')
+
+    # ------------------------------------------------------------------
+    # Load Methods
+    # ------------------------------------------------------------------
+
+    def _load_model(self):
+        """
+        Load the contents of the configuration file into the project
+        model. The analysis is only loaded if it was saved by the
+        running version of Cubic.
+
+        Arguments:
+        self : Configuration
+            A derived class of Configuration.
+        """
+
+        logger.log_value('Load ISO analysis', self.file_path)
+
+        cubic_version = self.get_value('Analysis', 'cubic_version')
+        if cubic_version != model.application.cubic_version:
+            logger.log_value('Ignore ISO analysis saved by Cubic version', cubic_version)
+            return
+
+        # Layout
+        model.layout.reset()
+        for attribute in model.layout.attributes():
+            model.layout.set_attribute_values(attribute, self.get_list('Layout', attribute, default=[]))
+
+        # Status
+        model.status.iso_template = self.get_value('Analysis', 'iso_template', default=None)
+        model.status.is_success_analyze = self.get_boolean('Analysis', 'is_success_analyze', default=False)
+
+        # Options
+        model.options.has_minimal_install = self.get_boolean('Options', 'has_minimal_install', default=False)
+
+    # ------------------------------------------------------------------
+    # Save Methods
+    # ------------------------------------------------------------------
+
+    def _save_model(self):
+        """
+        This method should only be called by the save() method.
+
+        Save the ISO analysis from the project model to the
+        configuration.
+
+        Arguments:
+        self : Configuration
+            A derived class of Configuration.
+        """
+
+        logger.log_value('Save ISO analysis', self.file_path)
+
+        # Analysis
+        self.set('Analysis', 'cubic_version', model.application.cubic_version)
+        self.set('Analysis', 'iso_template', model.status.iso_template)
+        self.set('Analysis', 'is_success_analyze', model.status.is_success_analyze)
+
+        # Layout
+        for attribute in model.layout.attributes():
+            self.set('Layout', attribute, model.layout.values(attribute, True))
+
+        # Options
+        self.set('Options', 'has_minimal_install', model.options.has_minimal_install)
@@ -123,6 +123,7 @@ def _enter_virtual_environment():
     program = os.path.join(model.application.directory, 'commands', 'start-console')
     # The command must be a list, as required by spawn_async().
     command = ['pkexec', program, MACHINE_NAME, model.project.custom_root_directory]
+    command.extend(_get_apt_directories())
     display_command = ' '.join([os.path.basename(command[1].strip('"'))] + command[2:])
     logger.log_value('Command', display_command)
 
@@ -242,6 +243,46 @@ def watch_virtual_environment(pseudo_terminal, task, data):
     subscribe_virtual_environment_exited(process_id, pseudo_terminal)
 
 
+def _get_apt_directories():
+    """
+    Get the additional start-console arguments for the shared apt
+    archive cache and the local apt mirror, as configured in the
+    application configuration. The shared cache is bind mounted on
+    /var/cache/apt/archives in the virtual environment, so packages
+    downloaded in one project are reused by other projects, and are not
+    left in the customized root. The mirror is bind mounted read only on
+    /run/cubic/mirror in the virtual environment.
+
+    Returns:
+    : list (str)
+        The apt cache directory and the apt mirror directory, or an
+        empty list if neither is configured. An empty string is used for
+        a directory that is not configured or does not exist.
+    """
+
+    apt_cache_directory = os.path.expanduser(model.application.apt_cache_directory or '')
+    if apt_cache_directory:
+        try:
+            os.makedirs(os.path.join(apt_cache_directory, 'partial'), exist_ok=True)
+            logger.log_value('The apt cache directory is', apt_cache_directory)
+        except OSError as exception:
+            logger.log_value('Unable to use the apt cache directory', exception)
+            apt_cache_directory = ''
+
+    apt_mirror_directory = os.path.expanduser(model.application.apt_mirror_directory or '')
+    if apt_mirror_directory:
+        if os.path.isdir(apt_mirror_directory):
+            logger.log_value('The apt mirror directory is', apt_mirror_directory)
+        else:
+            logger.log_value('The apt mirror directory does not exist', apt_mirror_directory)
+            apt_mirror_directory = ''
+
+    if not apt_cache_directory and not apt_mirror_directory:
+        return []
+
+    return [os.path.realpath(apt_cache_directory) if apt_cache_directory else '', os.path.realpath(apt_mirror_directory) if apt_mirror_directory else '']
+
+
 ########################################################################
 # Enter Virtual Environment Callback Functions
 ########################################################################
@@ -38,6 +38,7 @@
 ########################################################################
 
 import gi
+import threading
 
 gi.require_version('Gdk', '3.0')
 gi.require_version('GLib', '2.0')
@@ -113,6 +114,55 @@ def idle_add(callback):
     GLib.idle_add(callback)
 
 
+def call_and_wait(callback, *arguments):
+    """
+    Invoke the callback on the main thread, and wait for it to finish.
+    The navigator uses this function to load the user interface for a
+    page from the navigation thread.
+
+    Arguments:
+    callback : function
+        The callback function.
+    *arguments : object
+        The arguments for the callback function.
+
+    Returns:
+    : object
+        The value returned by the callback function.
+
+    Raises:
+    : Exception
+        The exception raised by the callback function, if any.
+    """
+
+    if threading.current_thread() is threading.main_thread():
+        return callback(*arguments)
+
+    event = threading.Event()
+    outcome = {}
+
+    def _call():
+        try:
+            outcome['result'] = callback(*arguments)
+        except Exception as exception:
+            outcome['exception'] = exception
+        finally:
+            event.set()
+        return False
+
+    GLib.idle_add(_call)
+
+    # Wait using a timeout, so an InterruptException can still be raised
+    # in the waiting thread.
+    while not event.wait(0.1):
+        pass
+
+    if 'exception' in outcome:
+        raise outcome['exception']
+
+    return outcome.get('result')
+
+
 ########################################################################
 # Page Functions
 ########################################################################
@@ -1043,6 +1093,43 @@ def insert_box_label(box_name, text, opacity=1.00, is_error=False):
     GLib.idle_add(Gtk.Box.add, box, label)
 
 
+def insert_check_button(container_name, check_button_name, label, tooltip, is_active, handler):
+    """
+    Insert a check button into the container. The check button is
+    registered with the builder, so it can be updated by name using the
+    other functions in this module.
+
+    Arguments:
+    container_name : str
+        The name of the container, such as a box or a flow box.
+    check_button_name : str
+        The name of the new check button.
+    label : str
+        The label for the check button.
+    tooltip : str
+        The tooltip for the check button.
+    is_active : bool
+        True to set the check button active. False to set it inactive.
+    handler : function
+        The function called when the check button is toggled. This
+        function must take the check button as the only argument.
+    """
+
+    # Since check button is not displayed, there is no need to call GLib.idle_add().
+    check_button = Gtk.CheckButton.new_with_label(label)
+    check_button.set_name(check_button_name)
+    check_button.set_tooltip_text(tooltip)
+    check_button.set_focus_on_click(False)
+    check_button.set_halign(Gtk.Align.START)
+    check_button.set_active(is_active)
+    check_button.set_visible(True)
+    check_button.connect('toggled', handler)
+    model.builder.expose_object(check_button_name, check_button)
+
+    container = model.builder.get_object(container_name)
+    GLib.idle_add(Gtk.Container.add, container, check_button)
+
+
 def scroll_view_port_to_bottom(view_port_name):
     """
     Scroll the to the bottom of the view port.
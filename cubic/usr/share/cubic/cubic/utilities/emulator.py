@@ -39,14 +39,22 @@ Use Ctrl-Alt-G to toggle mouse capture.
 # https://wiki.qemu.org
 # https://ubuntu.com/server/docs/virtualization-qemu
 # http://manpages.ubuntu.com/manpages/impish/en/man1/qemu-system-x86_64.1.html
+# https://qemu-project.gitlab.io/qemu/system/linuxboot.html
+# https://qemu-project.gitlab.io/qemu/tools/qemu-img.html
 
 ########################################################################
 # Imports
 ########################################################################
 
+import base64
 import gi
+import json
 import os
+import pexpect
 import psutil
+import re
+import shutil
+import time
 
 gi.require_version('GLib', '2.0')
 from gi.repository import GLib
@@ -56,9 +64,10 @@ from cubic.constants import MEMORY_INCREMENT, MIN_RESERVE_MEMORY, MIN_AVAILABLE_
 from cubic.constants import MIB, GIB
 from cubic.utilities import constructor
 from cubic.utilities import file_utilities
+from cubic.utilities import iso_reader
 from cubic.utilities import logger
 from cubic.utilities import model
-from cubic.utilities.processor import execute_asynchronous
+from cubic.utilities.processor import execute_asynchronous, execute_synchronous
 
 ########################################################################
 # Global Variables & Constants
@@ -75,6 +84,97 @@ argument of emulator.EXITED, emulator.RUNNING, or emulator.ERROR.
 """
 status_callback = None
 
+# Fast boot test mode
+
+# The directory, in the project directory, for the kernel and initrd
+# extracted from the disk image, the disposable overlay, and the serial
+# console log.
+FAST_BOOT_DIRECTORY_NAME = '.cubic-fast-boot'
+
+# The boot configuration files in the disk image, used to find the
+# kernel, the initrd, and the kernel parameters.
+GRUB_CONFIGURATION_FILE_PATHS = ('/boot/grub/grub.cfg', '/boot/grub/loopback.cfg')
+LINUX_PATTERN = re.compile(r'^\s*linux(?:efi|16)?\s+(\S+)(.*)$', re.MULTILINE)
+INITRD_PATTERN = re.compile(r'^\s*initrd(?:efi|16)?\s+(.+)$', re.MULTILINE)
+
+# Kernel parameters used if the boot configuration can not be read.
+DEFAULT_KERNEL_PARAMETERS = 'boot=casper'
+
+# Send kernel messages and a login prompt to the serial port, as well as
+# to the display.
+CONSOLE_KERNEL_PARAMETERS = 'console=ttyS0,115200 console=tty0'
+
+# The login prompt in the serial console log.
+LOGIN_PATTERN = re.compile(rb'\blogin: ')
+
+# Check the serial console log every 500 milliseconds.
+SERIAL_LOG_INTERVAL = 500
+
+# Headless boot test
+
+# The default milestones in the serial console output, in the order they
+# are expected to be reached. Each milestone is a name and a regular
+# expression.
+BOOT_TEST_MILESTONES = (
+    ('kernel', r'Linux version \S+'),
+    ('initramfs', r'Run /init as init process|Loading, please wait'),
+    ('root', r'Begin: Mounting root file system'),
+    ('systemd', r'systemd\[1\]|Welcome to'),
+    ('login', r'\blogin: '))
+
+# The default maximum number of seconds to wait for all of the
+# milestones. Booting using TCG software emulation is slow.
+BOOT_TEST_TIMEOUT = 900
+
+# Send all console output to the serial port.
+BOOT_TEST_KERNEL_PARAMETERS = 'console=ttyS0,115200'
+
+# The report file, in the project directory.
+BOOT_TEST_REPORT_FILE_NAME = 'boot-test-report.json'
+
+# Boot access order
+
+# Trace files as they are added to the page cache, from the start of the
+# boot.
+ACCESS_ORDER_KERNEL_PARAMETERS = 'trace_event=filemap:mm_filemap_add_to_page_cache trace_buf_size=16M'
+
+# The file, in the project directory, listing the files in the squashfs
+# file systems in the order they were first read during the boot test.
+# Paths are relative to the root of the file system.
+ACCESS_ORDER_FILE_NAME = 'boot-access-order.txt'
+
+# The live session user, and the shell prompt after logging in.
+LIVE_USER_NAME = 'ubuntu'
+SHELL_PROMPT_PATTERN = r'[$#] $'
+
+# Markers surrounding the access order in the serial console output.
+ACCESS_ORDER_BEGIN_MARKER = 'CUBIC-ACCESS-ORDER-BEGIN'
+ACCESS_ORDER_END_MARKER = 'CUBIC-ACCESS-ORDER-END'
+
+# The script run as root in the live session. The inodes in the page
+# cache trace are matched with the files in the squashfs mounts, and the
+# file paths are printed in the order the files were first read.
+ACCESS_ORDER_SCRIPT = f"""
+tracing=/sys/kernel/tracing
+[ -e $tracing/trace ] || tracing=/sys/kernel/debug/tracing
+echo 0 > $tracing/tracing_on
+grep -o 'dev [0-9]*:[0-9]* ino [0-9a-f]*' $tracing/trace | awk '!seen[$2 " " $4]++ {{ print $2, $4 }}' > /tmp/cubic-access-order
+echo {ACCESS_ORDER_BEGIN_MARKER}
+awk '{{ for (i = 7; $i != "-"; i++); if ($(i + 1) == "squashfs") print $3, $5 }}' /proc/self/mountinfo |
+while read device directory; do find "$directory" -xdev -type f -printf "$device %i %P\\n"; done |
+awk 'NR == FNR {{ order[$1 " " $2] = NR; next }} {{ key = $1 " " sprintf("%x", $2); if (key in order) {{ path = $0; sub(/^[^ ]* [^ ]* /, "", path); print order[key], path }} }}' /tmp/cubic-access-order - |
+sort -n -k 1,1 | cut -d " " -f 2-
+echo {ACCESS_ORDER_END_MARKER}
+"""
+
+# The maximum number of virtual CPUs allocated to the emulator.
+MAX_EMULATOR_CPUS = 8
+
+# The disposable overlay of the running emulator, and the time it was
+# started.
+overlay_file_path = None
+start_time = None
+
 ########################################################################
 # Start Emulator Functions
 ########################################################################
@@ -85,7 +185,9 @@ def start_emulator(new_status_callback):
     global status_callback
     status_callback = new_status_callback
 
-    _start_emulator()
+    logger.log_value('Use fast boot test mode?', bool(model.options.fast_boot_test))
+    if not model.options.fast_boot_test or not _start_fast_boot_emulator():
+        _start_emulator()
 
     # Assume the emulator is running.
     logger.log_value('Emulator status', 'Started')
@@ -166,6 +268,529 @@ def _start_emulator():
     subscribe_emulator_exited(process.pid)
 
 
+def _start_fast_boot_emulator():
+    """
+    Start the emulator in fast boot test mode. The kernel and initrd are
+    extracted from the generated disk image and booted directly, which
+    skips the firmware, the boot loader, and probing for the boot media.
+    The disk image is attached as a virtio disk using a disposable qcow2
+    overlay, so the disk image is never modified.
+
+    Returns:
+    : bool
+        True if the emulator was started, False otherwise.
+    """
+
+    global start_time
+
+    logger.log_label('Start the emulator in fast boot test mode')
+
+    custom_iso_file_path = os.path.join(model.generated.iso_directory, model.generated.iso_file_name)
+    fast_boot = prepare_fast_boot(custom_iso_file_path, CONSOLE_KERNEL_PARAMETERS)
+    if not fast_boot:
+        return False
+    fast_boot_directory, kernel_file_path, initrd_file_path, kernel_parameters, drive = fast_boot
+
+    emulator_memory, emulator_memory_mib, emulator_memory_gib = allocate_emulator_memory()
+
+    serial_log_file_path = os.path.join(fast_boot_directory, 'serial.log')
+    if os.path.exists(serial_log_file_path):
+        os.remove(serial_log_file_path)
+
+    is_virtualization_supported = host_has_virtualization_support()
+    is_gtk_display_supported = host_has_gtk_display_support()
+
+    command = ['qemu-system-x86_64', '-name', 'Cubic', '-M', 'q35']
+    if is_virtualization_supported:
+        command += ['-enable-kvm', '-cpu', 'host']
+    else:
+        logger.log_value('Warning', f'{BOLD_RED}System does not support virtualization{NORMAL}')
+    command += ['-smp', get_emulator_cpus(), '-m', f'{emulator_memory_mib:d}M']
+    if is_gtk_display_supported:
+        command += ['-display', 'gtk,zoom-to-fit=on']
+    else:
+        logger.log_value('Warning', f'{BOLD_RED}System does not support GTk display{NORMAL}')
+    command += [
+        '-kernel',
+        kernel_file_path,
+        '-initrd',
+        initrd_file_path,
+        '-append',
+        kernel_parameters,
+        '-drive',
+        drive,
+        '-netdev',
+        'user,id=network',
+        '-device',
+        'virtio-net-pci,netdev=network',
+        '-serial',
+        f'file:{serial_log_file_path}']
+
+    # Start the emulator.
+    start_time = time.perf_counter()
+    process = execute_asynchronous(command)
+
+    # Subscribe to emulator exited events.
+    subscribe_emulator_exited(process.pid)
+
+    # Measure the time to login using the serial console log.
+    GLib.timeout_add(SERIAL_LOG_INTERVAL, watch_serial_log, serial_log_file_path, process.pid, [0, b''])
+
+    return True
+
+
+########################################################################
+# Boot Test Functions
+########################################################################
+
+
+def run_boot_test(milestones=BOOT_TEST_MILESTONES, timeout=BOOT_TEST_TIMEOUT, is_capture_access_order=False):
+    """
+    Boot the generated disk image in the emulator without a display,
+    and record the time each milestone is reached in the serial console
+    output. The emulator uses KVM if it is available, and falls back to
+    the slower TCG software emulation otherwise. The results are saved
+    in a report in the project directory, and compared with the previous
+    report so boot time regressions between builds are visible.
+
+    Arguments:
+    milestones : tuple (tuple (str, str))
+        The name and the regular expression for each milestone, in the
+        order they are expected to be reached.
+    timeout : int
+        The maximum number of seconds to wait for all of the milestones.
+    is_capture_access_order : bool
+        Optionally record the order files are first read during the
+        boot, after all of the milestones have been reached. The last
+        milestone must be the login prompt. See capture_access_order().
+
+    Returns:
+    : dict
+        The report.
+    """
+
+    logger.log_label('Run the boot test')
+
+    custom_iso_file_path = os.path.join(model.generated.iso_directory, model.generated.iso_file_name)
+    report_file_path = os.path.join(model.project.directory, BOOT_TEST_REPORT_FILE_NAME)
+
+    # The console is only on the serial port, so all kernel and init
+    # messages are captured.
+    is_kvm_available = host_has_virtualization_support() and os.access('/dev/kvm', os.R_OK | os.W_OK)
+    report = {
+        'iso_file_path': custom_iso_file_path,
+        'date': constructor.get_current_time_stamp(),
+        'accelerator': 'kvm' if is_kvm_available else 'tcg',
+        'timeout': timeout,
+        'is_success': False,
+        'error': None,
+        'milestones': []}
+
+    try:
+        fast_boot = prepare_fast_boot(custom_iso_file_path, BOOT_TEST_KERNEL_PARAMETERS)
+    except Exception as exception:
+        logger.log_value('Unable to prepare the boot test', exception)
+        report['error'] = f'Unable to prepare the boot test; {exception}'
+        delete_overlay()
+        _save_boot_test_report(report, report_file_path)
+        return report
+    if not fast_boot:
+        report['error'] = 'Unable to extract the kernel and the initrd from the disk image'
+        _save_boot_test_report(report, report_file_path)
+        return report
+    fast_boot_directory, kernel_file_path, initrd_file_path, kernel_parameters, drive = fast_boot
+
+    # Show all kernel messages, so the milestones can be matched.
+    kernel_parameters = ' '.join(parameter for parameter in kernel_parameters.split() if parameter not in ('quiet', 'splash'))
+    if is_capture_access_order:
+        kernel_parameters = f'{ACCESS_ORDER_KERNEL_PARAMETERS} {kernel_parameters}'
+
+    emulator_memory, emulator_memory_mib, emulator_memory_gib = allocate_emulator_memory()
+
+    command = ['qemu-system-x86_64', '-name', 'Cubic', '-M', 'q35']
+    if is_kvm_available:
+        command += ['-accel', 'kvm', '-cpu', 'host']
+    else:
+        logger.log_value('Warning', f'{BOLD_RED}KVM is not available; use TCG software emulation{NORMAL}')
+        command += ['-accel', 'tcg']
+    command += [
+        '-smp',
+        get_emulator_cpus(),
+        '-m',
+        f'{emulator_memory_mib:d}M',
+        '-display',
+        'none',
+        '-monitor',
+        'none',
+        '-no-reboot',
+        '-kernel',
+        kernel_file_path,
+        '-initrd',
+        initrd_file_path,
+        '-append',
+        kernel_parameters,
+        '-drive',
+        drive,
+        '-netdev',
+        'user,id=network',
+        '-device',
+        'virtio-net-pci,netdev=network',
+        '-serial',
+        'stdio']
+
+    serial_log_file_path = os.path.join(fast_boot_directory, 'serial.log')
+    start_time = time.perf_counter()
+    deadline = start_time + timeout
+    process = execute_asynchronous(command)
+    if not process:
+        report['error'] = 'Unable to start the emulator'
+        delete_overlay()
+        _save_boot_test_report(report, report_file_path)
+        return report
+
+    try:
+        with open(serial_log_file_path, 'w') as serial_log_file:
+            process.logfile_read = serial_log_file
+            for name, pattern in milestones:
+                index = process.expect([pattern, pexpect.EOF, pexpect.TIMEOUT], timeout=max(deadline - time.perf_counter(), 0))
+                if index == 0:
+                    seconds = round(time.perf_counter() - start_time, 2)
+                    logger.log_value(f'Reached boot milestone {name} in', f'{seconds:.2f} seconds')
+                    report['milestones'].append({'name': name, 'pattern': pattern, 'seconds': seconds})
+                else:
+                    logger.log_value(f'Did not reach boot milestone {name}', 'Emulator exited' if index == 1 else 'Timeout')
+                    report['milestones'].append({'name': name, 'pattern': pattern, 'seconds': None})
+                    report['error'] = f'The emulator {"exited" if index == 1 else "timed out"} before reaching the {name} milestone'
+                    break
+            else:
+                report['is_success'] = True
+                if is_capture_access_order:
+                    access_order_file_path = os.path.join(model.project.directory, ACCESS_ORDER_FILE_NAME)
+                    report['access_order_file_count'] = capture_access_order(process, access_order_file_path, max(deadline - time.perf_counter(), 60))
+    except Exception as exception:
+        logger.log_value('Exception while running the boot test', exception)
+        report['is_success'] = False
+        report['error'] = f'Exception while running the boot test; {exception}'
+    finally:
+        process.logfile_read = None
+        process.terminate(force=True)
+        delete_overlay()
+
+    _save_boot_test_report(report, report_file_path)
+
+    return report
+
+
+def capture_access_order(process, access_order_file_path, timeout):
+    """
+    Log in to the live session on the serial console, and save the files
+    in the squashfs file systems in the order they were first read
+    during the boot. The order is obtained from the page cache trace
+    enabled by ACCESS_ORDER_KERNEL_PARAMETERS. The saved order is used
+    to create a mksquashfs sort file when the next disk image is
+    generated, so the files read during boot are stored contiguously at
+    the front of the squashfs file.
+
+    Arguments:
+    process : pexpect.pty_spawn.spawn
+        The emulator process, at the login prompt.
+    access_order_file_path : str
+        The file to save the access order to.
+    timeout : float
+        The maximum number of seconds to wait.
+
+    Returns:
+    : int
+        The number of files, or None if the access order could not be
+        captured.
+    """
+
+    logger.log_label('Capture the boot access order')
+
+    process.sendline(LIVE_USER_NAME)
+    index = process.expect([SHELL_PROMPT_PATTERN, r'[Pp]assword: ', pexpect.EOF, pexpect.TIMEOUT], timeout=60)
+    if index != 0:
+        logger.log_value('Unable to log in to the live session', 'Skip')
+        return None
+
+    # Encode the script, so it is sent on a single line and the markers
+    # in the echoed command are not matched.
+    encoded_script = base64.b64encode(ACCESS_ORDER_SCRIPT.encode()).decode()
+    process.sendline(f'echo {encoded_script} | base64 -d | sudo sh')
+    index = process.expect([ACCESS_ORDER_BEGIN_MARKER, pexpect.EOF, pexpect.TIMEOUT], timeout=timeout)
+    if index == 0:
+        index = process.expect([ACCESS_ORDER_END_MARKER, pexpect.EOF, pexpect.TIMEOUT], timeout=timeout)
+    if index != 0:
+        logger.log_value('Unable to capture the boot access order', 'Skip')
+        return None
+
+    file_paths = [line.strip('\r') for line in process.before.split('\n')]
+    file_paths = [file_path for file_path in file_paths if file_path]
+    with open(access_order_file_path, 'w') as file:
+        file.writelines(f'{file_path}\n' for file_path in file_paths)
+    logger.log_value('Files read during boot', len(file_paths))
+    logger.log_value('Save the boot access order', access_order_file_path)
+
+    return len(file_paths)
+
+
+def _save_boot_test_report(report, report_file_path):
+
+    # Compare the milestones with the previous report.
+    try:
+        with open(report_file_path) as file:
+            previous_report = json.load(file)
+    except (OSError, ValueError):
+        previous_report = {}
+    previous_seconds = {milestone['name']: milestone['seconds'] for milestone in previous_report.get('milestones', [])}
+    for milestone in report['milestones']:
+        previous = previous_seconds.get(milestone['name'])
+        milestone['previous_seconds'] = previous
+        milestone['change_seconds'] = round(milestone['seconds'] - previous, 2) if milestone['seconds'] is not None and previous is not None else None
+
+    logger.log_value('Save the boot test report', report_file_path)
+    with open(report_file_path, 'w') as file:
+        json.dump(report, file, indent=4)
+
+
+########################################################################
+# Fast Boot Functions
+########################################################################
+
+
+def prepare_fast_boot(iso_file_path, console_kernel_parameters):
+    """
+    Prepare to boot the disk image directly: extract the kernel and the
+    initrd, get the kernel parameters, and create a disposable overlay.
+
+    Arguments:
+    iso_file_path : str
+        The path of the disk image.
+    console_kernel_parameters : str
+        The kernel parameters for the console.
+
+    Returns:
+    fast_boot_directory : str
+        The directory containing the extracted files.
+    kernel_file_path : str
+        The path of the extracted kernel.
+    initrd_file_path : str
+        The path of the extracted initrd.
+    kernel_parameters : str
+        The kernel parameters.
+    drive : str
+        The qemu drive specification for the disk image.
+    : None
+        If the kernel and the initrd could not be extracted.
+    """
+
+    global overlay_file_path
+
+    fast_boot_directory = os.path.join(model.project.directory, FAST_BOOT_DIRECTORY_NAME)
+
+    try:
+        os.makedirs(fast_boot_directory, exist_ok=True)
+        kernel_file_path, initrd_file_path, kernel_parameters = extract_boot_files(iso_file_path, fast_boot_directory)
+    except (OSError, ValueError) as exception:
+        logger.log_value('Warning', f'{BOLD_RED}Unable to extract the boot files for fast boot{NORMAL}')
+        logger.log_value('The exception is', exception)
+        return None
+
+    # Add the console parameters first, so they precede any '---'
+    # separator in the kernel parameters.
+    kernel_parameters = f'{console_kernel_parameters} {kernel_parameters}'.strip()
+    logger.log_value('The kernel parameters are', kernel_parameters)
+
+    # Escape ',' in file paths with ',,' per qemu requirements.
+    overlay_file_path = create_overlay(iso_file_path, fast_boot_directory)
+    if overlay_file_path:
+        drive = f'if=virtio,format=qcow2,file={overlay_file_path.replace(",", ",,")}'
+    else:
+        # Let qemu create a temporary overlay instead.
+        drive = f'if=virtio,format=raw,snapshot=on,file={iso_file_path.replace(",", ",,")}'
+
+    return fast_boot_directory, kernel_file_path, initrd_file_path, kernel_parameters, drive
+
+
+def extract_boot_files(iso_file_path, directory):
+    """
+    Extract the kernel and the initrd from the disk image, and get the
+    kernel parameters, using the first entry in the boot configuration.
+    Previously extracted files are reused if the disk image has not
+    changed. Multiple initrd files are combined into a single file.
+
+    Arguments:
+    iso_file_path : str
+        The path of the disk image.
+    directory : str
+        The directory to extract the kernel and the initrd into.
+
+    Returns:
+    kernel_file_path : str
+        The path of the extracted kernel.
+    initrd_file_path : str
+        The path of the extracted initrd.
+    kernel_parameters : str
+        The kernel parameters.
+
+    Raises:
+    : OSError
+        If the disk image, the kernel, or the initrd can not be read.
+    : ValueError
+        If the disk image is not a valid ISO 9660 image.
+    """
+
+    kernel_file_path = os.path.join(directory, 'vmlinuz')
+    initrd_file_path = os.path.join(directory, 'initrd')
+
+    with iso_reader.IsoImage(iso_file_path) as iso_image:
+
+        kernel_path, initrd_paths, kernel_parameters = _read_boot_configuration(iso_image)
+        logger.log_value('The kernel is', kernel_path)
+        logger.log_value('The initrd is', ' '.join(initrd_paths))
+
+        iso_modify_time = os.path.getmtime(iso_file_path)
+        for file_path, paths in ((kernel_file_path, [kernel_path]), (initrd_file_path, initrd_paths)):
+            if os.path.exists(file_path) and os.path.getmtime(file_path) >= iso_modify_time:
+                logger.log_value('Reuse the extracted file', file_path)
+                continue
+            with open(file_path, 'wb') as file:
+                for path in paths:
+                    file.write(iso_image.read_file(_resolve_link(iso_image, path)))
+
+    return kernel_file_path, initrd_file_path, kernel_parameters
+
+
+def _read_boot_configuration(iso_image):
+
+    for configuration_file_path in GRUB_CONFIGURATION_FILE_PATHS:
+        if not iso_image.exists(configuration_file_path):
+            continue
+        text = iso_image.read_file(configuration_file_path).decode(errors='replace')
+        linux_match = LINUX_PATTERN.search(text)
+        if not linux_match:
+            continue
+        initrd_match = INITRD_PATTERN.search(text, linux_match.end())
+        if not initrd_match:
+            continue
+        return linux_match.group(1), initrd_match.group(1).split(), linux_match.group(2).strip()
+
+    # Fall back to the files in the casper directory.
+    logger.log_value('Unable to read the boot configuration', 'Use the casper directory')
+    directory_path = '/' + model.layout.casper_directory
+    file_names = sorted(entry.name for entry in iso_image.list_directory(directory_path) if not entry.is_directory)
+    kernel_names = [file_name for file_name in file_names if file_name.startswith('vmlinuz')]
+    initrd_names = [file_name for file_name in file_names if file_name.startswith('initrd')]
+    if not kernel_names or not initrd_names:
+        raise FileNotFoundError(f'Unable to find the kernel and the initrd in {directory_path}')
+
+    return os.path.join(directory_path, kernel_names[0]), [os.path.join(directory_path, initrd_names[0])], DEFAULT_KERNEL_PARAMETERS
+
+
+def _resolve_link(iso_image, path):
+
+    entry = iso_image.get_entry(path)
+    if entry and entry.link_target:
+        path = os.path.normpath(os.path.join(os.path.dirname(path), entry.link_target))
+
+    return path
+
+
+def create_overlay(iso_file_path, directory):
+    """
+    Create a disposable qcow2 overlay, backed by the disk image, so the
+    emulator never writes to the disk image.
+
+    Arguments:
+    iso_file_path : str
+        The path of the disk image.
+    directory : str
+        The directory to create the overlay in.
+
+    Returns:
+    : str
+        The path of the overlay, or None if it could not be created.
+    """
+
+    if not shutil.which('qemu-img'):
+        logger.log_value('Create an overlay?', 'No, qemu-img is not installed')
+        return None
+
+    file_path = os.path.join(directory, 'overlay.qcow2')
+    try:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        command = ['qemu-img', 'create', '-q', '-f', 'qcow2', '-F', 'raw', '-b', iso_file_path, file_path]
+        result, exit_status, signal_status = execute_synchronous(command)
+    except Exception as exception:
+        logger.log_value('Unable to create an overlay', exception)
+        return None
+
+    if exit_status or signal_status:
+        logger.log_value('Unable to create an overlay', result)
+        return None
+
+    return file_path
+
+
+def delete_overlay():
+    """
+    Delete the disposable overlay, if there is one.
+    """
+
+    global overlay_file_path
+
+    if overlay_file_path:
+        logger.log_value('Delete the overlay', overlay_file_path)
+        try:
+            os.remove(overlay_file_path)
+        except FileNotFoundError:
+            pass
+        overlay_file_path = None
+
+
+def watch_serial_log(file_path, process_id, state):
+    """
+    Check the serial console log for the login prompt, and log the time
+    to login. This function is called periodically by GLib until the
+    login prompt is found or the emulator exits.
+
+    Arguments:
+    file_path : str
+        The path of the serial console log.
+    process_id : int
+        The process id of the emulator.
+    state : list
+        The position read up to and the unmatched end of the log.
+
+    Returns:
+    : bool
+        True to keep checking, False to stop.
+    """
+
+    if not psutil.pid_exists(process_id):
+        return False
+
+    try:
+        with open(file_path, 'rb') as file:
+            file.seek(state[0])
+            data = file.read()
+    except FileNotFoundError:
+        return True
+
+    state[0] += len(data)
+    data = state[1] + data
+    if LOGIN_PATTERN.search(data):
+        duration = time.perf_counter() - start_time
+        logger.log_value('Emulator time to login', f'{duration:.1f} seconds')
+        return False
+
+    # Keep the end of the log, in case the prompt is split between reads.
+    state[1] = data[-64:]
+
+    return True
+
+
 ########################################################################
 # Exit Emulator Callback Functions
 ########################################################################
@@ -181,6 +806,8 @@ def exited_emulator(process_id, status):
 
     logger.log_value('Emulator status', 'Exited')
 
+    delete_overlay()
+
     # The signal number that killed the process.
     signal = status % 256  # Gets the low byte.
 
@@ -243,6 +870,24 @@ def host_has_gtk_display_support():
     return has_support
 
 
+def get_emulator_cpus():
+    """
+    Get the number of virtual CPUs to allocate to the emulator. Half of
+    the host's logical CPUs are allocated, so the host remains
+    responsive.
+
+    Returns:
+    : int
+        The number of virtual CPUs.
+    """
+
+    host_cpus = psutil.cpu_count() or 1
+    emulator_cpus = max(1, min(host_cpus // 2, MAX_EMULATOR_CPUS))
+    logger.log_value('Virtual CPUs allocated to the emulator', emulator_cpus)
+
+    return emulator_cpus
+
+
 def get_total_system_memory():
     """
     Get the total system memory.
@@ -39,25 +39,69 @@
 # Imports
 ########################################################################
 
+import concurrent.futures
+import copy
 import glob
 import hashlib
 import magic
 import mimetypes
 import os
+import pexpect
 import re
 import shutil
+import stat
+import threading
+import time
 import traceback
 import yaml
 
 from cubic.utilities import logger
 from cubic.utilities import model
+from cubic.utilities import mount_table
 from cubic.utilities.processor import execute_synchronous
 
 ########################################################################
 # Global Variables & Constants
 ########################################################################
 
-# N/A
+# The number of threads used to scan directories in parallel. Scanning
+# is dominated by waiting for file system metadata, so more threads than
+# processors are used.
+SCAN_THREADS = min(32, 4 * (os.cpu_count() or 1))
+
+# The name of the directory, in the same directory as the deleted files,
+# used to hold files that are being deleted in the background.
+TRASH_DIRECTORY_NAME = '.cubic-trash'
+
+# Pattern to match percent in the output of the reclaim-path command.
+# The format is "###.##%".
+RECLAIM_PERCENT_PATTERN = re.compile(r'[0-9]{1,3}(\.[0-9]{2}){0,1}%')
+
+# Patterns to match the lines written by the reclaim-path command when
+# it starts reclaiming a trash directory, skips a mount point, or is
+# unable to reclaim a trash directory.
+RECLAIM_START_PATTERN = re.compile(r'Reclaiming [0-9]+ files and directories in (.*?)\r?\n')
+RECLAIM_SKIP_PATTERN = re.compile(r'Skipping mount point (.*?)\r?\n')
+RECLAIM_ERROR_PATTERN = re.compile(r'Unable to reclaim (.*?)\r?\n')
+
+# The background threads reclaiming disk space, keyed by trash directory.
+reclaim_threads = {}
+
+# The percent complete of each trash directory being reclaimed.
+reclaim_percents = {}
+
+# Serialize moving files to the trash and removing trash directories.
+trash_lock = threading.Lock()
+
+# Use the libyaml C implementation of the safe loader and dumper, if it
+# is available.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Parsed yaml documents, keyed by real file path. Each value is a tuple
+# of (modification time, size, document), so a document is only parsed
+# again if the file has changed.
+yaml_cache = {}
 
 ########################################################################
 # Directory Functions
@@ -195,6 +239,204 @@ def delete_path_as_root(file_path):
     return result, exit_status, signal_status
 
 
+def delete_path_in_background(file_path):
+    """
+    Delete the directory or file as root, without waiting for it to be
+    deleted. The path is atomically moved to a trash directory, and the
+    disk space is reclaimed by a low priority background process. If the
+    path can not be moved, it is deleted using delete_path_as_root().
+
+    Arguments:
+    file_path : str
+        The full path of the directory or file to delete.
+
+    Returns:
+    result : str
+        The result of the process.
+    exit_status : int
+        The exit status of the process.
+    signal_status : int
+        The signal status of the process.
+    """
+
+    logger.log_value('Delete file in the background', file_path)
+
+    trash_file_path = move_path_to_trash(file_path)
+    if not trash_file_path:
+        return delete_path_as_root(file_path)
+
+    reclaim_trash(os.path.dirname(os.path.abspath(file_path)))
+
+    return None, 0, None
+
+
+def move_path_to_trash(file_path):
+    """
+    Move the directory or file to the trash directory located in the same
+    directory, so it can be deleted later. The path is moved as the
+    current user, if permitted, or as root.
+
+    Arguments:
+    file_path : str
+        The full path of the directory or file to move.
+
+    Returns:
+    : str
+        The full path of the moved directory or file in the trash
+        directory, or None if the path could not be moved.
+    """
+
+    file_path = os.path.abspath(file_path)
+    trash_directory = os.path.join(os.path.dirname(file_path), TRASH_DIRECTORY_NAME)
+    trash_file_path = os.path.join(trash_directory, f'{os.path.basename(file_path)}-{time.time_ns()}')
+
+    with trash_lock:
+        try:
+            os.makedirs(trash_directory, exist_ok=True)
+        except OSError as exception:
+            logger.log_value('Unable to create the trash directory', trash_directory)
+            logger.log_value('The exception is', exception)
+            return None
+
+        try:
+            os.rename(file_path, trash_file_path)
+        except PermissionError:
+            # Directories owned by root can only be moved by root.
+            program = os.path.join(model.application.directory, 'commands', 'move-path')
+            command = ['pkexec', program, file_path, trash_file_path]
+            result, exit_status, signal_status = execute_synchronous(command)
+            if exit_status or signal_status or os.path.lexists(file_path):
+                logger.log_value('Unable to move to the trash directory', file_path)
+                logger.log_value('The result is', result)
+                return None
+        except OSError as exception:
+            logger.log_value('Unable to move to the trash directory', file_path)
+            logger.log_value('The exception is', exception)
+            return None
+
+    logger.log_value('Moved to the trash directory', trash_file_path)
+
+    return trash_file_path
+
+
+def reclaim_trash(directories):
+    """
+    Reclaim the disk space used by the trash directory in each
+    directory, if it exists, using a single low priority background
+    process. Disk space is reclaimed at most once at a time for each
+    trash directory; files moved to the trash while it is being
+    reclaimed are also deleted.
+
+    The process is not registered with the processor module, so it is
+    not terminated when other processes are interrupted. If Cubic exits
+    before all files are deleted, the remaining files are deleted the
+    next time this function is called for the directory; Cubic calls it
+    for all previous project directories when it starts.
+
+    Arguments:
+    directories : str, list(str)
+        The full path of the directory, or directories, containing the
+        trash directory.
+    """
+
+    if isinstance(directories, str): directories = [directories]
+
+    with trash_lock:
+        trash_directories = []
+        for directory in directories:
+            trash_directory = os.path.join(os.path.abspath(directory), TRASH_DIRECTORY_NAME)
+            if not os.path.isdir(trash_directory): continue
+            thread = reclaim_threads.get(trash_directory)
+            if thread and thread.is_alive(): continue
+            if trash_directory not in trash_directories: trash_directories.append(trash_directory)
+        if not trash_directories: return
+        thread = threading.Thread(target=_reclaim_trash, args=(trash_directories,), daemon=True)
+        for trash_directory in trash_directories:
+            reclaim_threads[trash_directory] = thread
+        thread.start()
+
+
+def _reclaim_trash(trash_directories):
+    """
+    Delete the contents of the trash directories, repeating until no new
+    files have been moved to the trash, and then remove the empty trash
+    directories. A trash directory that could not be completely
+    reclaimed, for example because it contains a mount point, is kept
+    and is not retried until the next time reclaim_trash() is called.
+    This function should be run as a thread.
+
+    Arguments:
+    trash_directories : list(str)
+        The full paths of the trash directories.
+    """
+
+    logger.log_value('Reclaim disk space in the background', ', '.join(trash_directories))
+
+    program = os.path.join(model.application.directory, 'commands', 'reclaim-path')
+    patterns = [RECLAIM_START_PATTERN, RECLAIM_SKIP_PATTERN, RECLAIM_ERROR_PATTERN, RECLAIM_PERCENT_PATTERN]
+    while trash_directories:
+        for trash_directory in trash_directories:
+            reclaim_percents[trash_directory] = 0.0
+        trash_directory = None
+        failed_directories = []
+        process = None
+        try:
+            process = pexpect.spawn('pkexec', args=[program] + trash_directories, timeout=None, encoding='UTF-8')
+            logger.log_value('The reclaim process id is', process.pid)
+            while True:
+                try:
+                    index = process.expect(patterns)
+                except pexpect.EOF:
+                    break
+                if index == 0:
+                    trash_directory = process.match.group(1)
+                elif index == 1:
+                    logger.log_value('Unable to reclaim mount point', process.match.group(1))
+                elif index == 2:
+                    failed_directories.append(process.match.group(1))
+                elif trash_directory in reclaim_percents:
+                    percent = float(process.after[:-1])
+                    if int(percent / 10) > int(reclaim_percents[trash_directory] / 10):
+                        logger.log_value(f'Reclaimed {trash_directory}', f'{percent:n}%')
+                    reclaim_percents[trash_directory] = percent
+            process.close()
+        except pexpect.ExceptionPexpect as exception:
+            logger.log_value('Unable to reclaim disk space', ', '.join(trash_directories))
+            logger.log_value('The exception is', exception)
+            break
+        finally:
+            if process and process.isalive(): process.close(force=True)
+
+        if process.signalstatus or (process.exitstatus and not failed_directories):
+            logger.log_value('Unable to reclaim disk space', ', '.join(trash_directories))
+            logger.log_value('The exit status, signal status is', f'{process.exitstatus}, {process.signalstatus}')
+            logger.log_value('The message is', process.before.strip())
+            break
+
+        # Keep trash directories that could not be completely reclaimed,
+        # and reclaim the others again if more files have been moved to
+        # the trash.
+        remaining_directories = []
+        for trash_directory in trash_directories:
+            if trash_directory in failed_directories:
+                logger.log_value('Unable to reclaim all disk space; keep', trash_directory)
+                reclaim_percents.pop(trash_directory, None)
+                continue
+            with trash_lock:
+                try:
+                    os.rmdir(trash_directory)
+                    logger.log_value('Reclaimed disk space', trash_directory)
+                    reclaim_percents.pop(trash_directory, None)
+                except FileNotFoundError:
+                    reclaim_percents.pop(trash_directory, None)
+                except OSError:
+                    remaining_directories.append(trash_directory)
+        trash_directories = remaining_directories
+
+    for trash_directory in trash_directories:
+        reclaim_percents.pop(trash_directory, None)
+
+
 def get_directory_size(start_directory):
     """
     This function is not used.
@@ -223,6 +465,185 @@ def get_directory_size(start_directory):
     return total_size
 
 
+def get_disk_usage(start_directory):
+    """
+    Get the disk usage of the directory, equivalent to the size reported
+    by the file-size command (du --block-size=1 --summarize), without
+    spawning a privileged process. Directories are scanned in parallel,
+    and files with multiple hard links are only counted once.
+
+    Arguments:
+    start_directory : str
+        The full path of the directory.
+
+    Returns:
+    : int
+        The disk usage in bytes, or None if any part of the directory
+        could not be read. In that case, use the file-size command.
+    """
+
+    logger.log_value('Calculate disk usage of', start_directory)
+
+    size = _calculate_disk_usage(start_directory)
+
+    if size is None:
+        logger.log_value('Unable to calculate the disk usage of', start_directory)
+    else:
+        logger.log_value('The disk usage is', f'{size:n} bytes')
+
+    return size
+
+
+def _calculate_disk_usage(start_directory):
+    """
+    Calculate the disk usage of the directory.
+
+    Arguments:
+    start_directory : str
+        The full path of the directory.
+
+    Returns:
+    : int
+        The disk usage in bytes, or None if the directory could not be
+        read.
+    """
+
+    def raise_error(exception):
+        raise exception
+
+    # Identify files with multiple hard links by device and inode.
+    linked_inodes = set()
+
+    try:
+        total_size = os.lstat(start_directory).st_blocks * 512
+        for directory_path, directory_entries, file_entries in walk_tree(start_directory, on_error=raise_error, is_stat=True):
+            for entry in directory_entries + file_entries:
+                status = entry.stat(follow_symlinks=False)
+                if status.st_nlink > 1 and not stat.S_ISDIR(status.st_mode):
+                    if (status.st_dev, status.st_ino) in linked_inodes:
+                        continue
+                    linked_inodes.add((status.st_dev, status.st_ino))
+                total_size += status.st_blocks * 512
+    except OSError as exception:
+        logger.log_value('The exception is', exception)
+        return None
+
+    return total_size
+
+
+def walk_tree(start_directory, exclude_paths=None, follow_links=False, on_error=None, is_stat=False):
+    """
+    Walk the directory tree, scanning directories in parallel. This is
+    a faster alternative to os.walk(), used by the functions in this
+    module that search or list files.
+
+    For each directory, yield a tuple of (directory_path,
+    directory_entries, file_entries), where the entries are of type
+    os.DirEntry. As with os.walk(), symlinks to directories are included
+    in directory_entries. Directories are yielded as soon as they have
+    been scanned, so the order is not defined; sort the results if a
+    specific order is required.
+
+    Symlinks to directories are only descended if follow_links is True.
+    In that case, each directory is only descended once, identified by
+    its device and inode, so recursive symlinks do not cause a loop.
+
+    Closing the generator (for example, by breaking out of a loop)
+    cancels the remaining scans.
+
+    Arguments:
+    start_directory : str
+        The full path of the directory to walk.
+    exclude_paths : set, list (str)
+        Optional full paths of files and directories to exclude.
+        Excluded directories are not descended.
+    follow_links : bool
+        Optional. True to descend symlinks to directories. The default
+        value is False.
+    on_error : function
+        Optional function called with the OSError when a directory can
+        not be scanned. Raise the exception to stop walking. By default
+        errors are ignored.
+    is_stat : bool
+        Optional. True to obtain the status of each entry (without
+        following symlinks) in the scanning threads. The status is
+        cached in each os.DirEntry. The default value is False.
+
+    Yields:
+    : tuple (str, list (os.DirEntry), list (os.DirEntry))
+        The directory path, the directory entries, and the file entries.
+    """
+
+    exclude_paths = set(exclude_paths) if exclude_paths else set()
+
+    # The device and inode of descended directories. Only used when
+    # following symlinks.
+    visited = set()
+    if follow_links:
+        try:
+            status = os.stat(start_directory)
+            visited.add((status.st_dev, status.st_ino))
+        except OSError:
+            pass
+
+    def scan(directory_path):
+        directory_entries = []
+        file_entries = []
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.path in exclude_paths:
+                    continue
+                if is_stat:
+                    entry.stat(follow_symlinks=False)
+                try:
+                    is_directory = entry.is_dir()
+                except OSError:
+                    is_directory = False
+                if is_directory:
+                    directory_entries.append(entry)
+                else:
+                    file_entries.append(entry)
+        return directory_path, directory_entries, file_entries
+
+    def should_descend(entry):
+        if not entry.is_symlink():
+            if follow_links:
+                status = entry.stat()
+                visited.add((status.st_dev, status.st_ino))
+            return True
+        if not follow_links:
+            return False
+        try:
+            status = entry.stat()
+        except OSError:
+            return False
+        if (status.st_dev, status.st_ino) in visited:
+            return False
+        visited.add((status.st_dev, status.st_ino))
+        return True
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=SCAN_THREADS)
+    pending = {executor.submit(scan, start_directory)}
+    try:
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                try:
+                    directory_path, directory_entries, file_entries = future.result()
+                except OSError as exception:
+                    if on_error: on_error(exception)
+                    continue
+                for entry in directory_entries:
+                    if should_descend(entry):
+                        pending.add(executor.submit(scan, entry.path))
+                yield directory_path, directory_entries, file_entries
+    finally:
+        # Do not scan the remaining directories.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
 def directory_is_writable(directory):
     """
     Check if the directory is writable.
@@ -263,12 +684,10 @@ def get_directory_for_file(file_name, start_directory):
     logger.log_value(f'Find the directory for {file_name} in', start_directory)
 
     directory = ''
-    # Do not follow links because this may lead to a recursive loop.
-    # Do not use os.path.realpath(start_directory) because the found
-    # directory should be a sub-directory of the start directory path.
-    # for directory_path, directory_names, file_names in os.walk(start_directory, followlinks=True):
-    for directory_path, directory_names, file_names in os.walk(start_directory):
-        if file_name in file_names:
+    # Do not follow links, because the found directory should be a
+    # sub-directory of the start directory path.
+    for directory_path, directory_entries, file_entries in walk_tree(start_directory):
+        if any(entry.name == file_name for entry in file_entries):
             directory = directory_path
             break
 
@@ -291,10 +710,8 @@ def get_file_paths(start_directory):
     logger.log_value('Get full file paths in the directory', start_directory)
 
     file_paths = []
-    for directory_path, directory_names, file_names in os.walk(start_directory):
-        for file_name in file_names:
-            file_path = os.path.join(directory_path, file_name)
-            file_paths.append(file_path)
+    for directory_path, directory_entries, file_entries in walk_tree(start_directory):
+        file_paths.extend(entry.path for entry in file_entries)
 
     return file_paths
 
@@ -306,8 +723,9 @@ def get_relative_file_paths(start_directory, exclude_file_paths):
     Arguments:
     start_directory : str
         The full path of the directory.
-    exclude_file_paths : str
-        File paths that should be excluded from the result.
+    exclude_file_paths : list (str)
+        Full file paths that should be excluded from the result. If a
+        directory is excluded, all files under it are excluded.
 
     Returns:
     file_paths : list (str)
@@ -317,13 +735,8 @@ def get_relative_file_paths(start_directory, exclude_file_paths):
     logger.log_value('Get relative file paths in the directory', start_directory)
 
     file_paths = []
-    for directory_path, directory_names, file_names in os.walk(start_directory):
-        if directory_path not in exclude_file_paths:
-            for file_name in file_names:
-                file_path = os.path.join(directory_path, file_name)
-                if file_path not in exclude_file_paths:
-                    relative_file_path = os.path.relpath(file_path, start_directory)
-                    file_paths.append(relative_file_path)
+    for directory_path, directory_entries, file_entries in walk_tree(start_directory, exclude_file_paths):
+        file_paths.extend(os.path.relpath(entry.path, start_directory) for entry in file_entries)
 
     return file_paths
 
@@ -392,6 +805,31 @@ def get_file_system_type(file_path):
 
     logger.log_value('Get file system type', file_path)
 
+    # Read the file system type from the mount table, without spawning
+    # df. Fall back to df if the mount could not be found.
+    file_system_type = mount_table.get_file_system_type(file_path)
+    if not file_system_type:
+        return _get_file_system_type_using_df(file_path)
+    logger.log_value('The file system type is', file_system_type)
+
+    return file_system_type
+
+
+def _get_file_system_type_using_df(file_path):
+    """
+    Get the file system type of the directory or file using the df
+    command. Use this when the mount could not be found in the mount
+    table.
+
+    Arguments:
+    file_path : str
+        The full path of the directory or file.
+
+    Returns:
+    file_system_type : str
+        The file system type, or None if df failed.
+    """
+
     command = f'df --output=fstype "{file_path}"'
     result, exit_status, signal_status = execute_synchronous(command)
     file_system_type = None
@@ -665,10 +1103,20 @@ def read_yaml_file(file_path):
     logger.log_label('Read yaml file')
     logger.log_value('File path', file_path)
 
-    yaml_list = []
-    with open(file_path) as file:
-        yaml_list = yaml.safe_load(file)
-    return yaml_list
+    real_file_path = os.path.realpath(file_path)
+    file_status = os.stat(real_file_path)
+    cached = yaml_cache.get(real_file_path)
+    if cached and cached[0:2] == (file_status.st_mtime_ns, file_status.st_size):
+        logger.log_value('Use the cached yaml document', 'Yes')
+        yaml_list = cached[2]
+    else:
+        with open(real_file_path) as file:
+            yaml_list = yaml.load(file, Loader=YAML_LOADER)
+        yaml_cache[real_file_path] = (file_status.st_mtime_ns, file_status.st_size, yaml_list)
+
+    # Return a copy, so changes made by the caller do not affect the
+    # cached document.
+    return copy.deepcopy(yaml_list)
 
 
 def save_yaml_file(yaml_list, file_path):
@@ -688,21 +1136,22 @@ def save_yaml_file(yaml_list, file_path):
     logger.log_label('Save yaml file')
     logger.log_value('File path', file_path)
 
+    # Keep the order of the keys, instead of sorting them.
     with open(file_path, 'w') as file:
-        yaml.dump(yaml_list, file)
+        yaml.dump(yaml_list, file, Dumper=YAML_DUMPER, sort_keys=False, default_flow_style=False)
+
+    real_file_path = os.path.realpath(file_path)
+    file_status = os.stat(real_file_path)
+    yaml_cache[real_file_path] = (file_status.st_mtime_ns, file_status.st_size, copy.deepcopy(yaml_list))
 
 
 def find_files_with_pattern(file_name_pattern, start_directory, follow_links=False):
     r"""
     Recursively search files in the start directory that match the file
     name pattern, and return a list of matching file paths relative to
-    the start directory. If follow links is True, symlinks that do not
-    result in a recursive loop with their parent directory will also be
-    searched.
-
-    Warning: If follow links is True, recursive loops caused by symlinks
-    in sibling directories will cause this function to execute
-    indefinitely, crashing the application.
+    the start directory. If follow links is True, symlinks to
+    directories will also be searched. Each directory is only searched
+    once, so recursive symlinks do not cause a loop.
 
     Arguments:
     file_name_pattern : r-str
@@ -713,9 +1162,7 @@ def find_files_with_pattern(file_name_pattern, start_directory, follow_links=Fal
     follow_links : boolean
         True to follow symlinks.
         False to not follow symlinks.
-        A symlink to a directory will be searched only if it does not
-        result in a recursive loop with its parent directory. The
-        default value is False.
+        The default value is False.
 
     Returns:
     results : list
@@ -730,82 +1177,14 @@ def find_files_with_pattern(file_name_pattern, start_directory, follow_links=Fal
     logger.log_value('Search for file name pattern', file_name_pattern)
     logger.log_value('In directory', start_directory)
 
-    # Nested function (used below) to match the file name pattern.
-    def is_match(file_name):
-        """
-        Check if the file name matches the file name pattern.
-
-        Note: This function expects the file name pattern to be set
-        prior to invocation because filter() requires a function that
-        only takes a single argument.
-
-        Arguments:
-        file_name : str
-            The file name to check.
-
-        Returns:
-        : boolean
-            True if the file name matches the pattern.
-            False if the file name does not match the pattern.
-        """
-        return re.match(file_name_pattern, file_name)
+    pattern = re.compile(file_name_pattern)
 
     relative_file_paths = []
-    for directory_path, directory_names, file_names in os.walk(start_directory, followlinks=follow_links):
-
-        if follow_links:
-
-            # Nested function to ensure the directory file path is not a
-            # recursive symlink.
-            def is_not_recursive(directory_name):
-                """
-                Check if a file path is not a recursive symlink. A link
-                is recursive if the link's target is a parent ancestor
-                of the link. A link and its target have the same parent
-                ancestor if the real path (the target of the link) is
-                the same as the common path between the target and the
-                link.
-
-                Warning: This function only detects loops where a
-                symlink in a child directory points to a parent
-                directory, but it can not detect complex recursive loops
-                involving symlinks in sibling directories.
-
-                Note: This function expects the parent directory path to
-                be set prior to invocation because filter() requires a
-                function that only takes a single argument.
-
-                Arguments:
-                file_path : str
-                    The simlink file path to check.
-
-                Returns:
-                : boolean
-                    True if the file path is not a simlink.
-                    True if the file path is not a recursive simlink.
-                    False if the file path is a recursive simlink.
-                """
-                file_path = os.path.join(directory_path, directory_name)
-                if os.path.islink(file_path):
-                    real_path = os.path.realpath(file_path)
-                    common_path = os.path.commonpath([real_path, file_path])
-                    if real_path == common_path:
-                        return False
-                return True
-
-            # Remove recursive symlinks from the directory names list.
-            # The caller can modify the directory names list in-place
-            # (perhaps using del or slice assignment), and walk() will
-            # only recurse into the sub-directories whose names remain
-            # in the directory names list.
-            # (See https://docs.python.org/3/library/os.html#os.walk)
-            directory_names[:] = list(filter(is_not_recursive, directory_names))
-
+    for directory_path, directory_entries, file_entries in walk_tree(start_directory, follow_links=follow_links):
         # Select files that match the file name pattern.
-        for file_name in filter(is_match, file_names):
-            file_path = os.path.join(directory_path, file_name)
-            relative_file_path = os.path.relpath(file_path, start=start_directory)
-            relative_file_paths.append(relative_file_path)
+        for entry in file_entries:
+            if pattern.match(entry.name):
+                relative_file_paths.append(os.path.relpath(entry.path, start=start_directory))
 
     return relative_file_paths
 
@@ -860,6 +1239,41 @@ def file_contains_any_word(file_path, *words):
     return False
 
 
+def replace_text_as_root(edits):
+    """
+    Replace text in files as root, using a single privileged command.
+    Each search text is a regular expression matched against each line of
+    the file, and the replacement text is used literally. Files are
+    atomically replaced, keeping their owner and mode, and files whose
+    content would not change are not written.
+
+    Arguments:
+    edits : list (tuple (str, str, str))
+        The edits as a list of (file path, search text, replacement
+        text).
+
+    Returns:
+    result : str
+        The result of the process.
+    exit_status : int
+        The exit status of the process.
+    signal_status : int
+        The signal status of the process.
+    """
+
+    logger.log_value('Replace text in files', [file_path for file_path, _, _ in edits])
+
+    program = os.path.join(model.application.directory, 'commands', 'replace-text')
+    command = ['pkexec', program]
+    for file_path, search_text, replacement_text in edits:
+        command += [search_text, replacement_text, file_path]
+    result, exit_status, signal_status = execute_synchronous(command)
+    logger.log_value('The result is', result)
+    logger.log_value('The exit status, signal status is', f'{exit_status}, {signal_status}')
+
+    return result, exit_status, signal_status
+
+
 def replace_text_in_file(file_path, search_text, replacement_text):
     """
     This function is not used.
@@ -0,0 +1,373 @@
+#!/usr/bin/python3
+
+########################################################################
+#                                                                      #
+# helper.py                                                            #
+#                                                                      #
+# Copyright (C) 2020 PJ Singh <psingh.cubic@gmail.com>                 #
+#                                                                      #
+########################################################################
+
+########################################################################
+#                                                                      #
+# This file is part of Cubic - Custom Ubuntu ISO Creator.              #
+#                                                                      #
+# Cubic is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by #
+# the Free Software Foundation, either version 3 of the License, or    #
+# (at your option) any later version.                                  #
+#                                                                      #
+# Cubic is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of       #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the         #
+# GNU General Public License for more details.                         #
+#                                                                      #
+# You should have received a copy of the GNU General Public License    #
+# along with Cubic. If not, see <http://www.gnu.org/licenses/>.        #
+#                                                                      #
+########################################################################
+
+########################################################################
+# References
+########################################################################
+
+# https://pexpect.readthedocs.io/en/stable/api/pexpect.html#spawn-class
+
+########################################################################
+# Imports
+########################################################################
+
+import json
+import os
+import pexpect
+import re
+import threading
+import traceback
+
+from cubic.utilities import logger
+from cubic.utilities import model
+
+########################################################################
+# Global Variables & Constants
+########################################################################
+
+# The privileged helper is started once using pkexec, and is then used
+# to execute the following privileged commands for the rest of the
+# session. This avoids spawning a new pkexec process (and a polkit
+# authorization) for every privileged operation. Commands that are not
+# listed here are executed using pkexec as before.
+ROUTED_COMMANDS = [
+    'compress-root',
+    'copy-path',
+    'copy-paths',
+    'delete-path',
+    'extract-root',
+    'file-size',
+    'fingerprint-root',
+    'mount-iso',
+    'move-path',
+    'replace-text',
+    'unmount-iso',
+]
+
+# The prefix for all lines written by the helper itself.
+SENTINEL = '#cubic-helper#'
+
+# Pattern to match the line written when the helper is ready.
+READY_PATTERN = re.compile(rf'{SENTINEL} ready [0-9]+\r?\n')
+
+# The number of seconds to wait for the helper to start. This includes
+# the time the user may take to authenticate.
+START_TIMEOUT = 300
+
+# The number of seconds to wait for a cancelled job to exit.
+CANCEL_TIMEOUT = 30
+
+# The number of seconds between checks that the thread running the
+# current job is still alive, while waiting for the job to finish.
+WAIT_INTERVAL = 1
+
+# The helper process of type pexpect.pty_spawn.spawn.
+channel = None
+
+# Set to True if the helper could not be started, so subsequent
+# privileged commands are executed using pkexec without retrying.
+is_unavailable = False
+
+# The most recently submitted job.
+current_job = None
+
+# The number used to identify the next job.
+job_number = 0
+
+# Serialize starting the helper and submitting jobs.
+lock = threading.RLock()
+
+# Notified when a job finishes. The helper runs one job at a time, so a
+# job submitted while another thread's job is running waits for it.
+job_finished = threading.Condition(lock)
+
+########################################################################
+# Job Class
+########################################################################
+
+
+class Job:
+    """
+    A command running in the privileged helper. This class implements
+    the subset of the pexpect.pty_spawn.spawn interface used by the
+    processor and progressor modules, so a job can be used in place of
+    a process spawned using pkexec.
+    """
+
+    def __init__(self, number, command):
+
+        self.number = number
+        self.command = command
+        self.thread = threading.current_thread()
+        self.pid = channel.pid
+        self.exit_pattern = re.compile(rf'\r?\n{SENTINEL} exit {number} (-?[0-9]+|None) ([0-9]+|None)\r?\n')
+        self.before = ''
+        self.after = ''
+        self.match = None
+        self.exitstatus = None
+        self.signalstatus = None
+        self.is_finished = False
+
+    def _finish(self):
+
+        self.before = channel.before
+        self.after = ''
+        exit_status, signal_status = channel.match.groups()
+        self.exitstatus = None if exit_status == 'None' else int(exit_status)
+        self.signalstatus = None if signal_status == 'None' else int(signal_status)
+        self.is_finished = True
+        with lock:
+            job_finished.notify_all()
+
+    def expect(self, pattern, timeout=-1):
+        """
+        Wait for the pattern in the output of the command.
+
+        Arguments:
+        pattern : re.Pattern, list(re.Pattern)
+            The pattern, or list of patterns, to match.
+        timeout : int
+            Optional number of seconds to wait. The default value of -1
+            waits indefinitely.
+
+        Returns:
+        : int
+            The index of the matched pattern in the list, or 0 if a
+            single pattern was supplied.
+
+        Raises:
+        : pexpect.EOF
+            If the command exited before the pattern was found.
+        """
+
+        if self.is_finished:
+            raise pexpect.EOF('End Of File (EOF). The command has exited.')
+        patterns = pattern if isinstance(pattern, list) else [pattern]
+        index = channel.expect([self.exit_pattern] + patterns, timeout=None if timeout == -1 else timeout)
+        if index == 0:
+            self._finish()
+            raise pexpect.EOF('End Of File (EOF). The command has exited.')
+        self.before = channel.before
+        self.after = channel.after
+        self.match = channel.match
+        return index - 1
+
+    def read(self):
+        """
+        Read the output of the command until it exits.
+
+        Returns:
+        : str
+            The output of the command.
+        """
+
+        if self.is_finished:
+            return ''
+        channel.expect(self.exit_pattern, timeout=None)
+        self._finish()
+        return self.before
+
+    def isalive(self):
+
+        return not self.is_finished
+
+    def cancel(self):
+        """
+        Kill the command and its child processes.
+        """
+
+        if not self.is_finished:
+            _send({'cancel': self.number})
+
+    def close(self):
+        """
+        Wait for the command to exit, cancelling it if necessary, so its
+        output is consumed before the next job is submitted.
+        """
+
+        if not self.is_finished:
+            self.cancel()
+            try:
+                channel.expect(self.exit_pattern, timeout=CANCEL_TIMEOUT)
+                self._finish()
+            except pexpect.ExceptionPexpect as exception:
+                logger.log_value('Unable to close helper job', self.number)
+                logger.log_value('The exception is', exception)
+                stop()
+
+    def wait(self):
+
+        return self.exitstatus
+
+
+########################################################################
+# Helper Functions
+########################################################################
+
+
+def is_routable(command):
+    """
+    Check if the command can be executed by the privileged helper.
+
+    Arguments:
+    command : str, list(str)
+        The command as a string or a list.
+
+    Returns:
+    : bool
+        True if the command is a pkexec command for one of the routed
+        Cubic commands, False otherwise.
+    """
+
+    if is_unavailable or not isinstance(command, list) or len(command) < 2:
+        return False
+    if str(command[0]) != 'pkexec':
+        return False
+    program = str(command[1]).strip('"')
+    commands_directory = os.path.join(model.application.directory, 'commands')
+    return os.path.dirname(program) == commands_directory and os.path.basename(program) in ROUTED_COMMANDS
+
+
+def start():
+    """
+    Start the privileged helper, if it is not already running.
+
+    Returns:
+    : bool
+        True if the helper is running, False otherwise.
+    """
+
+    global channel
+    global is_unavailable
+
+    with lock:
+        if channel and channel.isalive():
+            return True
+        if is_unavailable:
+            return False
+
+        program = os.path.join(model.application.directory, 'commands', 'privileged-helper')
+        logger.log_value('Start the privileged helper', program)
+        try:
+            channel = pexpect.spawn('pkexec', args=[program], timeout=None, encoding='UTF-8', echo=False)
+            channel.expect(READY_PATTERN, timeout=START_TIMEOUT)
+            logger.log_value('The privileged helper process id is', channel.pid)
+            return True
+        except pexpect.ExceptionPexpect as exception:
+            logger.log_value('Unable to start the privileged helper', exception)
+            logger.log_value('The trace back is', traceback.format_exc())
+            if channel: channel.close(force=True)
+            channel = None
+            is_unavailable = True
+            return False
+
+
+def stop():
+    """
+    Stop the privileged helper, if it is running.
+    """
+
+    global channel
+    global current_job
+
+    with lock:
+        if channel and channel.isalive():
+            logger.log_value('Stop the privileged helper', channel.pid)
+            try:
+                _send({'quit': True})
+                channel.expect(pexpect.EOF, timeout=CANCEL_TIMEOUT)
+            except pexpect.ExceptionPexpect as exception:
+                logger.log_value('The exception is', exception)
+            channel.close(force=True)
+        channel = None
+        current_job = None
+        job_finished.notify_all()
+
+
+def submit(command, working_directory=None):
+    """
+    Execute the command using the privileged helper. The calling
+    function must read the output of the returned job until it exits,
+    in the same way as a process spawned using pexpect. If a job
+    submitted by another thread is running, wait for it to finish.
+
+    Arguments:
+    command : list(str)
+        The pkexec command, as accepted by is_routable().
+    working_directory : str
+        Optional working directory. The default value is None.
+
+    Returns:
+    : Job
+        The job, or None if the helper is not available.
+    """
+
+    global current_job
+    global job_number
+
+    with lock:
+        # Wait for a job running in another thread to finish, instead
+        # of cancelling it.
+        while current_job and not current_job.is_finished and current_job.thread is not threading.current_thread() and current_job.thread.is_alive():
+            job_finished.wait(WAIT_INTERVAL)
+
+        if not start():
+            return None
+
+        # Consume the output of the previous job, in case it was
+        # interrupted before it finished.
+        if current_job:
+            current_job.close()
+            if not channel:
+                return None
+
+        job_number += 1
+        current_job = Job(job_number, command)
+        request = {
+            'job': job_number,
+            'command': os.path.basename(str(command[1]).strip('"')),
+            'arguments': [str(argument) for argument in command[2:]],
+            'directory': working_directory,
+        }
+        _send(request)
+        logger.log_value('The privileged helper job is', job_number)
+
+        return current_job
+
+
+def _send(request):
+    """
+    Send a request to the privileged helper.
+
+    Arguments:
+    request : dict
+        The request.
+    """
+
+    channel.sendline(json.dumps(request))
@@ -0,0 +1,945 @@
+#!/usr/bin/python3
+
+########################################################################
+#                                                                      #
+# iso_reader.py                                                        #
+#                                                                      #
+# Copyright (C) 2020 PJ Singh <psingh.cubic@gmail.com>                 #
+#                                                                      #
+########################################################################
+
+########################################################################
+#                                                                      #
+# This file is part of Cubic - Custom Ubuntu ISO Creator.              #
+#                                                                      #
+# Cubic is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by #
+# the Free Software Foundation, either version 3 of the License, or    #
+# (at your option) any later version.                                  #
+#                                                                      #
+# Cubic is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of       #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the         #
+# GNU General Public License for more details.                         #
+#                                                                      #
+# You should have received a copy of the GNU General Public License    #
+# along with Cubic. If not, see <http://www.gnu.org/licenses/>.        #
+#                                                                      #
+########################################################################
+
+########################################################################
+# References
+########################################################################
+
+# https://wiki.osdev.org/ISO_9660
+# https://www.ecma-international.org/publications-and-standards/standards/ecma-119/
+# https://pdos.csail.mit.edu/6.828/2014/readings/boot-cdrom.pdf (El Torito)
+# https://en.wikipedia.org/wiki/Joliet_(file_system)
+# https://en.wikipedia.org/wiki/Rock_Ridge
+# https://en.wikipedia.org/wiki/GUID_Partition_Table
+# https://en.wikipedia.org/wiki/Master_boot_record
+
+########################################################################
+# Imports
+########################################################################
+
+import collections
+import mmap
+import stat
+import struct
+
+########################################################################
+# Global Variables & Constants
+########################################################################
+
+# The ISO 9660 sector size. The system area (16 sectors) precedes the
+# volume descriptors.
+SECTOR_SIZE = 2048
+SYSTEM_AREA_SECTORS = 16
+
+# Volume descriptor types.
+BOOT_RECORD = 0
+PRIMARY_VOLUME_DESCRIPTOR = 1
+SUPPLEMENTARY_VOLUME_DESCRIPTOR = 2
+VOLUME_PARTITION_DESCRIPTOR = 3
+VOLUME_DESCRIPTOR_SET_TERMINATOR = 255
+
+# Joliet escape sequences for UCS-2 level 1, 2, and 3.
+JOLIET_ESCAPE_SEQUENCES = (b'%/@', b'%/C', b'%/E')
+
+# The El Torito boot system identifier.
+EL_TORITO_ID = b'EL TORITO SPECIFICATION'
+
+# Directory record flags.
+FLAG_HIDDEN = 0x01
+FLAG_DIRECTORY = 0x02
+FLAG_MULTI_EXTENT = 0x80
+
+# The size of a sector in El Torito sector counts and partition tables.
+VIRTUAL_SECTOR_SIZE = 512
+
+# El Torito platform ids.
+PLATFORMS = {0x00: 'x86', 0x01: 'PowerPC', 0x02: 'Mac', 0xEF: 'EFI'}
+
+# An entry in a directory of the ISO.
+# • name - The file name (Rock Ridge, Joliet, or ISO 9660 name).
+# • path - The absolute path in the ISO.
+# • is_directory - True if the entry is a directory.
+# • mode - The Rock Ridge POSIX file mode, or a default mode.
+# • size - The size in bytes.
+# • extents - A tuple of (byte offset, byte count) in the ISO file.
+# • link_target - The Rock Ridge symlink target, or None.
+IsoEntry = collections.namedtuple('IsoEntry', 'name path is_directory mode size extents link_target')
+
+# An El Torito boot catalog entry.
+# • platform - The platform name, such as x86 or EFI.
+# • is_bootable - True if the entry is bootable.
+# • media_type - The emulation type (0 = no emulation).
+# • load_segment - The load segment, for x86.
+# • system_type - The partition type of the image, for hard disk
+#   emulation.
+# • sector_count - The number of 512 byte sectors to load.
+# • offset - The byte offset of the boot image in the ISO file.
+BootEntry = collections.namedtuple('BootEntry', 'platform is_bootable media_type load_segment system_type sector_count offset')
+
+# A partition in the MBR or GPT partition table of a hybrid ISO.
+# • table - Either "mbr" or "gpt".
+# • number - The partition number, starting at 1.
+# • type - The MBR partition type (int) or GPT type GUID (str).
+# • offset - The byte offset of the partition in the ISO file.
+# • size - The size of the partition in bytes.
+# • name - The GPT partition name, or an empty string.
+# • is_bootable - True if the MBR bootable flag is set.
+Partition = collections.namedtuple('Partition', 'table number type offset size name is_bootable')
+
+########################################################################
+# ISO Image Class
+########################################################################
+
+
+class IsoImage:
+    """
+    Read-only access to an ISO 9660 image, with support for Joliet and
+    Rock Ridge names, El Torito boot catalogs, and MBR and GPT partition
+    tables of hybrid ISOs. The ISO file is memory mapped, so reading
+    metadata and file contents does not require mounting the ISO or
+    spawning another process, and file contents can be accessed without
+    copying them using get_file_view().
+
+    Use as a context manager, or call close() when done:
+
+        with iso_reader.IsoImage(iso_file_path) as iso_image:
+            volume_id = iso_image.volume_id
+            for entry in iso_image.list_directory('/casper'):
+                ...
+    """
+
+    # ------------------------------------------------------------------
+    # Initialize Methods
+    # ------------------------------------------------------------------
+
+    def __init__(self, file_path):
+        """
+        Open the ISO image and read its volume descriptors.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        file_path : str
+            The full path of the ISO file.
+
+        Raises:
+        : OSError
+            If the file can not be read.
+        : ValueError
+            If the file is not an ISO 9660 image.
+        """
+
+        self.file_path = file_path
+        self.file = open(file_path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f'The file is empty: {file_path}')
+        self.size = len(self.map)
+
+        # Volume descriptors.
+        self.primary = None
+        self.joliet = None
+        self.boot_catalog_offset = None
+        self._read_volume_descriptors()
+
+        # Determine the names to use: Rock Ridge, Joliet, or ISO 9660.
+        self.block_size = self.primary['logical_block_size']
+        self.rock_ridge_skip = self._detect_rock_ridge()
+        self.is_rock_ridge = self.rock_ridge_skip is not None
+        self.is_joliet = bool(self.joliet)
+        if self.is_rock_ridge or not self.is_joliet:
+            self._root = self.primary['root']
+            self._is_joliet_names = False
+        else:
+            self._root = self.joliet['root']
+            self._is_joliet_names = True
+
+        self._directory_cache = {}
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+
+        self.close()
+
+    def close(self):
+        """
+        Close the ISO image. Views returned by get_file_view() must be
+        released before closing the image.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        """
+
+        self._directory_cache = {}
+        self.map.close()
+        self.file.close()
+
+    # ------------------------------------------------------------------
+    # Volume Descriptor Methods
+    # ------------------------------------------------------------------
+
+    @property
+    def volume_id(self):
+        """
+        The volume id of the primary volume descriptor, as reported by
+        "isoinfo -d".
+        """
+
+        return self.primary['volume_id']
+
+    def _read_volume_descriptors(self):
+        """
+        Read the volume descriptors, starting after the system area,
+        until the volume descriptor set terminator.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+
+        Raises:
+        : ValueError
+            If there is no primary volume descriptor.
+        """
+
+        sector = SYSTEM_AREA_SECTORS
+        while (sector + 1) * SECTOR_SIZE <= self.size:
+            offset = sector * SECTOR_SIZE
+            descriptor = self.map[offset:offset + SECTOR_SIZE]
+            if descriptor[1:6] != b'CD001':
+                break
+            descriptor_type = descriptor[0]
+            if descriptor_type == VOLUME_DESCRIPTOR_SET_TERMINATOR:
+                break
+            if descriptor_type == PRIMARY_VOLUME_DESCRIPTOR and not self.primary:
+                self.primary = self._parse_volume_descriptor(descriptor, False)
+            elif descriptor_type == SUPPLEMENTARY_VOLUME_DESCRIPTOR and descriptor[88:91] in JOLIET_ESCAPE_SEQUENCES:
+                self.joliet = self._parse_volume_descriptor(descriptor, True)
+            elif descriptor_type == BOOT_RECORD and descriptor[7:7 + len(EL_TORITO_ID)] == EL_TORITO_ID:
+                self.boot_catalog_offset = _le32(descriptor, 71) * SECTOR_SIZE
+            sector += 1
+
+        if not self.primary:
+            self.close()
+            raise ValueError(f'The file is not an ISO 9660 image: {self.file_path}')
+
+    def _parse_volume_descriptor(self, descriptor, is_joliet):
+        """
+        Parse a primary or supplementary volume descriptor.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        descriptor : bytes
+            The volume descriptor.
+        is_joliet : bool
+            True if the strings are encoded as UCS-2.
+
+        Returns:
+        : dict
+            The volume descriptor fields.
+        """
+
+        def text(start, length):
+            value = descriptor[start:start + length]
+            if is_joliet:
+                return value.decode('utf-16-be', 'replace').rstrip(' \x00')
+            return value.decode('ascii', 'replace').rstrip(' \x00')
+
+        return {
+            'system_id': text(8, 32),
+            'volume_id': text(40, 32),
+            'volume_space_size': _le32(descriptor, 80),
+            'logical_block_size': _le16(descriptor, 128),
+            'volume_set_id': text(190, 128),
+            'publisher_id': text(318, 128),
+            'preparer_id': text(446, 128),
+            'application_id': text(574, 128),
+            'creation_date': descriptor[813:829].decode('ascii', 'replace'),
+            'modification_date': descriptor[830:846].decode('ascii', 'replace'),
+            'root': _parse_record(descriptor[156:190]),
+        }
+
+    # ------------------------------------------------------------------
+    # Directory Methods
+    # ------------------------------------------------------------------
+
+    def list_directory(self, path='/'):
+        """
+        List the entries in a directory of the ISO, excluding "." and
+        "..".
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        path : str
+            The absolute path of the directory in the ISO.
+
+        Returns:
+        : list (IsoEntry)
+            The entries in the directory.
+
+        Raises:
+        : FileNotFoundError
+            If the directory does not exist.
+        : NotADirectoryError
+            If the path is not a directory.
+        """
+
+        path = _normalize_path(path)
+        if path in self._directory_cache:
+            return self._directory_cache[path]
+
+        if path == '/':
+            entry = self._make_entry('', '/', [self._root])
+        else:
+            entry = self.get_entry(path)
+            if not entry:
+                raise FileNotFoundError(f'No such directory in the ISO: {path}')
+        if not entry.is_directory:
+            raise NotADirectoryError(f'Not a directory in the ISO: {path}')
+
+        offset, length = entry.extents[0]
+        entries = []
+        records = []
+        for record in self._read_records(offset, length):
+            if record['name'] in (b'\x00', b'\x01'):
+                continue
+            if record.get('is_relocated'):
+                continue
+            records.append(record)
+            if record['flags'] & FLAG_MULTI_EXTENT:
+                # The file continues in the next record.
+                continue
+            name = self._get_name(records[0])
+            entries.append(self._make_entry(name, _join(path, name), records))
+            records = []
+
+        self._directory_cache[path] = entries
+
+        return entries
+
+    def get_entry(self, path):
+        """
+        Get the entry for a path in the ISO. Symlinks are not followed.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        path : str
+            The absolute path in the ISO.
+
+        Returns:
+        : IsoEntry
+            The entry, or None if it does not exist.
+        """
+
+        path = _normalize_path(path)
+        if path == '/':
+            return self._make_entry('', '/', [self._root])
+
+        directory_path, name = path.rsplit('/', 1)
+        try:
+            entries = self.list_directory(directory_path or '/')
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        for entry in entries:
+            if entry.name == name:
+                return entry
+
+        return None
+
+    def exists(self, path):
+        """
+        Check if a path exists in the ISO.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        path : str
+            The absolute path in the ISO.
+
+        Returns:
+        : bool
+            True if the path exists, False otherwise.
+        """
+
+        return self.get_entry(path) is not None
+
+    def walk(self, path='/'):
+        """
+        Walk the directory tree of the ISO, in the same way as os.walk().
+        Symlinks to directories are not descended.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        path : str
+            The absolute path of the directory in the ISO.
+
+        Yields:
+        : tuple (str, list (str), list (str))
+            The directory path, the directory names, and the file names.
+        """
+
+        entries = self.list_directory(path)
+        directory_names = [entry.name for entry in entries if entry.is_directory]
+        file_names = [entry.name for entry in entries if not entry.is_directory]
+        yield _normalize_path(path), directory_names, file_names
+        for directory_name in directory_names:
+            yield from self.walk(_join(_normalize_path(path), directory_name))
+
+    def _read_records(self, offset, length):
+        """
+        Read the directory records in a directory extent. Records do not
+        span sectors; the remainder of a sector is padded with zeros.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        offset : int
+            The byte offset of the directory extent.
+        length : int
+            The length of the directory extent.
+
+        Yields:
+        : dict
+            The parsed directory records.
+        """
+
+        position = offset
+        end = min(offset + length, self.size)
+        while position < end:
+            record_length = self.map[position]
+            if record_length == 0:
+                # Skip to the next sector.
+                position = (position // SECTOR_SIZE + 1) * SECTOR_SIZE
+                continue
+            record = _parse_record(self.map[position:position + record_length])
+            if self.is_rock_ridge and not self._is_joliet_names:
+                self._parse_rock_ridge(record)
+            yield record
+            position += record_length
+
+    def _get_name(self, record):
+        """
+        Get the name for a directory record, preferring the Rock Ridge
+        name, then the Joliet name, then the ISO 9660 name. ISO 9660
+        names are converted the same way as the Linux kernel does, by
+        removing the version number and converting to lower case.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        record : dict
+            The parsed directory record.
+
+        Returns:
+        : str
+            The name.
+        """
+
+        if record.get('rock_ridge_name') is not None:
+            return record['rock_ridge_name']
+
+        name = record['name']
+        if self._is_joliet_names:
+            name = name.decode('utf-16-be', 'replace')
+        else:
+            name = name.decode('ascii', 'replace').lower()
+        if not record['flags'] & FLAG_DIRECTORY:
+            name = name.split(';')[0]
+            if name.endswith('.'):
+                name = name[:-1]
+
+        return name
+
+    def _make_entry(self, name, path, records):
+        """
+        Create an entry from one or more directory records.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        name : str
+            The name of the entry.
+        path : str
+            The absolute path of the entry in the ISO.
+        records : list (dict)
+            The directory records of the entry. Files larger than 4 GiB
+            use multiple records, one for each extent.
+
+        Returns:
+        : IsoEntry
+            The entry.
+        """
+
+        record = records[0]
+        extents = tuple((self._get_location(item), item['size']) for item in records)
+        is_directory = bool(record['flags'] & FLAG_DIRECTORY) or record.get('child_location') is not None
+        if record.get('child_location') is not None:
+            # A relocated directory (Rock Ridge CL entry).
+            child_location = record['child_location'] * self.block_size
+            child = next(self._read_records(child_location, SECTOR_SIZE))
+            extents = ((child_location, child['size']),)
+        mode = record.get('mode')
+        if mode is None:
+            mode = (stat.S_IFDIR | 0o555) if is_directory else (stat.S_IFREG | 0o444)
+        link_target = record.get('link_target')
+        if link_target is not None:
+            is_directory = False
+
+        return IsoEntry(name, path, is_directory, mode, sum(size for _, size in extents), extents, link_target)
+
+    def _get_location(self, record):
+
+        return (record['location'] + record['extended_attribute_length']) * self.block_size
+
+    # ------------------------------------------------------------------
+    # Rock Ridge Methods
+    # ------------------------------------------------------------------
+
+    def _detect_rock_ridge(self):
+        """
+        Check if the primary volume uses Rock Ridge extensions, by
+        looking for the SUSP "SP" entry in the "." record of the root
+        directory.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+
+        Returns:
+        : int
+            The number of bytes to skip at the start of each system use
+            area, or None if Rock Ridge is not used.
+        """
+
+        root = self.primary['root']
+        offset = self._get_location(root) if self.block_size else root['location'] * SECTOR_SIZE
+        length = self.map[offset] if offset < self.size else 0
+        if not length:
+            return None
+        record = _parse_record(self.map[offset:offset + length])
+        system_use = record['system_use']
+        if system_use[0:2] == b'SP' and system_use[4:6] == b'\xbe\xef':
+            return system_use[6]
+
+        return None
+
+    def _parse_rock_ridge(self, record):
+        """
+        Parse the Rock Ridge entries in the system use area of a
+        directory record, and add the name, mode, symlink target, and
+        relocation information to the record.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        record : dict
+            The parsed directory record.
+        """
+
+        name_parts = []
+        link_components = []
+        link_component = ''
+        areas = [record['system_use'][self.rock_ridge_skip:]]
+        while areas:
+            area = areas.pop(0)
+            position = 0
+            while position + 4 <= len(area):
+                signature = area[position:position + 2]
+                length = area[position + 2]
+                if length < 4:
+                    break
+                data = area[position + 4:position + length]
+                if signature == b'NM':
+                    flags = data[0]
+                    if flags & 0x02:
+                        name_parts.append('.')
+                    elif flags & 0x04:
+                        name_parts.append('..')
+                    else:
+                        name_parts.append(data[1:].decode('utf-8', 'surrogateescape'))
+                elif signature == b'PX':
+                    record['mode'] = _le32(data, 0)
+                elif signature == b'SL':
+                    index = 1
+                    while index + 2 <= len(data):
+                        component_flags = data[index]
+                        component_length = data[index + 1]
+                        content = data[index + 2:index + 2 + component_length].decode('utf-8', 'surrogateescape')
+                        if component_flags & 0x02:
+                            content = '.'
+                        elif component_flags & 0x04:
+                            content = '..'
+                        elif component_flags & 0x08:
+                            content = ''
+                            if not link_components and not link_component:
+                                link_components.append('')
+                        link_component += content
+                        if not component_flags & 0x01:
+                            link_components.append(link_component)
+                            link_component = ''
+                        index += 2 + component_length
+                    record['link_target'] = '/'.join(link_components) or '/'
+                elif signature == b'CE':
+                    # The system use area continues elsewhere.
+                    location = _le32(data, 0) * self.block_size + _le32(data, 8)
+                    areas.append(self.map[location:location + _le32(data, 16)])
+                elif signature == b'RE':
+                    record['is_relocated'] = True
+                elif signature == b'CL':
+                    record['child_location'] = _le32(data, 0)
+                elif signature == b'ST':
+                    break
+                position += length
+
+        if name_parts:
+            record['rock_ridge_name'] = ''.join(name_parts)
+
+    # ------------------------------------------------------------------
+    # File Methods
+    # ------------------------------------------------------------------
+
+    def get_extents(self, path):
+        """
+        Get the byte ranges of a file in the ISO file.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        path : str
+            The absolute path of the file in the ISO.
+
+        Returns:
+        : tuple (tuple (int, int))
+            The byte offset and byte count of each extent.
+
+        Raises:
+        : FileNotFoundError
+            If the file does not exist.
+        """
+
+        entry = self.get_entry(path)
+        if not entry:
+            raise FileNotFoundError(f'No such file in the ISO: {path}')
+
+        return entry.extents
+
+    def get_file_view(self, path):
+        """
+        Get a read-only view of the contents of a file, without copying
+        it. Release the view before closing the ISO image.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        path : str
+            The absolute path of the file in the ISO.
+
+        Returns:
+        : memoryview
+            The contents of the file.
+
+        Raises:
+        : FileNotFoundError
+            If the file does not exist.
+        : ValueError
+            If the file is stored in multiple extents. Use read_file()
+            instead.
+        """
+
+        extents = self.get_extents(path)
+        if len(extents) > 1:
+            raise ValueError(f'The file is stored in multiple extents: {path}')
+        offset, size = extents[0]
+
+        return memoryview(self.map)[offset:offset + size]
+
+    def read_file(self, path):
+        """
+        Read the contents of a file.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+        path : str
+            The absolute path of the file in the ISO.
+
+        Returns:
+        : bytes
+            The contents of the file.
+
+        Raises:
+        : FileNotFoundError
+            If the file does not exist.
+        """
+
+        return b''.join(self.map[offset:offset + size] for offset, size in self.get_extents(path))
+
+    # ------------------------------------------------------------------
+    # Boot Methods
+    # ------------------------------------------------------------------
+
+    def get_boot_entries(self):
+        """
+        Get the entries in the El Torito boot catalog.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+
+        Returns:
+        : list (BootEntry)
+            The boot entries, starting with the default entry. The list
+            is empty if the ISO is not bootable.
+        """
+
+        if self.boot_catalog_offset is None:
+            return []
+
+        catalog = self.map[self.boot_catalog_offset:self.boot_catalog_offset + SECTOR_SIZE]
+
+        # Check the validation entry.
+        if catalog[0] != 0x01 or catalog[30:32] != b'\x55\xaa':
+            return []
+
+        boot_entries = [_parse_boot_entry(catalog[32:64], catalog[1])]
+        position = 64
+        while position + 32 <= len(catalog):
+            header = catalog[position:position + 32]
+            if header[0] not in (0x90, 0x91):
+                break
+            platform = header[1]
+            count = _le16(header, 2)
+            position += 32
+            for index in range(count):
+                entry = catalog[position:position + 32]
+                position += 32
+                # Skip extension entries.
+                while position + 32 <= len(catalog) and catalog[position] == 0x44:
+                    position += 32
+                boot_entries.append(_parse_boot_entry(entry, platform))
+            if header[0] == 0x91:
+                break
+
+        return boot_entries
+
+    def get_partitions(self):
+        """
+        Get the partitions in the MBR and GPT partition tables of a
+        hybrid ISO.
+
+        Arguments:
+        self : IsoImage
+            The IsoImage.
+
+        Returns:
+        : list (Partition)
+            The partitions. The list is empty if the ISO has no
+            partition table.
+        """
+
+        partitions = []
+
+        # Master boot record.
+        if self.size >= VIRTUAL_SECTOR_SIZE and self.map[510:512] == b'\x55\xaa':
+            for number in range(4):
+                entry = self.map[446 + 16 * number:446 + 16 * (number + 1)]
+                partition_type = entry[4]
+                start = _le32(entry, 8)
+                count = _le32(entry, 12)
+                if partition_type and count:
+                    partitions.append(Partition('mbr',
+                                                number + 1,
+                                                partition_type,
+                                                start * VIRTUAL_SECTOR_SIZE,
+                                                count * VIRTUAL_SECTOR_SIZE,
+                                                '',
+                                                entry[0] == 0x80))
+
+        # GUID partition table.
+        header = self.map[VIRTUAL_SECTOR_SIZE:2 * VIRTUAL_SECTOR_SIZE]
+        if header[0:8] == b'EFI PART':
+            entries_offset = _le64(header, 72) * VIRTUAL_SECTOR_SIZE
+            count = _le32(header, 80)
+            entry_size = _le32(header, 84)
+            for number in range(count):
+                offset = entries_offset + number * entry_size
+                entry = self.map[offset:offset + entry_size]
+                if len(entry) < 128 or entry[0:16] == bytes(16):
+                    continue
+                first = _le64(entry, 32)
+                last = _le64(entry, 40)
+                name = entry[56:128].decode('utf-16-le', 'replace').rstrip('\x00')
+                partitions.append(Partition('gpt',
+                                            number + 1,
+                                            _format_guid(entry[0:16]),
+                                            first * VIRTUAL_SECTOR_SIZE,
+                                            (last - first + 1) * VIRTUAL_SECTOR_SIZE,
+                                            name,
+                                            False))
+
+        return partitions
+
+
+########################################################################
+# Convenience Functions
+########################################################################
+
+
+def get_volume_id(iso_file_path):
+    """
+    Get the volume id of an ISO image.
+
+    Arguments:
+    iso_file_path : str
+        The full path of the ISO file.
+
+    Returns:
+    : str
+        The volume id.
+
+    Raises:
+    : OSError
+        If the file can not be read.
+    : ValueError
+        If the file is not an ISO 9660 image.
+    """
+
+    with IsoImage(iso_file_path) as iso_image:
+        return iso_image.volume_id
+
+
+########################################################################
+# Support Functions
+########################################################################
+
+
+def _le16(data, offset):
+
+    return struct.unpack_from('<H', data, offset)[0]
+
+
+def _le32(data, offset):
+
+    return struct.unpack_from('<I', data, offset)[0]
+
+
+def _le64(data, offset):
+
+    return struct.unpack_from('<Q', data, offset)[0]
+
+
+def _parse_record(data):
+    """
+    Parse an ISO 9660 directory record.
+
+    Arguments:
+    data : bytes
+        The directory record.
+
+    Returns:
+    : dict
+        The directory record fields.
+    """
+
+    name_length = data[32]
+    name = bytes(data[33:33 + name_length])
+    # The name is padded to an even length.
+    system_use_offset = 33 + name_length + (0 if name_length % 2 else 1)
+
+    return {
+        'extended_attribute_length': data[1],
+        'location': _le32(data, 2),
+        'size': _le32(data, 10),
+        'flags': data[25],
+        'name': name,
+        'system_use': bytes(data[system_use_offset:data[0]]),
+    }
+
+
+def _parse_boot_entry(entry, platform):
+    """
+    Parse an El Torito boot catalog entry.
+
+    Arguments:
+    entry : bytes
+        The 32 byte boot entry.
+    platform : int
+        The platform id from the validation entry or section header.
+
+    Returns:
+    : BootEntry
+        The boot entry.
+    """
+
+    return BootEntry(PLATFORMS.get(platform, hex(platform)),
+                     entry[0] == 0x88,
+                     entry[1] & 0x0F,
+                     _le16(entry, 2),
+                     entry[4],
+                     _le16(entry, 6),
+                     _le32(entry, 8) * SECTOR_SIZE)
+
+
+def _format_guid(data):
+    """
+    Format a mixed endian GUID as a string.
+
+    Arguments:
+    data : bytes
+        The 16 byte GUID.
+
+    Returns:
+    : str
+        The GUID, such as C12A7328-F81F-11D2-BA4B-00A0C93EC93B.
+    """
+
+    part_1, part_2, part_3 = struct.unpack_from('<IHH', data, 0)
+
+    return f'{part_1:08X}-{part_2:04X}-{part_3:04X}-{data[8:10].hex().upper()}-{data[10:16].hex().upper()}'
+
+
+def _normalize_path(path):
+
+    path = '/' + '/'.join(part for part in path.split('/') if part and part != '.')
+
+    return path
+
+
+def _join(directory_path, name):
+
+    return f'{directory_path.rstrip("/")}/{name}'
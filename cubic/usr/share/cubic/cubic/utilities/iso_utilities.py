@@ -40,20 +40,49 @@
 # Imports
 ########################################################################
 
+import concurrent.futures
+import errno
+import glob
+import hashlib
 import os
 import re
+import shutil
 
 from cubic.constants import MULTIPLES, IMAGE_FILE_NAME
+from cubic.utilities import configuration
 from cubic.utilities import file_utilities
+from cubic.utilities import iso_reader
 from cubic.utilities import logger
 from cubic.utilities import model
+from cubic.utilities import mount_table
 from cubic.utilities.processor import execute_synchronous
 
 ########################################################################
 # Global Variables & Constants
 ########################################################################
 
-# N/A
+# The directory, relative to the application configuration directory,
+# used to store the analysis of original ISOs.
+ISO_ANALYSIS_DIRECTORY = 'iso-analysis'
+
+# The file name of the ISO analysis configuration.
+ISO_ANALYSIS_FILE_NAME = 'analysis.conf'
+
+# The number and size of samples read from the ISO to identify it.
+SAMPLE_COUNT = 16
+SAMPLE_SIZE = 65536
+
+# The maximum number of bytes copied per system call when extracting
+# partition images from the original ISO.
+COPY_CHUNK_SIZE = 2**26
+
+# The maximum number of partition images extracted concurrently.
+EXTRACT_THREADS = 4
+
+# The partition images to extract from the original ISO, collected while
+# generating the ISO template. Each job is a tuple of arguments for
+# extract_image().
+extract_image_jobs = []
 
 ########################################################################
 # Disk Mount / Unmount
@@ -128,6 +157,17 @@ def _is_mounted_1(iso_mount_point, iso_file_path):
         iso_file_path = real_iso_file_path
         logger.log_value('The ISO file path is a link to', iso_file_path)
 
+    # Check the mount table and the loop device backing file, without
+    # spawning the mount command.
+    is_mounted = mount_table.is_mounted(iso_mount_point, iso_file_path)
+
+    logger.log_value('Is mounted?', is_mounted)
+
+    return is_mounted
+
+
+def _is_mounted_1_ORIGINAL(iso_mount_point, iso_file_path):
+
     command = 'mount'
     result, exit_status, signal_status = execute_synchronous(command)
     is_mounted = False
@@ -193,7 +233,33 @@ def get_iso_volume_id(iso_file_path):
     logger.log_label('Get ISO image volume id')
     logger.log_value('ISO image', iso_file_path)
 
-    # Get the original ISO image volume id.
+    # Read the volume id from the primary volume descriptor, without
+    # spawning isoinfo. Fall back to isoinfo if the ISO can not be read.
+    try:
+        iso_volume_id = iso_reader.get_volume_id(iso_file_path)[:32]
+    except (OSError, ValueError) as exception:
+        logger.log_value('Unable to read the ISO image volume id', exception)
+        return _get_iso_volume_id_using_isoinfo(iso_file_path)
+    logger.log_value('ISO image volume id', iso_volume_id)
+
+    return iso_volume_id
+
+
+def _get_iso_volume_id_using_isoinfo(iso_file_path):
+    """
+    Get the volume id of the ISO image using the isoinfo command. Use
+    this when the primary volume descriptor could not be read directly.
+
+    Arguments:
+    iso_file_path : str
+        The full path of the ISO image.
+
+    Returns:
+    iso_volume_id : str
+        The volume id, truncated to 32 characters, or an empty string if
+        isoinfo failed.
+    """
+
     command = f'isoinfo -d -i "{iso_file_path}"'
     result, exit_status, signal_status = execute_synchronous(command)
     # iso_volume_id = 'Unknown ISO image volume id'
@@ -205,6 +271,47 @@ def get_iso_volume_id(iso_file_path):
     return iso_volume_id
 
 
+def get_iso_file_offset(iso_file_path, file_path):
+    """
+    Get the byte offset of a file inside the ISO file, so the file can be
+    read directly from the ISO file without mounting it.
+
+    Arguments:
+    iso_file_path : str
+        The full path of the ISO file.
+    file_path : str
+        The path of the file in the ISO, relative to the ISO root.
+
+    Returns:
+    : int
+        The byte offset of the file in the ISO file, or None if the file
+        was not found or is not stored in a single contiguous extent.
+    """
+
+    logger.log_label('Get the offset of a file in the ISO image')
+    logger.log_value('ISO image', iso_file_path)
+    logger.log_value('File path', file_path)
+
+    try:
+        with iso_reader.IsoImage(iso_file_path) as iso_image:
+            entry = iso_image.get_entry(file_path)
+    except (OSError, ValueError) as exception:
+        logger.log_value('Unable to read the ISO image', exception)
+        return None
+
+    if not entry or entry.is_directory or entry.link_target is not None:
+        logger.log_value('The file offset is', 'Not found')
+        return None
+    if len(entry.extents) > 1:
+        logger.log_value('The file offset is', f'Not available; the file has {len(entry.extents)} extents')
+        return None
+
+    offset = entry.extents[0][0]
+    logger.log_value('The file offset is', offset)
+
+    return offset
+
+
 def get_iso_release_name(iso_mount_point):
 
     logger.log_label('Get ISO image release name')
@@ -367,6 +474,9 @@ def generate_iso_template(iso_report):
     global image_number
     image_number = 0
 
+    # Reset the partition images to extract.
+    extract_image_jobs.clear()
+
     template = ''
     lines = iso_report.split(os.linesep)
     for line in lines:
@@ -391,6 +501,10 @@ def generate_iso_template(iso_report):
         # Append the new line to the template.
         if line: template = template + line + os.linesep
 
+    # Extract the partition images referenced by the template.
+    is_error = extract_images(extract_image_jobs)
+    if is_error: return None
+
     return template
 
 
@@ -505,11 +619,9 @@ def handle_interval_path(line):
         # Get the ISO partition image file path.
         image_file_path = os.path.join(model.project.directory, image_file_name)
 
-        # Create the ISO partition image file.
-        is_error = extract_image(iso_file_path, image_file_path, block_size, start_block, block_count)
-
-        # Return if error.
-        if is_error: return True, line
+        # Create the ISO partition image file. The partition images are
+        # extracted concurrently, once the template has been generated.
+        extract_image_jobs.append((iso_file_path, image_file_path, block_size, start_block, block_count))
 
         # Create a new interval in units of "d" (512).
         # start_block = 0
@@ -661,7 +773,99 @@ def handle_part_like_isohybrid_ALTERNATIVE(line):
     return False, line
 
 
-def extract_image(iso_file_path, imgage_file_path, block_size, skip_blocks, block_count):
+def extract_images(jobs):
+    """
+    Extract partition images from the original ISO concurrently.
+
+    Arguments:
+    jobs : list (tuple)
+        The arguments for extract_image() for each image.
+
+    Returns:
+    : bool
+        True if any image could not be extracted, False otherwise.
+    """
+
+    if not jobs: return False
+
+    logger.log_value('The number of images to extract is', len(jobs))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(EXTRACT_THREADS, len(jobs))) as executor:
+        futures = [executor.submit(extract_image, *job, True) for job in jobs]
+        results = [future.result() for future in futures]
+
+    return any(results)
+
+
+def extract_image(iso_file_path, imgage_file_path, block_size, skip_blocks, block_count, is_verify=False):
+    """
+    Copy a range of blocks from the ISO to an image file, in the same way
+    as "dd bs=<block size> skip=<skip blocks> count=<block count>". The
+    copy is done in the kernel using copy_file_range() (or sendfile() or
+    pread() as fallbacks) in large chunks, and holes in the source range
+    remain holes in the image file.
+
+    Arguments:
+    iso_file_path : str
+        The full path of the ISO file.
+    imgage_file_path : str
+        The full path of the image file to create.
+    block_size : int
+        The block size in bytes.
+    skip_blocks : int
+        The number of blocks to skip at the start of the ISO file.
+    block_count : int
+        The number of blocks to copy.
+    is_verify : bool
+        Optional. Compare the MD5 checksum of the image file with the
+        MD5 checksum of the source range. The default value is False.
+
+    Returns:
+    : bool
+        True if the image could not be extracted, False otherwise.
+    """
+
+    logger.log_value('Extract image from', iso_file_path)
+    logger.log_value('Extract image to', imgage_file_path)
+    logger.log_value('Extract image blocks', f'block size: {block_size}, skip blocks: {skip_blocks}, block count: {block_count}')
+
+    start = block_size * skip_blocks
+    try:
+        source_fd = os.open(iso_file_path, os.O_RDONLY)
+        try:
+            # Like dd, copy fewer bytes if the ISO file ends before the
+            # end of the range.
+            source_size = os.fstat(source_fd).st_size
+            length = max(0, min(block_size * block_count, source_size - start))
+            target_fd = os.open(imgage_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                _copy_range(source_fd, target_fd, start, length)
+                # Extend the image file over a trailing hole.
+                os.ftruncate(target_fd, length)
+            finally:
+                os.close(target_fd)
+        finally:
+            os.close(source_fd)
+    except OSError as exception:
+        logger.log_value('Unable to extract image', imgage_file_path)
+        logger.log_value('The exception is', exception)
+        return True  # (Error)
+
+    logger.log_value('The image size is', length)
+
+    if is_verify:
+        source_hash = _calculate_range_md5_hash(iso_file_path, start, length)
+        target_hash = _calculate_range_md5_hash(imgage_file_path, 0, length)
+        if not source_hash or source_hash != target_hash:
+            logger.log_value('Unable to verify image', imgage_file_path)
+            logger.log_value('The source and image MD5 checksums are', f'{source_hash}, {target_hash}')
+            return True  # (Error)
+        logger.log_value('The image MD5 checksum is', target_hash)
+
+    return False  # (No Error)
+
+
+def extract_image_ORIGINAL(iso_file_path, imgage_file_path, block_size, skip_blocks, block_count):
 
     # logger.log_label('Extract image')
 
@@ -688,3 +892,263 @@ def extract_image(iso_file_path, imgage_file_path, block_size, skip_blocks, bloc
         is_error = True
 
     return is_error
+
+
+def _copy_range(source_fd, target_fd, start, length):
+    """
+    Copy the data regions of a range of the source file to the start of
+    the target file, skipping holes.
+
+    Arguments:
+    source_fd : int
+        The source file descriptor.
+    target_fd : int
+        The target file descriptor.
+    start : int
+        The byte offset of the range in the source file.
+    length : int
+        The number of bytes in the range.
+
+    Raises:
+    : OSError
+        If the data could not be copied.
+    """
+
+    end = start + length
+    position = start
+    while position < end:
+        try:
+            data_start = os.lseek(source_fd, position, os.SEEK_DATA)
+            data_end = os.lseek(source_fd, data_start, os.SEEK_HOLE)
+        except OSError as exception:
+            if exception.errno == errno.ENXIO:
+                # There is no more data in the source file.
+                break
+            # The file system does not support SEEK_DATA; copy it all.
+            data_start, data_end = position, end
+        except AttributeError:
+            data_start, data_end = position, end
+        if data_start >= end: break
+        data_end = min(data_end, end)
+        _copy_data(source_fd, target_fd, data_start, data_start - start, data_end - data_start)
+        position = data_end
+
+
+def _copy_data(source_fd, target_fd, source_offset, target_offset, count):
+    """
+    Copy bytes from the source file to the target file, in large chunks.
+    Use copy_file_range(), and fall back to sendfile(), and then to
+    pread() and pwrite(), if it is not supported.
+
+    Arguments:
+    source_fd : int
+        The source file descriptor.
+    target_fd : int
+        The target file descriptor.
+    source_offset : int
+        The byte offset in the source file.
+    target_offset : int
+        The byte offset in the target file.
+    count : int
+        The number of bytes to copy.
+
+    Raises:
+    : OSError
+        If the data could not be copied.
+    """
+
+    methods = [_copy_file_range, _send_file, _read_write]
+    while count > 0:
+        size = min(count, COPY_CHUNK_SIZE)
+        try:
+            copied = methods[0](source_fd, target_fd, source_offset, target_offset, size)
+        except (OSError, AttributeError) as exception:
+            if len(methods) > 1 and (isinstance(exception, AttributeError) or exception.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF)):
+                methods.pop(0)
+                continue
+            raise
+        if not copied:
+            raise OSError(errno.EIO, 'Unexpected end of file')
+        source_offset += copied
+        target_offset += copied
+        count -= copied
+
+
+def _copy_file_range(source_fd, target_fd, source_offset, target_offset, size):
+
+    return os.copy_file_range(source_fd, target_fd, size, source_offset, target_offset)
+
+
+def _send_file(source_fd, target_fd, source_offset, target_offset, size):
+
+    # Sendfile writes at the current position of the target file.
+    os.lseek(target_fd, target_offset, os.SEEK_SET)
+    return os.sendfile(target_fd, source_fd, source_offset, size)
+
+
+def _read_write(source_fd, target_fd, source_offset, target_offset, size):
+
+    data = os.pread(source_fd, size, source_offset)
+    return os.pwrite(target_fd, data, target_offset) if data else 0
+
+
+def _calculate_range_md5_hash(file_path, start, length, buffer_size=2**20):
+    """
+    Calculate the MD5 checksum of a range of bytes in a file.
+
+    Arguments:
+    file_path : str
+        The full path of the file.
+    start : int
+        The byte offset of the range.
+    length : int
+        The number of bytes in the range.
+    buffer_size : int
+        Optional. The number of bytes to read at a time.
+
+    Returns:
+    : str
+        The MD5 checksum, or None if the file could not be read.
+    """
+
+    md5_hash = hashlib.md5()
+    try:
+        with open(file_path, 'rb') as file:
+            file.seek(start)
+            remaining = length
+            while remaining > 0:
+                data = file.read(min(buffer_size, remaining))
+                if not data: return None
+                md5_hash.update(data)
+                remaining -= len(data)
+    except OSError as exception:
+        logger.log_value('Unable to read file', file_path)
+        logger.log_value('The exception is', exception)
+        return None
+
+    return md5_hash.hexdigest()
+
+
+########################################################################
+# ISO Analysis Cache Functions
+########################################################################
+
+
+def get_iso_analysis_key(iso_file_path):
+    """
+    Identify the ISO using its size, its modification time, and a hash
+    of samples of its content, without reading the entire file.
+
+    Arguments:
+    iso_file_path : str
+        The full path of the ISO file.
+
+    Returns:
+    : str
+        The key identifying the ISO, or None if the ISO can not be read.
+    """
+
+    try:
+        status = os.stat(iso_file_path)
+        digest = hashlib.sha256(f'{status.st_size}:{status.st_mtime_ns}'.encode())
+        with open(iso_file_path, 'rb') as file:
+            # Always include the start of the file, which contains the
+            # volume descriptors and the partition tables.
+            step = max(status.st_size // SAMPLE_COUNT, SAMPLE_SIZE)
+            for offset in range(0, status.st_size, step):
+                digest.update(os.pread(file.fileno(), SAMPLE_SIZE, offset))
+            digest.update(os.pread(file.fileno(), SAMPLE_SIZE, max(status.st_size - SAMPLE_SIZE, 0)))
+    except OSError as exception:
+        logger.log_value('Unable to identify the ISO', iso_file_path)
+        logger.log_value('The exception is', exception)
+        return None
+
+    return digest.hexdigest()
+
+
+def get_iso_analysis_directory(iso_file_path):
+    """
+    Get the directory used to store the analysis of the ISO.
+
+    Arguments:
+    iso_file_path : str
+        The full path of the ISO file.
+
+    Returns:
+    : str
+        The directory, or None if the ISO can not be read.
+    """
+
+    key = get_iso_analysis_key(iso_file_path)
+    if not key: return None
+
+    directory = os.path.dirname(model.application.configuration.file_path)
+
+    return os.path.join(directory, ISO_ANALYSIS_DIRECTORY, key)
+
+
+def load_iso_analysis():
+    """
+    Load a previous analysis of the original ISO, if one exists, and
+    copy the extracted partition images to the project directory.
+    Sets the following:
+    • model.status.iso_template
+    • model.status.is_success_analyze
+    • model.layout.*
+    • model.options.has_minimal_install
+
+    Returns:
+    : bool
+        True if a previous analysis was loaded, False otherwise.
+    """
+
+    iso_file_path = os.path.join(model.original.iso_directory, model.original.iso_file_name)
+    directory = get_iso_analysis_directory(iso_file_path)
+    if not directory: return False
+
+    file_path = os.path.join(directory, ISO_ANALYSIS_FILE_NAME)
+    if not os.path.exists(file_path): return False
+
+    logger.log_value('Use the previous analysis of', iso_file_path)
+
+    try:
+        # Copy the partition images referenced by the template.
+        for image_file_path in glob.glob(os.path.join(directory, IMAGE_FILE_NAME % '[1-9]')):
+            target_file_path = os.path.join(model.project.directory, os.path.basename(image_file_path))
+            shutil.copyfile(image_file_path, target_file_path)
+        configuration.IsoAnalysis(file_path).load()
+    except Exception as exception:
+        logger.log_value('Unable to use the previous analysis', exception)
+        model.status.iso_template = None
+        model.status.is_success_analyze = False
+        return False
+
+    return bool(model.status.iso_template and model.status.is_success_analyze)
+
+
+def save_iso_analysis():
+    """
+    Save the analysis of the original ISO, including the partition
+    images extracted to the project directory, so it can be reused by
+    new projects created from the same ISO.
+    """
+
+    iso_file_path = os.path.join(model.original.iso_directory, model.original.iso_file_name)
+    directory = get_iso_analysis_directory(iso_file_path)
+    if not directory: return
+
+    logger.log_value('Save the analysis of', iso_file_path)
+
+    try:
+        # Save the analysis in a temporary directory, and then rename
+        # it, so an incomplete analysis is never used.
+        temporary_directory = f'{directory}.{os.getpid()}'
+        shutil.rmtree(temporary_directory, ignore_errors=True)
+        os.makedirs(temporary_directory)
+        for image_file_path in glob.glob(os.path.join(model.project.directory, IMAGE_FILE_NAME % '[1-9]')):
+            shutil.copyfile(image_file_path, os.path.join(temporary_directory, os.path.basename(image_file_path)))
+        configuration.IsoAnalysis(os.path.join(temporary_directory, ISO_ANALYSIS_FILE_NAME)).save()
+        shutil.rmtree(directory, ignore_errors=True)
+        os.rename(temporary_directory, directory)
+    except Exception as exception:
+        logger.log_value('Unable to save the analysis', exception)
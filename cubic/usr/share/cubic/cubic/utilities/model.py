@@ -55,6 +55,8 @@ application.cubic_version = None
 application.visited_sites = None
 application.projects = None
 application.iso_file_path = None
+application.apt_cache_directory = None
+application.apt_mirror_directory = None
 
 ########################################################################
 # Arguments
@@ -212,6 +214,8 @@ status.is_success_extract = None
 status.iso_template = None
 status.iso_checksum = None
 status.iso_checksum_file_name = None
+status.compression_ratios = None
+status.generate_checkpoints = None
 
 ########################################################################
 # Generated
@@ -235,6 +239,8 @@ options.update_os_release = None
 options.has_minimal_install = None
 options.boot_configurations = None
 options.compression = None
+options.fast_boot_test = None
+options.slimming_categories = None
 
 ########################################################################
 # Page/Module Specific
@@ -274,6 +280,18 @@ package_details_list = None
 iso_file_size = None
 file_system_size = 0
 
+# ----------------------------------------------------------------------
+# Compression page, Generate page
+# ----------------------------------------------------------------------
+
+# The estimated size of each slimming category, and the total size of
+# the customized file system. See slimmer.estimate_sizes().
+slimming_sizes = None
+
+# The results of the compression benchmark on the Compression page. See
+# benchmarker.run_benchmark().
+benchmark_results = None
+
 # ----------------------------------------------------------------------
 # Emulator, Test 1 page, Test 2 page
 # ----------------------------------------------------------------------
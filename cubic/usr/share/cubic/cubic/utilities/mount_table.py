@@ -0,0 +1,313 @@
+#!/usr/bin/python3
+
+########################################################################
+#                                                                      #
+# mount_table.py                                                       #
+#                                                                      #
+# Copyright (C) 2020 PJ Singh <psingh.cubic@gmail.com>                 #
+#                                                                      #
+########################################################################
+
+########################################################################
+#                                                                      #
+# This file is part of Cubic - Custom Ubuntu ISO Creator.              #
+#                                                                      #
+# Cubic is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by #
+# the Free Software Foundation, either version 3 of the License, or    #
+# (at your option) any later version.                                  #
+#                                                                      #
+# Cubic is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of       #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the         #
+# GNU General Public License for more details.                         #
+#                                                                      #
+# You should have received a copy of the GNU General Public License    #
+# along with Cubic. If not, see <http://www.gnu.org/licenses/>.        #
+#                                                                      #
+########################################################################
+
+########################################################################
+# References
+########################################################################
+
+# https://man7.org/linux/man-pages/man5/proc_pid_mountinfo.5.html
+# https://www.kernel.org/doc/Documentation/ABI/testing/sysfs-block-loop
+
+########################################################################
+# Imports
+########################################################################
+
+import collections
+import os
+import re
+import select
+import threading
+
+from cubic.utilities import logger
+
+########################################################################
+# Global Variables & Constants
+########################################################################
+
+MOUNT_INFO_FILE_PATH = '/proc/self/mountinfo'
+
+# Pattern to match octal escapes (such as "\040" for a space) in the
+# fields of the mount information file.
+OCTAL_ESCAPE_PATTERN = re.compile(rb'\\([0-7]{3})')
+
+# A mount in the mount table.
+# • mount_id - The unique id of the mount.
+# • parent_id - The id of the parent mount.
+# • device - The device number (st_dev) of the mounted file system.
+# • root - The path of the directory in the file system that is mounted.
+# • mount_point - The path of the mount point.
+# • options - The per mount options.
+# • file_system_type - The file system type, such as ext4, iso9660, or
+#   fuse.sshfs.
+# • source - The mount source, such as /dev/loop0.
+# • super_options - The per super block options.
+MountEntry = collections.namedtuple('MountEntry', 'mount_id parent_id device root mount_point options file_system_type source super_options')
+
+# The parsed mount table.
+mount_entries = []
+
+# The open mount information file, polled to detect changes.
+mount_info_file = None
+mount_info_poll = None
+
+# Serialize refreshing the mount table.
+lock = threading.Lock()
+
+########################################################################
+# Mount Table Functions
+########################################################################
+
+
+def get_mounts():
+    """
+    Get the mounts in the mount namespace of this process. The mount
+    table is only parsed again if it has changed since the last call.
+
+    Returns:
+    : list (MountEntry)
+        The mounts, in the order they were mounted.
+    """
+
+    global mount_entries
+    global mount_info_file
+    global mount_info_poll
+
+    with lock:
+        if mount_info_file is None:
+            try:
+                mount_info_file = open(MOUNT_INFO_FILE_PATH, 'rb')
+                mount_info_poll = select.poll()
+                mount_info_poll.register(mount_info_file, select.POLLPRI | select.POLLERR)
+            except OSError as exception:
+                logger.log_value('Unable to open the mount table', exception)
+                mount_info_file = None
+                return []
+            is_changed = True
+        else:
+            # The kernel signals POLLPRI and POLLERR on the mount
+            # information file when the mount table changes.
+            is_changed = bool(mount_info_poll.poll(0))
+
+        if is_changed:
+            mount_info_file.seek(0)
+            mount_entries = _parse_mount_info(mount_info_file.read())
+
+        return mount_entries
+
+
+def find_mount(file_path):
+    """
+    Find the mount that contains the file or directory. The mount is
+    identified using the device number of the path, so bind mounts and
+    symlinks are handled correctly, and the path prefix is used if the
+    device number matches more than one mount.
+
+    Arguments:
+    file_path : str
+        The path of the file or directory.
+
+    Returns:
+    : MountEntry
+        The mount, or None if it could not be found.
+    """
+
+    real_file_path = os.path.realpath(file_path)
+    try:
+        device = os.stat(real_file_path).st_dev
+    except OSError:
+        device = None
+
+    mount_entries = get_mounts()
+    candidates = [mount_entry for mount_entry in mount_entries if mount_entry.device == device]
+    if not candidates:
+        candidates = mount_entries
+
+    mount_entry = None
+    for candidate in candidates:
+        if _is_prefix(candidate.mount_point, real_file_path):
+            # Later mounts on the same mount point hide earlier mounts.
+            if not mount_entry or len(candidate.mount_point) >= len(mount_entry.mount_point):
+                mount_entry = candidate
+
+    return mount_entry
+
+
+def get_file_system_type(file_path):
+    """
+    Get the type of the file system containing the file or directory,
+    as reported by "df --output=fstype".
+
+    Arguments:
+    file_path : str
+        The path of the file or directory.
+
+    Returns:
+    : str
+        The file system type, or None if it could not be determined.
+    """
+
+    mount_entry = find_mount(file_path)
+
+    return mount_entry.file_system_type.lower() if mount_entry else None
+
+
+def get_mount(mount_point):
+    """
+    Get the mount that is mounted on the mount point. If several file
+    systems are mounted on the mount point, get the visible one.
+
+    Arguments:
+    mount_point : str
+        The path of the mount point.
+
+    Returns:
+    : MountEntry
+        The mount, or None if nothing is mounted on the mount point.
+    """
+
+    real_mount_point = os.path.realpath(mount_point)
+    mount_entry = None
+    for candidate in get_mounts():
+        if candidate.mount_point == real_mount_point:
+            mount_entry = candidate
+
+    return mount_entry
+
+
+def is_mounted(mount_point, source_file_path=None):
+    """
+    Check if a file system is mounted on the mount point. If a source
+    file is supplied, also check that the mounted file system is the
+    source file, either directly or using a loop device.
+
+    Arguments:
+    mount_point : str
+        The path of the mount point.
+    source_file_path : str
+        Optional path of the mounted file, such as an ISO file.
+
+    Returns:
+    : bool
+        True if the file system is mounted, False otherwise.
+    """
+
+    mount_entry = get_mount(mount_point)
+    if not mount_entry:
+        return False
+    if not source_file_path:
+        return True
+
+    real_source_file_path = os.path.realpath(source_file_path)
+
+    return real_source_file_path in (mount_entry.source, get_backing_file(mount_entry.source))
+
+
+def get_backing_file(device_path):
+    """
+    Get the file backing a loop device.
+
+    Arguments:
+    device_path : str
+        The path of the loop device, such as /dev/loop0.
+
+    Returns:
+    : str
+        The path of the backing file, or None if the device is not a
+        loop device or is not attached to a file.
+    """
+
+    if not device_path or not device_path.startswith('/dev/loop'):
+        return None
+
+    file_path = os.path.join('/sys/block', os.path.basename(device_path), 'loop', 'backing_file')
+    try:
+        with open(file_path, 'rb') as file:
+            backing_file = os.fsdecode(file.read().rstrip(b'\n'))
+    except OSError:
+        return None
+
+    # The kernel appends this suffix if the file has been deleted.
+    if backing_file.endswith(' (deleted)'):
+        backing_file = backing_file[:-len(' (deleted)')]
+
+    return backing_file
+
+
+########################################################################
+# Support Functions
+########################################################################
+
+
+def _parse_mount_info(data):
+    """
+    Parse the contents of the mount information file.
+
+    Each line has the following format, where the optional fields are
+    terminated by a single hyphen:
+
+    36 35 98:0 /mnt1 /mnt2 rw,noatime master:1 - ext3 /dev/root rw,errors=continue
+
+    Arguments:
+    data : bytes
+        The contents of the mount information file.
+
+    Returns:
+    : list (MountEntry)
+        The mounts.
+    """
+
+    mount_entries = []
+    for line in data.splitlines():
+        fields = line.split(b' ')
+        try:
+            separator = fields.index(b'-', 6)
+            major, minor = fields[2].split(b':')
+            mount_entries.append(MountEntry(int(fields[0]),
+                                            int(fields[1]),
+                                            os.makedev(int(major), int(minor)),
+                                            _unescape(fields[3]),
+                                            _unescape(fields[4]),
+                                            _unescape(fields[5]),
+                                            _unescape(fields[separator + 1]),
+                                            _unescape(fields[separator + 2]),
+                                            _unescape(fields[separator + 3]) if len(fields) > separator + 3 else ''))
+        except (ValueError, IndexError):
+            logger.log_value('Unable to parse mount information', line)
+
+    return mount_entries
+
+
+def _unescape(field):
+
+    return os.fsdecode(OCTAL_ESCAPE_PATTERN.sub(lambda match: bytes([int(match.group(1), 8)]), field))
+
+
+def _is_prefix(directory_path, file_path):
+
+    return directory_path == '/' or file_path == directory_path or file_path.startswith(directory_path + os.path.sep)
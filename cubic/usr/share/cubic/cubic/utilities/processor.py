@@ -42,8 +42,10 @@ import pexpect
 import signal
 import traceback
 
+from cubic.utilities import helper
 from cubic.utilities import logger
 from cubic.utilities import model
+from cubic.utilities import profiler
 
 ########################################################################
 # Global Variables & Constants
@@ -105,6 +107,7 @@ def execute_synchronous(command, working_directory=None):
         The signal status of the process.
     """
 
+    original_command = command
     display_command, command, arguments = parse_command(command)
     logger.log_value('Execute synchronously', display_command)
 
@@ -117,14 +120,16 @@ def execute_synchronous(command, working_directory=None):
         logger.log_value(f'The exit status of process {process.pid} is', process.exitstatus)
         logger.log_value(f'The signal status of process {process.pid} is', process.signalstatus)
     process = None
+    profile_record = None
     try:
         # Using pexpect.split_command_line removes the spaces in the
         # command. This results in the error:
         # pexpect.ExceptionPexpect: The command was not found
         # or was not executable.
         # command = split_command_line(command)
-        process = pexpect.spawn(command, args=arguments, timeout=300, cwd=working_directory, encoding='UTF-8')
+        process = _spawn(original_command, command, arguments, working_directory)
         logger.log_value('The process id is', process.pid)
+        profile_record = profiler.start_process(display_command, process)
         result = process.read()
         result = result.strip() if result else None
         # Close the process to obtain the exit status.
@@ -138,6 +143,8 @@ def execute_synchronous(command, working_directory=None):
         logger.log_value('The exception is', exception)
         logger.log_value('The trace back is', traceback.format_exc())
 
+    profiler.finish_process(profile_record, process)
+
     os.sync()  # Write data to disk.
     process = None
 
@@ -225,6 +232,7 @@ def execute_asynchronous(command, working_directory=None):
         The process.
     """
 
+    original_command = command
     display_command, command, arguments = parse_command(command)
     logger.log_value('Execute asynchronously', display_command)
 
@@ -240,7 +248,7 @@ def execute_asynchronous(command, working_directory=None):
         # pexpect.ExceptionPexpect: The command was not found
         # or was not executable.
         # command = split_command_line(command)
-        process = pexpect.spawn(command, args=arguments, timeout=300, cwd=working_directory, encoding='UTF-8')
+        process = _spawn(original_command, command, arguments, working_directory)
         logger.log_value('The process id is', process.pid)
     except pexpect.ExceptionPexpect as exception:
         logger.log_value('Exception while executing', command)
@@ -255,6 +263,35 @@ def execute_asynchronous(command, working_directory=None):
 ########################################################################
 
 
+def _spawn(original_command, command, arguments, working_directory):
+    """
+    Spawn a process for the command. Privileged Cubic commands are
+    executed by the privileged helper, when it is available, instead of
+    spawning a new pkexec process.
+
+    Arguments:
+    original_command : str, list(str)
+        The command as supplied by the caller.
+    command : str
+        The parsed command.
+    arguments : list(str)
+        The parsed arguments.
+    working_directory
+        Optional working directory.
+
+    Returns:
+    process : pexpect.pty_spawn.spawn, helper.Job
+        The process.
+    """
+
+    if helper.is_routable(original_command):
+        job = helper.submit(original_command, working_directory)
+        if job:
+            return job
+
+    return pexpect.spawn(command, args=arguments, timeout=300, cwd=working_directory, encoding='UTF-8')
+
+
 def parse_command(command):
     """
     Convert the command into a displayable format, a base command, and a
@@ -366,7 +403,13 @@ def _terminate_root_process():
     # terminated.
     global process
     current_process = process
-    if is_alive(current_process):
+    if isinstance(current_process, helper.Job):
+        # Cancel the job; the privileged helper kills the process group.
+        # The job remains registered until its output has been read.
+        if current_process.isalive():
+            logger.log_value('Cancel privileged helper job', current_process.number)
+            current_process.cancel()
+    elif is_alive(current_process):
         logger.log_value('Terminate process', current_process.pid)
         try:
             program = os.path.join(model.application.directory, 'commands', 'stop-process')
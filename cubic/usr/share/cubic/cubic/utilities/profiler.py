@@ -0,0 +1,360 @@
+#!/usr/bin/python3
+
+########################################################################
+#                                                                      #
+# profiler.py                                                          #
+#                                                                      #
+# Copyright (C) 2020 PJ Singh <psingh.cubic@gmail.com>                 #
+#                                                                      #
+########################################################################
+
+########################################################################
+#                                                                      #
+# This file is part of Cubic - Custom Ubuntu ISO Creator.              #
+#                                                                      #
+# Cubic is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by #
+# the Free Software Foundation, either version 3 of the License, or    #
+# (at your option) any later version.                                  #
+#                                                                      #
+# Cubic is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of       #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the         #
+# GNU General Public License for more details.                         #
+#                                                                      #
+# You should have received a copy of the GNU General Public License    #
+# along with Cubic. If not, see <http://www.gnu.org/licenses/>.        #
+#                                                                      #
+########################################################################
+
+########################################################################
+# References
+########################################################################
+
+# https://docs.python.org/3/library/profile.html
+# https://github.com/brendangregg/FlameGraph#2-fold-stacks
+# https://man7.org/linux/man-pages/man2/getrusage.2.html
+# https://man7.org/linux/man-pages/man5/proc_pid_stat.5.html
+
+########################################################################
+# Imports
+########################################################################
+
+import collections
+import cProfile
+import datetime
+import json
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+
+from cubic.utilities import helper
+from cubic.utilities import logger
+from cubic.utilities import model
+
+########################################################################
+# Global Variables & Constants
+########################################################################
+
+# Profiling is enabled using the --profile command line option.
+is_enabled = False
+
+# The profiles are saved in a sub directory of the project directory,
+# named using the time Cubic was started, so the profiles of separate
+# runs are not combined.
+PROFILE_DIRECTORY_NAME = 'profiles'
+SESSION_NAME = f'{datetime.datetime.now():%Y%m%d-%H%M%S}'
+PROCESSES_FILE_NAME = 'processes.json'
+
+# The interval between samples of the navigation thread stack, used to
+# create the collapsed stack files. The collapsed stack files can be
+# converted to flame graphs using flamegraph.pl.
+SAMPLE_INTERVAL = 0.005
+
+# The number of clock ticks per second, used to convert the times in
+# /proc/<pid>/stat to seconds.
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+# The accumulated profiles of each page.
+# • page_statistics - The pstats.Stats, by page name.
+# • page_stacks - The collapsed stack counts, by page name.
+# • processes - The wall and CPU times of each process.
+page_statistics = {}
+page_stacks = collections.defaultdict(collections.Counter)
+processes = []
+
+# The page and stage (leave, setup, or enter) currently being profiled.
+current_page_name = None
+current_stage = None
+
+# Serialize updating and saving the profiles, because processes may be
+# tracked in threads other than the navigation thread.
+lock = threading.RLock()
+
+########################################################################
+# Profiler Functions
+########################################################################
+
+
+def profile_stage(page_name, stage, function, *arguments):
+    """
+    Call a page function (leave, setup, or enter) in the navigation
+    thread. If profiling is enabled, the function is profiled, and the
+    Python profile and collapsed stacks for the page are saved in the
+    project directory. The profiles are saved even if the navigation
+    thread is interrupted.
+
+    Arguments:
+    page_name : str
+        The name of the page.
+    stage : str
+        The name of the page function, such as 'leave', 'setup', or
+        'enter'.
+    function : function
+        The page function.
+    *arguments : any
+        The arguments for the page function.
+
+    Returns:
+    : any
+        The result of the page function.
+    """
+
+    if not is_enabled:
+        return function(*arguments)
+
+    global current_page_name
+    global current_stage
+    current_page_name, current_stage = page_name, stage
+
+    profile = cProfile.Profile()
+    sampler = _Sampler(threading.get_ident())
+    sampler.start()
+    start_time = time.perf_counter()
+    try:
+        profile.enable()
+        try:
+            return function(*arguments)
+        finally:
+            profile.disable()
+    finally:
+        seconds = time.perf_counter() - start_time
+        sampler.stop()
+        logger.log_value(f'The {stage} time for {page_name} is', f'{seconds:.3f} seconds')
+        _add_page_profile(page_name, profile, sampler.stacks)
+        current_page_name, current_stage = None, None
+
+
+def start_process(display_command, process):
+    """
+    Start tracking the wall and CPU times of a process. Call this
+    function immediately after the process is spawned.
+
+    Arguments:
+    display_command : str
+        The command, in a displayable format.
+    process : pexpect.pty_spawn.spawn, helper.Job
+        The process.
+
+    Returns:
+    : dict
+        The process record to pass to finish_process(), or None if
+        profiling is not enabled.
+    """
+
+    if not is_enabled or not process:
+        return None
+
+    is_helper = isinstance(process, helper.Job)
+
+    return {
+        'page': current_page_name,
+        'stage': current_stage,
+        'command': display_command,
+        'pid': process.pid,
+        'is_helper': is_helper,
+        'start_time': time.perf_counter(),
+        'start_cpu_times': _get_cpu_times(is_helper),
+    }
+
+
+def finish_process(record, process):
+    """
+    Finish tracking a process, and save the wall and CPU times of all
+    tracked processes in the project directory. Call this function
+    after the process has exited and has been closed.
+
+    The CPU time of a process spawned by Cubic is the change in the
+    resource usage of the terminated children of Cubic, so it includes
+    any other child processes that terminated at the same time. The CPU
+    time of a command run by the privileged helper is the change in the
+    CPU time of the helper and its terminated children.
+
+    Arguments:
+    record : dict
+        The process record returned by start_process().
+    process : pexpect.pty_spawn.spawn, helper.Job
+        The process.
+    """
+
+    if not record:
+        return
+
+    user_seconds, system_seconds = _get_cpu_times(record['is_helper'])
+    start_user_seconds, start_system_seconds = record.pop('start_cpu_times')
+    record['wall_seconds'] = time.perf_counter() - record.pop('start_time')
+    record['user_seconds'] = user_seconds - start_user_seconds
+    record['system_seconds'] = system_seconds - start_system_seconds
+    record['exit_status'] = process.exitstatus if process else None
+    record['signal_status'] = process.signalstatus if process else None
+
+    logger.log_value('The process wall, user, system time is', f'{record["wall_seconds"]:.3f}, {record["user_seconds"]:.3f}, {record["system_seconds"]:.3f} seconds')
+
+    with lock:
+        processes.append(record)
+        directory = get_profile_directory()
+        if directory:
+            _write_json(os.path.join(directory, PROCESSES_FILE_NAME), processes)
+
+
+def get_profile_directory():
+    """
+    Get the directory where the profiles are saved for this run of
+    Cubic, creating it if necessary.
+
+    Returns:
+    : str
+        The profile directory, or None if the project directory has not
+        been selected yet.
+    """
+
+    if not model.project.directory:
+        return None
+
+    directory = os.path.join(model.project.directory, PROFILE_DIRECTORY_NAME, SESSION_NAME)
+    os.makedirs(directory, exist_ok=True)
+
+    return directory
+
+
+########################################################################
+# Support Functions
+########################################################################
+
+
+def _add_page_profile(page_name, profile, stacks):
+    """
+    Add a profile to the accumulated profile of the page, and save the
+    accumulated profiles of all pages. Profiles collected before the
+    project directory is selected are saved once it is selected.
+
+    Arguments:
+    page_name : str
+        The name of the page.
+    profile : cProfile.Profile
+        The profile of a page function.
+    stacks : collections.Counter
+        The collapsed stack counts of a page function.
+    """
+
+    with lock:
+        if page_name in page_statistics:
+            page_statistics[page_name].add(profile)
+        else:
+            page_statistics[page_name] = pstats.Stats(profile)
+        page_stacks[page_name].update(stacks)
+
+        directory = get_profile_directory()
+        if not directory:
+            return
+
+        for name, statistics in page_statistics.items():
+            statistics.dump_stats(os.path.join(directory, f'{name}.pstats'))
+        for name, counter in page_stacks.items():
+            with open(os.path.join(directory, f'{name}.collapsed'), 'w') as file:
+                file.writelines(f'{stack} {count}{os.linesep}' for stack, count in counter.items())
+
+    logger.log_value('Saved the profile for', page_name)
+
+
+def _get_cpu_times(is_helper):
+    """
+    Get the user and system CPU times of the terminated children of this
+    process, or of the privileged helper and its terminated children.
+
+    Arguments:
+    is_helper : bool
+        True to get the CPU times of the privileged helper.
+
+    Returns:
+    : tuple (float, float)
+        The user and system CPU times, in seconds.
+    """
+
+    if is_helper:
+        try:
+            with open(f'/proc/{helper.channel.pid}/stat', 'r') as file:
+                # The command name is in parentheses, and may contain
+                # spaces, so split the fields after it.
+                fields = file.read().rpartition(')')[2].split()
+            # utime, stime, cutime, cstime are fields 14 to 17.
+            user_ticks = int(fields[11]) + int(fields[13])
+            system_ticks = int(fields[12]) + int(fields[14])
+            return user_ticks / CLOCK_TICKS, system_ticks / CLOCK_TICKS
+        except (AttributeError, OSError, IndexError, ValueError):
+            return 0.0, 0.0
+
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return usage.ru_utime, usage.ru_stime
+
+
+def _write_json(file_path, data):
+
+    with open(file_path, 'w') as file:
+        json.dump(data, file, indent=2)
+
+
+########################################################################
+# Sampler Class
+########################################################################
+
+
+class _Sampler(threading.Thread):
+    """
+    Periodically sample the stack of a thread, and count the samples of
+    each stack in the collapsed stack format:
+
+        function (file:line);function (file:line);...
+    """
+
+    def __init__(self, thread_id):
+
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.stacks = collections.Counter()
+        self.stop_event = threading.Event()
+
+    def run(self):
+
+        while not self.stop_event.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame:
+                code = frame.f_code
+                # Shorten the file names of Cubic modules.
+                file_name = code.co_filename
+                if model.application.directory and file_name.startswith(model.application.directory + os.path.sep):
+                    file_name = os.path.relpath(file_name, model.application.directory)
+                names.append(f'{code.co_name} ({file_name}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def stop(self):
+
+        self.stop_event.set()
+        self.join()
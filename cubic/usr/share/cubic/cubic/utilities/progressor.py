@@ -55,6 +55,7 @@ from cubic.constants import RED, GREEN, YELLOW, BLUE, MAGENTA, CYAN, NORMAL
 from cubic.constants import START_PERCENT, FINAL_PERCENT, SCALE_FACTOR
 from cubic.utilities import logger
 from cubic.utilities import processor
+from cubic.utilities import profiler
 
 ########################################################################
 # Global Variables & Constants
@@ -350,7 +351,7 @@ def raise_exception(thread, exception):
 # signal_status will store the signal value and exit_status will be None.
 
 
-def process_command(command, parent_thread, working_directory=None):
+def process_command(command, parent_thread, working_directory=None, output_pattern=None, output_callback=None):
     """
     Execute the command while updating percent complete information from
     the running process. This function should be run as a thread. The
@@ -366,6 +367,13 @@ def process_command(command, parent_thread, working_directory=None):
         thread.
     working_directory : str
         Optional directory to execute the command from.
+    output_pattern : re.Pattern
+        Optional pattern to match other output of the process, such as
+        the names of processed files.
+    output_callback : function
+        Optional call back function that accepts a single re.Match
+        argument, invoked on this thread for each match of the output
+        pattern.
 
     Exceptions:
     The exception (of any type) that occurred. If there is a message
@@ -399,13 +407,16 @@ def process_command(command, parent_thread, working_directory=None):
     logger.log_value('The process started at', formatted_time)
 
     process = None
+    profile_record = None
     percent = START_PERCENT
+    patterns = [PERCENT_PATTERN, output_pattern] if output_pattern else [PERCENT_PATTERN]
     try:
         process = processor.execute_asynchronous(command, working_directory)
+        profile_record = profiler.start_process(processor.parse_command(command)[0], process)
         done = False
         while not done:
             try:
-                process.expect(PERCENT_PATTERN)
+                index = process.expect(patterns)
             except pexpect.EOF as exception:
                 # Close the process to obtain the exit status.
                 process.close()
@@ -419,6 +430,9 @@ def process_command(command, parent_thread, working_directory=None):
                     # failed, raise exception
                     raise exception
             else:
+                if index == 1:
+                    output_callback(process.match)
+                    continue
                 # muquit
                 # successfully found a percentage, update progress
                 percent = float((process.after)[:-1])
@@ -432,6 +446,7 @@ def process_command(command, parent_thread, working_directory=None):
         if process:
             # Close the process to obtain the exit status.
             process.close()
+            profiler.finish_process(profile_record, process)
             logger.log_value('The exit status, signal status is', f'{process.exitstatus}, {process.signalstatus}')
             message = process.before.strip().replace('\r\n', '\n')
             logger.log_value('The message is', message)
@@ -447,6 +462,7 @@ def process_command(command, parent_thread, working_directory=None):
         os.sync()
         # Only wait after an EOF, otherwise the process will block.
         process.wait()
+        profiler.finish_process(profile_record, process)
         stop_time = datetime.datetime.now()
         formatted_time = f'{stop_time:%H:%M:%S.%f}'
         logger.log_value('The process finished at', formatted_time)
@@ -464,7 +480,7 @@ def process_command(command, parent_thread, working_directory=None):
 ########################################################################
 
 
-def track_progress(command, progress_callback, working_directory=None, quantity=1):
+def track_progress(command, progress_callback, working_directory=None, quantity=1, output_pattern=None, output_callback=None):
     """
     Start a process for the specified command, track the progress, and
     update the client using the progress callback.
@@ -482,6 +498,13 @@ def track_progress(command, progress_callback, working_directory=None, quantity=
         to update the client about the progress in percent.
     working_directory : str
         Optional directory to execute the command from.
+    output_pattern : re.Pattern
+        Optional pattern to match other output of the process, such as
+        the names of processed files.
+    output_callback : function
+        Optional call back function that accepts a single re.Match
+        argument, invoked from the process thread for each match of the
+        output pattern.
 
     Exceptions:
     All exceptions are propagated to the calling thread of this function,
@@ -520,7 +543,7 @@ def track_progress(command, progress_callback, working_directory=None, quantity=
     # used by the tracker below.
 
     current_thread = threading.current_thread()
-    process_thread = threading.Thread(target=process_command, args=(command, current_thread, working_directory), daemon=True)
+    process_thread = threading.Thread(target=process_command, args=(command, current_thread, working_directory, output_pattern, output_callback), daemon=True)
     process_thread.start()
 
     # ------------------------------------------------------------------
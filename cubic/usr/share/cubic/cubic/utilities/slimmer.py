@@ -0,0 +1,377 @@
+#!/usr/bin/python3
+
+########################################################################
+#                                                                      #
+# slimmer.py                                                           #
+#                                                                      #
+# Copyright (C) 2020 PJ Singh <psingh.cubic@gmail.com>                 #
+#                                                                      #
+########################################################################
+
+########################################################################
+#                                                                      #
+# This file is part of Cubic - Custom Ubuntu ISO Creator.              #
+#                                                                      #
+# Cubic is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by #
+# the Free Software Foundation, either version 3 of the License, or    #
+# (at your option) any later version.                                  #
+#                                                                      #
+# Cubic is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of       #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the         #
+# GNU General Public License for more details.                         #
+#                                                                      #
+# You should have received a copy of the GNU General Public License    #
+# along with Cubic. If not, see <http://www.gnu.org/licenses/>.        #
+#                                                                      #
+########################################################################
+
+
+########################################################################
+# References
+########################################################################
+
+# https://manpages.ubuntu.com/manpages/noble/man1/mksquashfs.1.html
+# https://github.com/plougher/squashfs-tools/blob/master/USAGE-4.6
+
+########################################################################
+# Imports
+########################################################################
+
+import collections
+import locale
+import os
+import re
+import stat
+
+from cubic.constants import MIB, GIB
+from cubic.utilities import file_utilities
+from cubic.utilities import logger
+from cubic.utilities import model
+
+########################################################################
+# Global Variables & Constants
+########################################################################
+
+# A category of reclaimable files in the customized file system, which
+# may be excluded from the compressed Linux file system.
+# • key - The identifier saved in the project configuration.
+# • label - The name displayed on the Compression page.
+# • description - The tooltip displayed on the Compression page.
+# • patterns - The mksquashfs wildcard exclude patterns, relative to
+#   the root of the customized file system. Patterns starting with
+#   "... " match at any depth. An empty tuple indicates the patterns are
+#   determined from the customized file system. See get_patterns().
+SlimmingCategory = collections.namedtuple('SlimmingCategory', 'key label description patterns')
+
+CATEGORIES = (
+    SlimmingCategory(
+        'apt_archives',
+        'Downloaded package files',
+        'Package files in /var/cache/apt that have already been installed',
+        ('var/cache/apt/archives/*.deb',
+         'var/cache/apt/*.bin')),
+    SlimmingCategory(
+        'apt_lists',
+        'Package index files',
+        'Package lists in /var/lib/apt/lists; run "apt update" before installing packages on the customized system',
+        ('var/lib/apt/lists/*_*',)),
+    SlimmingCategory(
+        'logs',
+        'Log files',
+        'Log files and rotated logs in /var/log',
+        ('var/log/*.log',
+         'var/log/*.gz',
+         'var/log/*.[0-9]',
+         'var/log/*.old',
+         'var/log/*/*.log',
+         'var/log/*/*.gz',
+         'var/log/*/*.[0-9]',
+         'var/log/journal/*')),
+    SlimmingCategory(
+        'python_caches',
+        'Python byte code caches',
+        'Compiled *.pyc files, which Python creates again as needed',
+        ('... __pycache__',
+         '... *.pyc')),
+    SlimmingCategory(
+        'manual_pages',
+        'Manual pages',
+        'Manual pages and info documents in /usr/share/man and /usr/share/info',
+        ('usr/share/man/*',
+         'usr/share/info/*')),
+    SlimmingCategory(
+        'translations',
+        'Unused translations',
+        'Translations in /usr/share/locale for languages other than English and the default language of the customized system',
+        ()),
+    SlimmingCategory(
+        'kernel_modules',
+        'Modules for other kernels',
+        'Kernel modules in /usr/lib/modules for kernels other than the one selected to boot the customized disk',
+        ()),
+)
+
+# Translations for these languages are always kept.
+KEEP_LANGUAGES = ('en',)
+
+# The default language of the customized file system.
+DEFAULT_LOCALE_FILE_PATH = 'etc/default/locale'
+LANGUAGE_PATTERN = re.compile(r'^\s*LANG="?([A-Za-z]+)', re.MULTILINE)
+
+########################################################################
+# Slimming Functions
+########################################################################
+
+
+def get_patterns(key, root_directory):
+    """
+    Get the mksquashfs exclude patterns for the category. The patterns
+    for unused translations and modules for other kernels are determined
+    from the contents of the customized file system.
+
+    Arguments:
+    key : str
+        The category key.
+    root_directory : str
+        The customized root directory.
+
+    Returns:
+    : list (str)
+        The exclude patterns, relative to the root directory.
+    """
+
+    if key == 'translations':
+        keep_languages = set(KEEP_LANGUAGES)
+        try:
+            with open(os.path.join(root_directory, DEFAULT_LOCALE_FILE_PATH)) as file:
+                match = LANGUAGE_PATTERN.search(file.read())
+            if match:
+                keep_languages.add(match.group(1))
+        except OSError:
+            pass
+        directory = 'usr/share/locale'
+        return [f'{directory}/{name}' for name in _list_directories(root_directory, directory) if re.split(r'[_@.]', name)[0] not in keep_languages]
+
+    if key == 'kernel_modules':
+        version_name = _get_selected_kernel_version_name()
+        if not version_name:
+            return []
+        directory = 'lib/modules' if not os.path.islink(os.path.join(root_directory, 'lib')) else 'usr/lib/modules'
+        names = _list_directories(root_directory, directory)
+        is_selected = lambda name: name == version_name or name.startswith(f'{version_name}-')
+        # Do not exclude anything unless modules for the selected kernel
+        # are present.
+        if not any(is_selected(name) for name in names):
+            return []
+        return [f'{directory}/{name}' for name in names if not is_selected(name)]
+
+    for category in CATEGORIES:
+        if category.key == key:
+            return list(category.patterns)
+
+    return []
+
+
+def estimate_sizes(root_directory):
+    """
+    Estimate the size of each category, and the total size of the
+    customized file system, in a single scan of the directory tree. The
+    size is the apparent size of the files, which is the amount of data
+    mksquashfs reads and compresses. Files with multiple hard links are
+    only counted once.
+
+    Arguments:
+    root_directory : str
+        The customized root directory.
+
+    Returns:
+    : dict
+        The size in bytes of each category, by category key, and the
+        total size of all files with the key None.
+    """
+
+    logger.log_label('Estimate the size of reclaimable files')
+
+    matcher, group_keys = _compile_matcher([(category.key, get_patterns(category.key, root_directory)) for category in CATEGORIES])
+
+    sizes = dict.fromkeys([category.key for category in CATEGORIES], 0)
+    sizes[None] = 0
+    linked_inodes = set()
+    prefix_length = len(root_directory.rstrip(os.path.sep)) + 1
+    for directory_path, directory_entries, file_entries in file_utilities.walk_tree(root_directory, is_stat=True):
+        relative_directory_path = directory_path[prefix_length:]
+        for entry in file_entries:
+            try:
+                status = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if status.st_nlink > 1 and not stat.S_ISDIR(status.st_mode):
+                if (status.st_dev, status.st_ino) in linked_inodes:
+                    continue
+                linked_inodes.add((status.st_dev, status.st_ino))
+            sizes[None] += status.st_size
+            if matcher:
+                match = matcher.match(f'{relative_directory_path}/{entry.name}' if relative_directory_path else entry.name)
+                if match:
+                    sizes[group_keys[match.lastgroup]] += status.st_size
+
+    for category in CATEGORIES:
+        logger.log_value(category.label, f'{sizes[category.key]:n} bytes')
+    logger.log_value('Total', f'{sizes[None]:n} bytes')
+
+    return sizes
+
+
+def create_exclude_file(keys, root_directory, exclude_file_path):
+    """
+    Create a mksquashfs exclude file for the selected categories. The
+    file is used with the mksquashfs -wildcards and -ef options.
+
+    Arguments:
+    keys : list (str)
+        The selected category keys.
+    root_directory : str
+        The customized root directory.
+    exclude_file_path : str
+        The path of the exclude file to create.
+
+    Returns:
+    : str
+        The path of the exclude file, or None if there is nothing to
+        exclude.
+    """
+
+    patterns = []
+    for key in keys or []:
+        patterns.extend(get_patterns(key, root_directory))
+    if not patterns:
+        return None
+
+    with open(exclude_file_path, 'w') as file:
+        file.writelines(f'{pattern}\n' for pattern in patterns)
+    logger.log_value('The exclude file is', exclude_file_path)
+    logger.log_value('The number of exclude patterns is', len(patterns))
+
+    return exclude_file_path
+
+
+def get_matcher(keys, root_directory):
+    """
+    Get a regular expression matching the paths of the files excluded by
+    the selected categories.
+
+    Arguments:
+    keys : list (str)
+        The selected category keys.
+    root_directory : str
+        The customized root directory.
+
+    Returns:
+    : re.Pattern
+        The regular expression, matching paths relative to the root
+        directory, or None if there is nothing to exclude.
+    """
+
+    matcher, _ = _compile_matcher([(key, get_patterns(key, root_directory)) for key in keys or []])
+
+    return matcher
+
+
+def format_size(size_in_bytes):
+    """
+    Format the size for display, in MiB or GiB.
+
+    Arguments:
+    size_in_bytes : int
+        The size in bytes.
+
+    Returns:
+    : str
+        The formatted size.
+    """
+
+    if size_in_bytes >= GIB:
+        return f'{locale.format_string("%.2f", size_in_bytes / GIB, True)} GiB'
+    else:
+        return f'{locale.format_string("%.1f", size_in_bytes / MIB, True)} MiB'
+
+
+########################################################################
+# Support Functions
+########################################################################
+
+
+def _get_selected_kernel_version_name():
+
+    try:
+        return model.kernel_details_list[model.selected_kernel_index]['version_name']
+    except (TypeError, IndexError, KeyError):
+        return None
+
+
+def _list_directories(root_directory, directory):
+
+    try:
+        with os.scandir(os.path.join(root_directory, directory)) as entries:
+            return sorted(entry.name for entry in entries if entry.is_dir(follow_symlinks=False))
+    except OSError:
+        return []
+
+
+def _compile_matcher(keys_and_patterns):
+    """
+    Compile the mksquashfs wildcard patterns into a single regular
+    expression. As with mksquashfs, a pattern matches a file if it
+    matches the path of the file or of any parent directory, "*" and "?"
+    do not match "/", and patterns starting with "... " match at any
+    depth.
+
+    Arguments:
+    keys_and_patterns : list (tuple (str, list (str)))
+        The category key and the patterns for each category.
+
+    Returns:
+    : tuple (re.Pattern, dict)
+        The regular expression, or None if there are no patterns, and
+        the category key for each group name in the regular expression.
+    """
+
+    expressions = []
+    group_keys = {}
+    for key, patterns in keys_and_patterns:
+        for pattern in patterns:
+            group_name = f'g{len(group_keys)}'
+            group_keys[group_name] = key
+            if pattern.startswith('... '):
+                expression = f'(?:.*/)?{_translate(pattern[4:])}'
+            else:
+                expression = _translate(pattern)
+            expressions.append(f'(?P<{group_name}>{expression})(?:/|$)')
+
+    return (re.compile('|'.join(expressions)) if expressions else None), group_keys
+
+
+def _translate(pattern):
+
+    expression = ''
+    index = 0
+    while index < len(pattern):
+        character = pattern[index]
+        index += 1
+        if character == '*':
+            expression += '[^/]*'
+        elif character == '?':
+            expression += '[^/]'
+        elif character == '[' and ']' in pattern[index + 1:]:
+            end = pattern.index(']', index + 1)
+            characters = pattern[index:end]
+            if characters.startswith(('!', '^')):
+                characters = '^' + characters[1:]
+            expression += f'[{characters.replace(chr(92), chr(92) * 2)}]'
+            index = end + 1
+        else:
+            expression += re.escape(character)
+
+    return expression
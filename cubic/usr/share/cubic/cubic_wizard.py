@@ -44,18 +44,23 @@ import glob
 import importlib
 import mimetypes
 import os
+import time
 import traceback
 
 gi.require_version('Gtk', '3.0')
 
+from gi.repository import GLib
 from gi.repository import Gtk
 
 from cubic.constants import CUBIC_COPYRIGHT
 from cubic.constants import STAR, CUBIC_WEBSITE, CUBIC_WIKI, CUBIC_PAGE_HELP, CUBIC_DONATE, CUBIC_SITES, CUBIC_URLS
 from cubic import navigator
+from cubic.utilities import configuration
 from cubic.utilities import constructor
+from cubic.utilities import emulator
 from cubic.utilities import logger
 from cubic.utilities import model
+from cubic.utilities import profiler
 
 ########################################################################
 # Global Variables & Constants
@@ -75,6 +80,11 @@ parser.add_argument('iso', nargs='?', help='original ISO file for a new project
 parser.add_argument("-l", "--log", action="store_true", help="output a formatted log to a file in the project directory")
 parser.add_argument("-v", "--verbose", action="store_true", help="output a formatted log to the console")
 parser.add_argument("-V", "--version", action="store_true", help="print version information and exit")
+parser.add_argument("--boot-test", action="store_true", help="boot the generated ISO of an existing project without a display, save the boot milestone times to a report in the project directory, and exit")
+parser.add_argument("--boot-test-milestone", action="append", metavar="NAME=PATTERN", help="a boot test milestone, as a name and a regular expression matching the serial console output; may be repeated (replaces the default milestones)")
+parser.add_argument("--boot-test-timeout", type=int, metavar="SECONDS", help="the maximum number of seconds to wait for all boot test milestones")
+parser.add_argument("--boot-access-order", action="store_true", help="during the boot test, record the order files are read while booting, so the next generated squashfs stores them contiguously (requires the default milestones)")
+parser.add_argument("--profile", action="store_true", help="profile each page and each process, and save the Python profiles, collapsed stacks, and process times in the project directory")
 
 if os.getuid() == 0:
     print('Error: Cubic may not be run using sudo or as root because it is a graphical user interface application.')
@@ -109,8 +119,11 @@ if arguments.version:
 
 logger.verbose = arguments.verbose
 logger.log = arguments.log
+profiler.is_enabled = arguments.profile
 logger.log_title('Cubic - Custom Ubuntu ISO Creator')
 
+start_time = time.perf_counter()
+
 try:
 
     # ------------------------------------------------------------------
@@ -144,6 +157,49 @@ try:
     file_path = os.path.join(model.application.directory, 'assets', 'mime.types')
     mimetypes.types_map.update(mimetypes.read_mime_types(file_path))
 
+    # ------------------------------------------------------------------
+    # Run the boot test without the user interface.
+    # ------------------------------------------------------------------
+
+    if arguments.boot_test:
+
+        file_path = constructor.construct_project_configuration_file_path(model.arguments.directory or '')
+        if not os.path.isfile(file_path):
+            print('Error: The boot test requires the directory of an existing project.')
+            exit(2)
+
+        # Load the project configuration.
+        model.project.directory = model.arguments.directory
+        model.project.configuration = configuration.Project(file_path)
+        model.project.configuration.load()
+
+        # Test the most recently generated ISO.
+        model.generated.iso_file_name = model.custom.iso_file_name
+        model.generated.iso_directory = model.custom.iso_directory
+
+        milestones = emulator.BOOT_TEST_MILESTONES
+        if arguments.boot_test_milestone:
+            milestones = tuple(tuple(milestone.split('=', 1)) for milestone in arguments.boot_test_milestone if '=' in milestone)
+        timeout = arguments.boot_test_timeout or emulator.BOOT_TEST_TIMEOUT
+
+        report = emulator.run_boot_test(milestones, timeout, arguments.boot_access_order)
+
+        print(f'Boot test....... {"Passed" if report["is_success"] else "Failed"} ({report["accelerator"]})')
+        for milestone in report['milestones']:
+            seconds = milestone['seconds']
+            change = milestone['change_seconds']
+            text = 'Not reached' if seconds is None else f'{seconds:.2f} seconds'
+            if change is not None:
+                text = f'{text} ({change:+.2f} seconds)'
+            print(f'{milestone["name"]:.<16} {text}')
+        if 'access_order_file_count' in report:
+            count = report['access_order_file_count']
+            print(f'{"Access order":.<16} {"Not captured" if count is None else f"{count} files"}')
+        if report['error']:
+            print(f'Error........... {report["error"]}')
+
+        exit(0 if report['is_success'] else 1)
+
     # ------------------------------------------------------------------
     # Create the user interface.
     # ------------------------------------------------------------------
@@ -161,71 +217,15 @@ try:
 
     logger.log_label('Setup pages')
 
-    # Get the stack.
-    pages = model.builder.get_object('pages')
-
-    # Setup each page.
-    pattern = os.path.join(model.application.directory, 'cubic', 'pages', '*_page.ui')
-    file_paths = sorted(glob.glob(pattern))
-    for file_path in file_paths:
-
-        # Get the module name.
-        module_name = os.path.basename(file_path)[:-3]
-        logger.log_value('Setup', module_name.replace('_', ' '))
-
-        # Load the user interface.
-        model.builder.add_from_file(file_path)
-
-        # Load the module.
-        module = importlib.import_module(f'cubic.pages.{module_name}')
-
-        # Connect the signals to handlers in the associated module.
-        model.builder.connect_signals(module)
-
-        # Add the page to the stack.
-        page = model.builder.get_object(module.name)
-        pages.add_named(page, module.name)
+    # Only load the Start page. The other pages are loaded on demand,
+    # the first time they are navigated to. The widgets each page adds
+    # to the header bar are added when the page is loaded. See
+    # navigator.get_page().
+    page = navigator.get_page('start_page')
 
     # Set the first page for the stack.
-    page = model.builder.get_object('start_page')
-    pages.set_visible_child(page)
-
-    #
-    # Header Bar
-    #
-
-    # Add previously loaded widgets to the header bar.
-
-    # TODO: Can adding widgets to the header bar be moved to the individual pages?
-
-    header_bar = model.builder.get_object('header_bar')
-
-    # Project page
-    widget = model.builder.get_object('project_page__test_header_bar_button')
-    header_bar.add(widget)
-    widget = model.builder.get_object('project_page__delete_header_bar_button')
-    header_bar.add(widget)
-    widget = model.builder.get_object('project_page__header_bar_box')
-    header_bar.add(widget)
-
-    # Packages page
-    widget = model.builder.get_object('packages_page__header_bar_box_1')
-    header_bar.add(widget)
-    widget = model.builder.get_object('packages_page__header_bar_box_2')
-    header_bar.add(widget)
-
-    # Options page
-    options_page__stack_switcher = model.builder.get_object('options_page__stack_switcher')
-    options_page__stack = model.builder.get_object('options_page__stack')
-    options_page__stack_switcher.set_stack(options_page__stack)
-
-    # Terminal page
-    widget = model.builder.get_object('terminal_page__copy_header_bar_button')
-    header_bar.add(widget)
-
-    # Finish page
-    widget = model.builder.get_object('finish_page__test_header_bar_button')
-    header_bar.add(widget)
+    pages = model.builder.get_object('pages')
+    pages.set_visible_child(model.builder.get_object(page.name))
 
     #
     # Menu
@@ -304,6 +304,15 @@ try:
     window = model.builder.get_object('window')
     window.show()
 
+    # Log the time to show the first window. The idle callback runs
+    # after the window has been drawn.
+    def log_time_to_first_window():
+        duration = time.perf_counter() - start_time
+        logger.log_value('Time to first window', f'{duration:.3f} seconds')
+        return False
+
+    GLib.idle_add(log_time_to_first_window)
+
     # Open the application.
     navigator.handle_navigation('open')
 